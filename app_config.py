@@ -40,3 +40,125 @@ def get_openai_config() -> Dict[str, str]:
     }
 
 
+def get_http_config() -> Dict[str, Any]:
+    cfg = get_config().get("http", {})
+    return {
+        "pool_connections": int(cfg.get("pool_connections", 32)),
+        "pool_maxsize": int(cfg.get("pool_maxsize", 16)),
+        "timeout": float(cfg.get("timeout", 10)),
+        "max_concurrency": int(cfg.get("max_concurrency", 16)),
+        "per_host_concurrency": int(cfg.get("per_host_concurrency", 4)),
+    }
+
+
+def get_schedule_config() -> Dict[str, Dict[str, Any]]:
+    """Per-source overrides: {"EastMoneyFlashCrawler": {"interval", "min", "max"}}."""
+    cfg = get_config().get("schedule", {})
+    return {k: v for k, v in cfg.items() if isinstance(v, dict)}
+
+
+def get_crawlers_config() -> Dict[str, Any]:
+    """Crawler toggles/plugins: {"AINewsCrawler": true, "MyCrawler": {...}}."""
+    cfg = get_config().get("crawlers", {})
+    return {k: v for k, v in cfg.items() if isinstance(v, (bool, dict))}
+
+
+def get_crawl_config() -> Dict[str, Any]:
+    cfg = get_config().get("crawl", {})
+    return {
+        # 单轮抓取的总时限（秒）：超时后只处理已完成的源
+        "deadline_seconds": float(cfg.get("deadline_seconds", 45)),
+        # 熔断：连续失败次数阈值与指数退避冷却时间（秒）
+        "breaker_threshold": int(cfg.get("breaker_threshold", 3)),
+        "breaker_base_cooldown": float(cfg.get("breaker_base_cooldown", 60)),
+        "breaker_max_cooldown": float(cfg.get("breaker_max_cooldown", 3600)),
+        # 黄金报价：主源（东财）超过该时长未返回才请求备源（新浪）
+        "gold_hedge_delay": float(cfg.get("gold_hedge_delay", 1.5)),
+    }
+
+
+def get_quotes_config() -> Dict[str, Any]:
+    cfg = get_config().get("quotes", {})
+    default_pct = float(cfg.get("move_threshold_pct", 0.5))
+    return {
+        # 每个品种/板块保留的最近 tick 数（环形缓冲）
+        "capacity": int(cfg.get("capacity", 6000)),
+        # 距上次推送涨跌幅超过阈值（%）才再次推送
+        "move_threshold_pct": default_pct,
+        "gold_threshold_pct": float(cfg.get("gold_threshold_pct", default_pct)),
+        "sector_threshold_pct": float(cfg.get("sector_threshold_pct", 1.0)),
+    }
+
+
+def get_state_config() -> Dict[str, Any]:
+    cfg = get_config().get("state", {})
+    return {
+        # 去重存储后端：sqlite（默认）/ hashed（按天分桶的 64 位哈希索引）/ json（旧版 data/state.json）
+        "backend": str(cfg.get("backend", "sqlite")),
+        # 为空时使用后端默认路径
+        "path": cfg.get("path") or None,
+        "retention_days": int(cfg.get("retention_days", 7)),
+        # hashed 后端：内存 Bloom 过滤器，快速排除未见过的键
+        "bloom": bool(cfg.get("bloom", True)),
+    }
+
+
+def get_near_dup_config() -> Dict[str, Any]:
+    cfg = get_config().get("near_dup", {})
+    return {
+        "enabled": bool(cfg.get("enabled", True)),
+        # SimHash 汉明距离阈值（位），<=3 时保证不漏检
+        "max_distance": int(cfg.get("max_distance", 3)),
+        # 只与该时间窗口内出现过的内容比较（小时）
+        "window_hours": float(cfg.get("window_hours", 48)),
+    }
+
+
+def get_queue_config() -> Dict[str, Any]:
+    cfg = get_config().get("queue", {})
+    return {
+        # 待分析队列按优先级出队（False 时保持先进先出）
+        "priority": bool(cfg.get("priority", True)),
+        # 新近度衰减半衰期（小时）：分数每隔该时长减半
+        "half_life_hours": float(cfg.get("half_life_hours", 6)),
+        # 标签权重 / 来源可信度，覆盖 priority.py 中的默认值
+        "tag_weights": dict(cfg.get("tag_weights") or {}),
+        "sector_weight": float(cfg.get("sector_weight", 1.5)),
+        "source_trust": dict(cfg.get("source_trust") or {}),
+        # 相关度分数（news_crawler/relevance.py）的乘数：分数 × (1 + relevance_weight × score)
+        "relevance_weight": float(cfg.get("relevance_weight", 1.0)),
+    }
+
+
+def get_keywords_config() -> Dict[str, Any]:
+    cfg = get_config().get("keywords", {})
+    return {
+        # 关键词配置文件（相对项目根目录）；不存在时使用 news_crawler/config.py 中的内置词表
+        "path": cfg.get("path") or "keywords.json",
+        # 检查文件修改时间的最小间隔（秒），修改后无需重启即生效
+        "reload_seconds": float(cfg.get("reload_seconds", 5)),
+    }
+
+
+def get_relevance_config() -> Dict[str, Any]:
+    cfg = get_config().get("relevance", {})
+    return {
+        "enabled": bool(cfg.get("enabled", True)),
+        # 哈希特征维度 2**dim_bits
+        "dim_bits": int(cfg.get("dim_bits", 16)),
+        "title_weight": float(cfg.get("title_weight", 2.0)),
+        "content_chars": int(cfg.get("content_chars", 200)),
+        # 低于该分数的条目不进入待分析队列（0 表示不过滤）
+        "min_score": float(cfg.get("min_score", 0.0)),
+    }
+
+
+def get_summary_cache_config() -> Dict[str, Any]:
+    cfg = get_config().get("summary_cache", {})
+    return {
+        "enabled": bool(cfg.get("enabled", True)),
+        "path": str(cfg.get("path", "data/summary_cache.json")),
+        # 摘要有效期（小时）与最大条数（超出按最近最少使用淘汰）
+        "ttl_hours": float(cfg.get("ttl_hours", 168)),
+        "max_entries": int(cfg.get("max_entries", 2000)),
+    }
@@ -0,0 +1,138 @@
+"""Benchmark: per-keyword substring scans vs. the Aho-Corasick ``KeywordMatcher``.
+
+Usage (from project root):
+    python benchmarks/bench_keywords.py [headlines] [page.html]
+
+Generates synthetic headlines (default 300000; about 30% contain a keyword)
+whose characters follow the visible text of a saved news page (default
+chinanews_debug.html), and tags them with the old ``match_keywords`` (one
+``kw in text`` per keyword), with ``match_keywords`` and with
+``match_keywords_many``. It then repeats the old loop and the automaton with
+a 10x vocabulary (extra keywords are 2-4 character snippets of the page) to
+show that the automaton's cost does not grow with the keyword count.
+"""
+
+from __future__ import annotations
+
+import html
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_crawler.config import (  # noqa: E402
+    AI_KEYWORDS,
+    GOLD_KEYWORDS,
+    POLICY_KEYWORDS,
+    TARGET_SECTORS,
+    match_keywords,
+    match_keywords_many,
+)
+from news_crawler.keyword_matcher import KeywordMatcher  # noqa: E402
+
+FILLER = "国务院发布关于推进经济高质量发展的若干意见市场股票指数上涨下跌公司业绩报告银行利率调整今日午间收盘"
+KEYWORDS = list(dict.fromkeys(TARGET_SECTORS + POLICY_KEYWORDS + GOLD_KEYWORDS + AI_KEYWORDS))
+
+
+def page_text(path: str) -> str:
+    """Visible CJK text of a saved page (falls back to FILLER)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = f.read()
+    except OSError:
+        return FILLER
+    raw = re.sub(r"<(script|style)[^>]*>.*?</\1>", "", raw, flags=re.S | re.I)
+    text = "".join(re.findall(r"[\u4e00-\u9fff]+", html.unescape(re.sub(r"<[^>]+>", "", raw))))
+    return text if len(text) > 200 else FILLER
+
+
+def make_headlines(n: int, corpus: str, rng: random.Random) -> List[str]:
+    out = []
+    for _ in range(n):
+        text = "".join(rng.choice(corpus) for _ in range(rng.randint(12, 40)))
+        if rng.random() < 0.3:
+            i = rng.randint(0, len(text))
+            text = text[:i] + rng.choice(KEYWORDS) + text[i:]
+        out.append(text)
+    return out
+
+
+def old_match_keywords(text: str) -> List[str]:
+    """The old ``match_keywords``: four keyword loops plus derived tags."""
+    tags: List[str] = []
+    policy_hit = ai_hit = False
+    for kw in TARGET_SECTORS:
+        if kw in text:
+            tags.append(kw)
+    for kw in POLICY_KEYWORDS:
+        if kw in text:
+            tags.append(kw)
+            policy_hit = True
+    for kw in GOLD_KEYWORDS:
+        if kw in text:
+            tags.append(kw)
+    for kw in AI_KEYWORDS:
+        if kw in text:
+            tags.append(kw)
+            ai_hit = True
+    if ai_hit:
+        tags.append("AI行业")
+    if policy_hit:
+        tags.append("政策类")
+    return list(dict.fromkeys(tags))
+
+
+def scan(keywords: List[str]) -> Callable[[str], List[str]]:
+    """The old matcher: one substring scan per keyword."""
+    def match(text: str) -> List[str]:
+        return [kw for kw in keywords if kw in text]
+    return match
+
+
+def bench(name: str, fn: Callable[[], object], n: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    total = time.perf_counter() - t0
+    print(f"{name:<40} {total:7.2f} s  {total / n * 1e6:6.2f} us/headline")
+    return total
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    corpus = page_text(sys.argv[2] if len(sys.argv) > 2 else "chinanews_debug.html")
+    rng = random.Random(1)
+    headlines = make_headlines(n, corpus, rng)
+    print(f"{n} headlines, {len(KEYWORDS)} keywords")
+    base = bench("match_keywords (old)", lambda: [old_match_keywords(t) for t in headlines], n)
+    for name, fn in (
+        ("match_keywords", lambda: [match_keywords(t) for t in headlines]),
+        ("match_keywords_many", lambda: match_keywords_many(headlines)),
+    ):
+        print(f"{'':<40} {base / bench(name, fn, n):7.1f}x faster")
+
+    # 10 倍词表：从页面文本截取 2-4 字片段作为额外关键词（与真实词表混合）
+    extra = set()
+    for _ in range(100 * len(KEYWORDS)):
+        if len(extra) >= 9 * len(KEYWORDS):
+            break
+        i = rng.randrange(len(corpus) - 4)
+        extra.add(corpus[i:i + rng.randint(2, 4)])
+    big = KEYWORDS + sorted(extra)
+    print(f"\n{n} headlines, {len(big)} keywords (10x vocabulary)")
+    t0 = time.perf_counter()
+    matcher = KeywordMatcher(big)
+    print(f"{'build automaton':<40} {(time.perf_counter() - t0) * 1000:7.2f} ms")
+    # 旧实现在大词表下很慢，只抽样计时
+    sample = headlines[: max(1, n // 10)]
+    old_big = scan(big)
+    base = bench("substring scans (old, 1/10 sample)", lambda: [old_big(t) for t in sample], len(sample))
+    per = bench("KeywordMatcher.find_many", lambda: matcher.find_many(headlines), n)
+    print(f"{'':<40} {base / len(sample) * n / per:7.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: list-page anchor extraction, BeautifulSoup vs. streaming.
+
+Usage (from project root):
+    python benchmarks/bench_link_extract.py [path/to/page.html] [rounds]
+
+Compares the old approach (full ``html.parser`` soup + ``select("a[href]")``)
+with ``news_crawler.link_extract.extract_links`` scanning the whole page,
+scoped to the ChinaNews list containers, and scoped with an early stop.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from news_crawler.chinanews import ChinaNewsCrawler  # noqa: E402
+from news_crawler.config import match_keywords  # noqa: E402
+from news_crawler.link_extract import extract_links  # noqa: E402
+
+BASE_URL = "https://www.chinanews.com.cn/china/"
+
+
+def _normalize(href: str) -> str:
+    if href.startswith("//"):
+        href = "https:" + href
+    return urllib.parse.urljoin(BASE_URL, href)
+
+
+def old_soup(html: str, limit: int) -> list:
+    soup = BeautifulSoup(html, "html.parser")
+    out = []
+    for a in soup.select("a[href]"):
+        title = a.get_text(strip=True)
+        href = a.get("href", "")
+        if not title or not href:
+            continue
+        if match_keywords(title):
+            out.append((title, _normalize(href)))
+            if len(out) >= limit:
+                break
+    return out
+
+
+def stream(html: str, limit: int, containers=None) -> list:
+    def accept(title, href):
+        return (title, _normalize(href)) if match_keywords(title) else None
+
+    return extract_links(html, accept, containers=containers, limit=limit)
+
+
+def bench(name: str, fn, rounds: int) -> float:
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    per = (time.perf_counter() - t0) / rounds * 1000
+    print(f"{name:<36} {per:8.2f} ms/page")
+    return per
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else "chinanews_debug.html"
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+    containers = ChinaNewsCrawler.list_containers
+    for label, page in (("1x", html), ("8x (large ministry-sized page)", html * 8)):
+        print(f"\n{path} {label}: {len(page) // 1024} KB, {rounds} rounds")
+        base = bench("BeautifulSoup + select (old)", lambda: old_soup(page, 50), rounds)
+        for name, fn in (
+            ("stream, whole page", lambda: stream(page, 50)),
+            ("stream, scoped containers", lambda: stream(page, 50, containers)),
+            ("stream, scoped, stop after 5", lambda: stream(page, 5, containers)),
+        ):
+            per = bench(name, fn, rounds)
+            print(f"{'':<36} {base / per:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
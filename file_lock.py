@@ -0,0 +1,132 @@
+"""Cross-process file locks and atomic file replacement.
+
+The crawler (``fast_job``) and the summarizer (``analysis_job``) may run as
+separate processes, or a ``--once`` run may overlap the daemon, so every
+store on disk must be safe for several local processes:
+
+- ``FileLock`` is an advisory lock on a ``.lock`` file (``fcntl.flock`` on
+  POSIX, ``msvcrt.locking`` on Windows). Stores take it around their
+  read-merge-write sections so one process's update never clobbers another's.
+  It is re-entrant within one instance and waits up to ``timeout`` seconds.
+- ``atomic_write`` writes to a unique temp file in the same directory, fsyncs
+  it and ``os.replace``s it over the target, so readers see either the old
+  or the new file, never a torn one, even without taking the lock.
+
+The queue and the StateStore backends are fully multi-writer. The keyed JSON
+stores (``schedule``, ``http_cache``, ``source_health``, ``detail_cache``,
+``summary_cache``) flush through ``json_store.merge_json``, which writes only
+the keys this process changed. The remaining crawl-state snapshots
+(``near_dup.json``, ``quote_series.bin``, fetch cursors, page fingerprints,
+charsets and quote stats) belong to the crawl process and are replaced
+whole: two overlapping crawl processes keep the last writer's copy, which
+at worst re-fetches a page or reports a repost or quote move again.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Union
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+
+class LockTimeout(TimeoutError):
+    pass
+
+
+class FileLock:
+    """Exclusive inter-process lock on ``path`` (usable as a context manager)."""
+
+    def __init__(self, path: str, timeout: float = 30.0, poll: float = 0.05) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.poll = poll
+        self._fd: Optional[int] = None
+        self._depth = 0
+        # threads of one process share the fd, so serialize them first
+        self._thread_lock = threading.RLock()
+
+    def _try_lock(self, fd: int) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self) -> None:
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise LockTimeout(f"等待锁超时: {self.path}")
+        if self._depth:
+            self._depth += 1
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            deadline = time.monotonic() + self.timeout
+            while not self._try_lock(fd):
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"等待锁超时: {self.path}")
+                time.sleep(self.poll)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._fd = fd
+        self._depth = 1
+
+    def release(self) -> None:
+        if not self._depth:
+            return
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def atomic_write(path: str, data: Union[bytes, str], fsync: bool = True) -> None:
+    """Replace ``path`` with ``data`` in one step (temp file + ``os.replace``)."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    raw = data.encode("utf-8") if isinstance(data, str) else data
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from file_lock import FileLock, LockTimeout, atomic_write
+
+
+def load_json(path: str, default: Any) -> Any:
+    """Read a JSON file, returning ``default`` when missing/corrupt or of another type."""
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, type(default)):
+                return data
+    except Exception:
+        pass
+    return default
+
+
+def save_json(path: str, data: Any) -> None:
+    """Write a small JSON cache file (best-effort, compact).
+
+    The file is replaced atomically, so a concurrent reader in another process
+    never sees a half-written cache.
+    """
+    try:
+        atomic_write(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")), fsync=False)
+    except Exception:
+        pass
+
+
+def merge_json(path: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Locked read-merge-write of a JSON object store.
+
+    ``changes`` holds the keys this process changed since its last flush
+    (``None`` deletes the key). They are applied to the file's current
+    contents under ``<path>.lock``, so keys another process saved meanwhile
+    survive. Returns the merged object, or None when the lock timed out.
+    """
+    try:
+        with FileLock(path + ".lock", timeout=10):
+            data = load_json(path, {})
+            for key, value in changes.items():
+                if value is None:
+                    data.pop(key, None)
+                else:
+                    data[key] = value
+            save_json(path, data)
+            return data
+    except LockTimeout as exc:
+        print(f"[存储] 保存 {path} 失败: {exc}")
+        return None
+
+
+def adopt_merged(data: Dict[str, Any], merged: Dict[str, Any], pending: Iterable[str]) -> None:
+    """Refresh ``data`` in place from ``merge_json``'s result.
+
+    Keys in ``pending`` (changed again since the flush started) keep their
+    in-memory value; other keys follow the file.
+    """
+    keep = set(pending)
+    for key in [k for k in data if k not in merged and k not in keep]:
+        del data[key]
+    for key, value in merged.items():
+        if key not in keep:
+            data[key] = value
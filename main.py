@@ -6,10 +6,14 @@ from zoneinfo import ZoneInfo
 import schedule
 import time
 from news_crawler import run_all_crawlers
+from news_crawler.registry import enabled_specs
+from news_crawler.ranking import rank
+from news_crawler.scheduler import SourceScheduler
 from summarizer.openai_summarizer import summarize_batch
 from wechat_pusher import push_to_wechat
 import sys
 from pending_store import PendingStore
+from app_config import get_relevance_config
 
 class Logger(object):
     def __init__(self, filename="print.log"):
@@ -24,6 +28,13 @@ class Logger(object):
 sys.stdout = Logger("print.log")
 sys.stderr = Logger("print.log")
 
+# 每轮分析任务最多送去 AI 摘要的条数
+ANALYSIS_BUDGET = 25
+# 快讯每条消息列出的条数 / 每轮入队上限（均按相关度从高到低截取）
+FLASH_LINES = {"policy": 15, "market": 20}
+ENQUEUE_LIMIT = {"policy": 30, "market": 40}
+
+
 def _classify(news_list):
     cctv_items = []
     policy_items = []
@@ -39,11 +50,17 @@ def _classify(news_list):
     return cctv_items, policy_items, market_items
 
 
-def fast_job():
-    """高频执行：抓取新内容后立即推送“快讯”（不等待AI）。"""
+def fast_job(scheduler: SourceScheduler | None = None):
+    """高频执行：抓取新内容后立即推送“快讯”（不等待AI）。
+
+    传入 scheduler 时只运行到期的源（各源独立轮询间隔）；否则全部运行。
+    没有到期的源时直接返回，不输出日志（调度检查每隔几秒一次）。
+    """
+    if scheduler is not None and not scheduler.due(spec.name for spec in enabled_specs()):
+        return
     print("=== FAST JOB START ===")
     print(f"[{datetime.now()}] 开始抓取任务(快讯)...")
-    news_list = run_all_crawlers()
+    news_list = run_all_crawlers(scheduler=scheduler)
     if not news_list:
         print("无新内容。")
         return
@@ -65,10 +82,12 @@ def fast_job():
     # 政策/市场：即时快讯只发标题+链接，避免被AI摘要阻塞
     now_ts = datetime.now().strftime("%m-%d %H:%M")
     pending = PendingStore()
+    # 按相关度排序（未打分时保持原顺序）；低于 min_score 的不进入 AI 队列
+    min_score = get_relevance_config()["min_score"]
 
     if policy_items:
         lines = []
-        for idx, it in enumerate(policy_items[:15], 1):
+        for idx, it in enumerate(rank(policy_items, FLASH_LINES["policy"]), 1):
             lines.append(f"{idx}. {it.get('title','')}\n   {it.get('url','')}")
         push_to_wechat({
             "title": f"【政策快讯】{now_ts}",
@@ -76,12 +95,12 @@ def fast_job():
             "url": "",
             "tags": ["政策类"],
         })
-        # 避免队列无限膨胀：只入队一部分，后续靠高频轮询持续补充
-        pending.add_many(policy_items[:30])
+        # 避免队列无限膨胀：只入队相关度最高的一部分，后续靠高频轮询持续补充
+        pending.add_many(rank(policy_items, ENQUEUE_LIMIT["policy"], min_score))
 
     if market_items:
         lines = []
-        for idx, it in enumerate(market_items[:20], 1):
+        for idx, it in enumerate(rank(market_items, FLASH_LINES["market"]), 1):
             lines.append(f"{idx}. {it.get('title','')}\n   {it.get('url','')}")
         push_to_wechat({
             "title": f"【市场快讯】{now_ts}",
@@ -89,24 +108,23 @@ def fast_job():
             "url": "",
             "tags": ["市场"],
         })
-        pending.add_many(market_items[:40])
+        pending.add_many(rank(market_items, ENQUEUE_LIMIT["market"], min_score))
 
 
 def analysis_job():
     """低频执行：从待分析队列取出内容，做AI摘要后再推送深度聚合。"""
     print("=== ANALYSIS JOB START ===")
     pending = PendingStore()
-    # 每轮只处理有限数量，避免AI摘要拖慢；未处理的留到下一轮
-    items = pending.pop_many(30)
+    # 每轮只摘要固定数量（AI 预算）；队列按优先级出队，预算留给最重要的内容，
+    # 未取出的留到下一轮，不再截断丢弃
+    items = pending.pop_many(ANALYSIS_BUDGET)
     if not items:
         print("无待分析内容。")
         return
 
     cctv_items, policy_items, market_items = _classify(items)
-    # CCTV 不做AI摘要，直接忽略（已在快讯里发过）
-    policy_items = policy_items[:10]
-    market_items = market_items[:15]
-    items_to_summarize = policy_items + market_items
+    # CCTV 不做AI摘要，直接忽略（已在快讯里发过）；聚合消息按相关度排列
+    items_to_summarize = rank(policy_items) + rank(market_items)
 
     print(f"待分析：政策 {len(policy_items)} 条，市场 {len(market_items)} 条，共 {len(items_to_summarize)} 条")
     if not items_to_summarize:
@@ -152,7 +170,8 @@ def analysis_job():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="AI 新闻推送工具")
     parser.add_argument("--once", action="store_true", help="只执行一次后退出（CI/工作流模式）")
-    parser.add_argument("--poll-seconds", type=int, default=180, help="快讯抓取轮询间隔（秒，越小越即时）")
+    parser.add_argument("--poll-seconds", type=int, default=180, help="未单独配置轮询间隔的源的默认间隔（秒）")
+    parser.add_argument("--tick-seconds", type=int, default=15, help="调度检查间隔（秒）：每次只抓取到期的源")
     parser.add_argument("--analysis-mins", type=int, default=60, help="AI深度分析聚合间隔（分钟）")
     parser.add_argument("--interval-mins", type=int, default=None, help="兼容旧参数：循环间隔（分钟，已弃用）")
     args = parser.parse_args()
@@ -161,18 +180,23 @@ if __name__ == "__main__":
     if args.interval_mins is not None:
         args.poll_seconds = max(30, int(args.interval_mins) * 60)
 
-    fast_job()  # 启动时立即执行一次快讯
+    # once 模式抓取全部源；常驻模式从启动起就按源调度（到期状态持久化在 data/schedule.json）
+    scheduler = None if args.once else SourceScheduler(default_interval=args.poll_seconds)
+    fast_job(scheduler=scheduler)  # 启动时立即执行一次快讯
 
     if args.once:
         # once 模式下额外跑一次分析，尽量把快讯补上深度解读
         analysis_job()
         sys.exit(0)
 
-    # 循环模式：快讯高频轮询 + 分析低频聚合
+    # 循环模式：按源独立调度的快讯轮询 + 分析低频聚合
     schedule.clear()
-    schedule.every(args.poll_seconds).seconds.do(fast_job)
+    schedule.every(args.tick_seconds).seconds.do(fast_job, scheduler=scheduler)
     schedule.every(args.analysis_mins).minutes.do(analysis_job)
-    print(f"AI新闻推送工具已启动：快讯轮询 {args.poll_seconds}s，深度分析 {args.analysis_mins}min")
+    print(
+        f"AI新闻推送工具已启动：调度检查 {args.tick_seconds}s（默认源间隔 {args.poll_seconds}s），"
+        f"深度分析 {args.analysis_mins}min"
+    )
     while True:
         schedule.run_pending()
-        time.sleep(5)
+        time.sleep(1)
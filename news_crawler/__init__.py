@@ -1,18 +1,29 @@
 from .base import NewsCrawler
-from .eastmoney_fund import EastMoneyFundCrawler
-from .chinanews import ChinaNewsCrawler
-from .eastmoney_flash import EastMoneyFlashCrawler
-from .gold_price import GoldPriceCrawler
-from .gold_price_sina import SinaGoldPriceCrawler
-from .config import match_keywords, TARGET_SECTORS
-from .sector_open import SectorOpenCrawler
-from .policy_watch import PolicyWatchCrawler
-from .policy_sources import MultiPolicyCrawler
-from .cctv_news import CCTVNewsCrawler
+from .config import keyword_tagger, match_keywords_many, TARGET_SECTORS
+from .http_client import HttpClient, get_http_client
+from .engine import CrawlEngine
+from .scheduler import SourceScheduler
+from .charset import get_host_charsets
+from .fingerprint import get_fingerprints
+from .near_dup import get_near_dup_index, NearDupIndex
+from .quote_series import annotate, get_quote_series, QuoteSeriesStore
+from .registry import enabled_specs, find_spec, instantiate, load_class
+from app_config import get_crawl_config, get_http_config, get_near_dup_config, get_relevance_config
 from state_store import StateStore
-import concurrent.futures
+import asyncio
+import collections
 import hashlib
-from typing import Any, Dict, Iterable, List, Tuple
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def __getattr__(name: str) -> Any:
+    """Lazy re-export of crawler classes (``from news_crawler import ChinaNewsCrawler``)."""
+    spec = find_spec(name) if name.endswith("Crawler") else None
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return load_class(spec)
 
 
 def _stable_item_key(it: Dict[str, Any]) -> str:
@@ -47,92 +58,282 @@ def _deduplicate(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return deduped
 
 
-def run_all_crawlers():
+def _take_new(store: StateStore, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Items not yet in ``store`` (first occurrence per key); marks them seen.
+
+    One batched lookup and one batched write per call.
+    """
+    keyed = [(_stable_item_key(it), it) for it in items]
+    seen = store.seen_many(k for k, _ in keyed)
+    fresh: List[Dict[str, Any]] = []
+    new_keys: List[str] = []
+    for key, item in keyed:
+        if key in seen:
+            continue
+        seen.add(key)
+        new_keys.append(key)
+        fresh.append(item)
+    store.mark_many(new_keys)
+    return fresh
+
+
+def _drop_near_duplicates(
+    items: Iterable[Dict[str, Any]], index: NearDupIndex, skip: Optional[set] = None
+) -> List[Dict[str, Any]]:
+    """Drop items that repeat a story already seen (this round or recently).
+
+    The copy kept in this round carries ``dup_count``, the number of near
+    duplicates seen for its story. Copies arriving in later rounds only bump
+    the index; ``PendingStore`` reads those counts at pop time. Items whose
+    ``id()`` is in ``skip`` (quotes) are kept as they are.
+    """
+    kept: List[Dict[str, Any]] = []
+    by_key: Dict[str, Dict[str, Any]] = {}
+    dropped = 0
+    for it in items:
+        if skip and id(it) in skip:
+            kept.append(it)
+            continue
+        key = _stable_item_key(it)
+        match = index.check(it, key)
+        if match is None:
+            by_key[key] = it
+            kept.append(it)
+            continue
+        first_key, count = match
+        if first_key in by_key:
+            by_key[first_key]["dup_count"] = count
+        dropped += 1
+    if dropped:
+        print(f"[去重] 近似重复 {dropped} 条已过滤")
+    return kept
+
+
+def _track_quotes(
+    items: Iterable[Dict[str, Any]], quotes: QuoteSeriesStore, limit: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Record quote ticks; returns (items whose move crossed the threshold, items without a quote).
+
+    Every tick is recorded, but at most ``limit`` moved items are returned and
+    only those become the reference for the next threshold check.
+    """
+    now = time.time()
+    moved: List[Dict[str, Any]] = []
+    plain: List[Dict[str, Any]] = []
+    for item in items:
+        quote = item.pop("quote", None)
+        if not isinstance(quote, dict) or not quote.get("key"):
+            plain.append(item)
+            continue
+        key, price = str(quote["key"]), float(quote["price"])
+        stats = quotes.update(key, now, price)
+        if stats is not None and (limit is None or len(moved) < limit):
+            quotes.mark_pushed(key, price)
+            moved.append(annotate(item, stats))
+    return moved, plain
+
+
+def run_all_crawlers(
+    client: Optional[HttpClient] = None,
+    scheduler: Optional[SourceScheduler] = None,
+):
     """Run all crawlers, then filter by target sectors/keywords.
 
+    All crawlers share one pooled HTTP client (keep-alive across pages and
+    across polls); pass ``client`` to override the process-wide default.
+
+    With a ``scheduler`` only the sources that are due run, and each one's
+    next interval is learned from how many new items it produced. Without it
+    every enabled crawler runs (``--once`` mode).
+
+    Crawlers come from the registry (``news_crawler.registry``); their modules
+    are imported only when they are first scheduled.
+
+    The round is bounded by ``crawl.deadline_seconds``: crawlers still running
+    at the deadline are abandoned and only the finished ones are processed, so
+    a hanging site cannot hold back the fast sources.
+
     Returns list of dicts with optional field 'tags' indicating matched keywords.
     """
-    crawlers = [
-        EastMoneyFlashCrawler(),
-        EastMoneyFundCrawler(),
-        ChinaNewsCrawler(),
-        GoldPriceCrawler(),  # 黄金价格监测（东财）
-        SinaGoldPriceCrawler(),  # 黄金价格监测（新浪）
-        SectorOpenCrawler(),  # 关注板块的当日开盘/盘中快照
-        PolicyWatchCrawler(),  # 重大会议/政策/外交要闻
-        MultiPolicyCrawler(),  # 多部委/交易所等政策/公告源
-        CCTVNewsCrawler(),     # 新闻联播内容
-    ]
-
-    def _run_one(crawler: NewsCrawler) -> Tuple[str, List[Dict[str, Any]]]:
+    specs = enabled_specs()
+    if scheduler is not None:
+        due = set(scheduler.due(s.name for s in specs))
+        specs = [s for s in specs if s.name in due]
+        if not specs:
+            return []
+        print(f"[调度] 本轮到期: {', '.join(sorted(due))}")
+    # 只导入本轮到期的爬虫模块
+    entries = instantiate(specs)
+    if scheduler is not None and len(entries) < len(specs):
+        # 缺依赖/加载失败的源按原间隔推迟，避免每次调度检查都重新尝试
+        loaded = {s.name for s, _ in entries}
+        for spec in specs:
+            if spec.name not in loaded:
+                scheduler.defer(spec.name)
+        scheduler.flush()
+    if not entries:
+        return []
+    crawlers = [c for _, c in entries]
+    lanes = {s.name: s.lane for s, _ in entries}
+    names = {id(c): s.name for s, c in entries}
+    client = client or get_http_client()
+    store = StateStore()
+    quotes = get_quote_series()
+    # 超时被放弃的爬虫线程仍可能在 store 关闭后调用 seen_index：关闭后一律视为未见过
+    store_lock = threading.Lock()
+    store_open = [True]
+
+    def _seen(it: Dict[str, Any]) -> bool:
+        with store_lock:
+            if not store_open[0]:
+                return False
+            try:
+                return store.seen(_stable_item_key(it))
+            except Exception:  # noqa: BLE001
+                return False
+
+    for crawler in crawlers:
+        crawler.http = client
+        crawler.seen_index = _seen
+
+    http_cfg = get_http_config()
+    deadline = get_crawl_config()["deadline_seconds"]
+    engine = CrawlEngine(
+        max_concurrency=http_cfg["max_concurrency"],
+        per_host=http_cfg["per_host_concurrency"],
+    )
+
+    async def _run_one(crawler: NewsCrawler) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
         try:
-            result = crawler.crawl()  # type: ignore[attr-defined]
+            result = await crawler.acrawl(engine)
         except Exception as exc:  # noqa: BLE001 - keep system running
-            print(f"[爬虫错误] {crawler.__class__.__name__}: {exc}")
-            result = []
+            print(f"[爬虫错误] {names[id(crawler)]}: {exc}")
+            # None: 未完成（与超时放弃的源同样处理）
+            return (names[id(crawler)], None)
         if not isinstance(result, list):
             result = []
         # attach source for debugging/tracing (won't break downstream)
         for it in result:
             if isinstance(it, dict):
-                it.setdefault("source", crawler.__class__.__name__)
-        return (crawler.__class__.__name__, result)  # type: ignore[return-value]
+                it.setdefault("source", names[id(crawler)])
+        return (names[id(crawler)], result)  # type: ignore[return-value]
 
     news_list: List[Dict[str, Any]] = []
-    store = StateStore()
+    quote_ids: set = set()
+    tag = keyword_tagger()
     gold_snapshot = None
 
-    # Run crawlers concurrently (IO-bound). Post-process sequentially to keep
+    # Run crawlers concurrently on the asyncio engine (crawlers with acrawl()
+    # also fan out their own sources). Post-process sequentially to keep
     # StateStore operations simple and deterministic.
-    max_workers = min(8, max(1, len(crawlers)))
-    results_by_name: Dict[str, List[Dict[str, Any]]] = {}
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = [ex.submit(_run_one, c) for c in crawlers]
-        for fut in concurrent.futures.as_completed(futures):
-            name, result = fut.result()
-            results_by_name[name] = result
+    async def _run_round() -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        tasks = {asyncio.ensure_future(_run_one(c)): names[id(c)] for c in crawlers}
+        done, pending = await asyncio.wait(tasks, timeout=deadline if deadline > 0 else None)
+        for task in pending:
+            task.cancel()
+        if pending:
+            late = sorted(tasks[t] for t in pending)
+            print(f"[超时] 本轮超过 {deadline:.0f}s 时限，放弃未完成的源: {', '.join(late)}")
+        return dict(t.result() for t in done)
+
+    results_by_name = engine.run(_run_round, extra_workers=len(crawlers))
+    # 抛出异常或超时被放弃的源都不算完成
+    finished = {name for name, result in results_by_name.items() if result is not None}
 
     for crawler in crawlers:
-        cname = crawler.__class__.__name__
-        result = results_by_name.get(cname, [])
+        cname = names[id(crawler)]
+        if cname not in finished:
+            continue
+        result = results_by_name[cname] or []
+        lane = lanes[cname]
         print(f"[爬虫调试] {cname} 抓取到 {len(result)} 条")
-        # 合并黄金来源：只保留一条
-        if isinstance(crawler, (GoldPriceCrawler, SinaGoldPriceCrawler)):
-            # 若已有黄金快照，跳过后续黄金源
-            if gold_snapshot is not None:
-                continue
-            if result:
+        # 行情类（黄金/板块）：每个 tick 记入时间序列，涨跌超过阈值才推送，不走 StateStore
+        if lane in ("gold", "quote"):
+            if lane == "gold":
+                # 合并黄金来源：若已有黄金快照，跳过后续黄金源
+                if gold_snapshot is not None or not result:
+                    continue
                 gold_snapshot = result[0]
-                text = f"{gold_snapshot.get('title','')}\n{gold_snapshot.get('content','')}"
-                tags = gold_snapshot.get("tags") or match_keywords(text)
+            # 黄金只推一条；未推送的报价不更新推送基准
+            moved, plain = _track_quotes(result, quotes, limit=1 if lane == "gold" else None)
+            if lane == "gold":
+                plain = plain[:1]
+            for item in moved:
+                text = f"{item.get('title','')}\n{item.get('content','')}"
+                tags = item.get("tags") or tag(text)
                 if tags:
-                    gold_snapshot["tags"] = tags
-                key = _stable_item_key(gold_snapshot)
-                if not store.seen(key):
-                    store.mark(key)
-                    news_list.append(gold_snapshot)
+                    item["tags"] = tags
+                news_list.append(item)
+                quote_ids.add(id(item))
+            # 无结构化行情的条目（如抓取失败提示）仍按 StateStore 去重
+            news_list.extend(_take_new(store, plain))
             continue
-        
-        # CCTV Special Handling (Always add if found, maybe skip keyword match or ensure it has tags)
-        if isinstance(crawler, CCTVNewsCrawler):
-            for item in result:
-                # CCTV items usually already have tags assigned in crawler
-                key = _stable_item_key(item)
-                if not store.seen(key):
-                    store.mark(key)
-                    news_list.append(item)
+
+        # direct lane (CCTV): always add if found; crawler assigns its own tags
+        if lane == "direct":
+            # CCTV items usually already have tags assigned in crawler
+            news_list.extend(_take_new(store, result))
             continue
 
-        for item in result:
-            text = f"{item.get('title','')}\n{item.get('content','')}"
-            tags = item.get("tags") or match_keywords(text)
+        untagged = [item for item in result if not item.get("tags")]
+        texts = (f"{item.get('title','')}\n{item.get('content','')}" for item in untagged)
+        for item, tags in zip(untagged, match_keywords_many(texts)):
             if tags:
                 item["tags"] = tags
-                key = _stable_item_key(item)
-                if not store.seen(key):
-                    store.mark(key)
-                    news_list.append(item)
+        tagged = [item for item in result if item.get("tags")]
+        news_list.extend(_take_new(store, tagged))
     news_list = _deduplicate(news_list)
+    near_dup = get_near_dup_index() if get_near_dup_config()["enabled"] else None
+    if near_dup is not None:
+        # 跨来源的同一事件（转载、改写标题）只保留首条；行情快照不参与
+        news_list = _drop_near_duplicates(news_list, near_dup, skip=quote_ids)
+    if news_list and get_relevance_config()["enabled"]:
+        # 整批一次向量化打分，下游按 item["score"] 排序截取；
+        # 用到时才导入（numpy），保持 import news_crawler 轻量
+        from .relevance import score_items
+
+        t0 = time.perf_counter()
+        score_items(news_list)
+        print(f"[相关度] {len(news_list)} 条打分耗时 {(time.perf_counter() - t0) * 1000:.1f}ms")
     print(f"[筛选] 关注板块：{', '.join(TARGET_SECTORS)}，产出 {len(news_list)} 条")
-    store.flush()
+    with store_lock:
+        store.flush()
+        store.close()
+        store_open[0] = False
+    # 条目已落盘，再提交完成的源的抓取进度（游标等）
+    for crawler in crawlers:
+        if names[id(crawler)] in finished:
+            try:
+                crawler.commit()
+            except Exception as exc:  # noqa: BLE001
+                print(f"[爬虫错误] {names[id(crawler)]} 提交进度失败: {exc}")
+    quotes.flush()
+    if near_dup is not None:
+        near_dup.flush()
+    get_host_charsets().flush()
+    # 超时被放弃或出错的源不提交指纹和条件请求缓存，下轮重新处理
+    done_crawlers = [c for c in crawlers if names[id(c)] in finished]
+    get_fingerprints().flush(owners=done_crawlers)
+    if scheduler is not None:
+        new_counts = collections.Counter(it.get("source") for it in news_list)
+        for crawler in crawlers:
+            cname = names[id(crawler)]
+            succeeded, failed = client.outcome(crawler)
+            # 出错、超时放弃或请求全部失败/被熔断跳过：本轮没有看到源的真实更新，
+            # 不计入间隔学习（否则会被当成“无新内容”而拉长间隔），按原间隔重试
+            if cname not in finished or (failed and not succeeded):
+                interval = scheduler.defer(cname)
+                print(f"[调度] {cname} 本轮未完成，不计入间隔学习，{interval:.0f}s 后重试")
+                continue
+            if lanes[cname] in ("gold", "quote"):
+                # 行情源只在涨跌越过阈值时产出条目，按新增条数学习会被退避到最长间隔，
+                # 因此固定按基础间隔轮询
+                interval = scheduler.reschedule(cname)
+                print(f"[调度] {cname} 行情源，固定间隔 {interval:.0f}s")
+                continue
+            interval = scheduler.record(cname, new_counts.get(cname, 0))
+            print(f"[调度] {cname} 新增 {new_counts.get(cname, 0)} 条，下次间隔 {interval:.0f}s")
+        scheduler.flush()
+    client.flush(owners=done_crawlers)
+    client.report()
     return news_list
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import time
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING
 
 from .base import NewsCrawler
+from .charset import resolve_encoding
+from .link_extract import extract_links
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
 
 
 class AINewsCrawler(NewsCrawler):
@@ -25,15 +29,11 @@ class AINewsCrawler(NewsCrawler):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
         }
         self.max_per_source = 40
+        # 每个源的列表容器选择器；未配置/不存在时全页扫描
+        self.containers: dict[str, list[str]] = {}
 
     def _extract(self, html: str, base_url: str) -> list[dict]:
-        soup = BeautifulSoup(html, "html.parser")
-        results: list[dict] = []
-        for a in soup.select("a"):
-            title = a.get_text(strip=True)
-            href = a.get("href")
-            if not title or not href:
-                continue
+        def accept(title: str, href: str):
             if href.startswith("/"):
                 # basic join
                 if base_url.endswith("/"):
@@ -41,29 +41,41 @@ class AINewsCrawler(NewsCrawler):
                 else:
                     href = base_url + href
             if not href.startswith("http"):
-                continue
+                return None
             # Rough filter to keep AI/model posts primarily
             if any(k in title for k in ("模型", "大模型", "LLM", "AI", "多模态", "发布", "开源", "推理", "评测", "对齐", "指令")):
-                results.append({"title": title, "url": href, "content": title})
-                if len(results) >= self.max_per_source:
-                    break
-        return results
+                return {"title": title, "url": href, "content": title}
+            return None
 
-    def crawl(self):
+        return extract_links(
+            html,
+            accept,
+            containers=self.containers.get(base_url),
+            limit=self.max_per_source,
+        )
+
+    def _crawl_source(self, src: str) -> list[dict] | None:
+        """Extracted items of one source; None when its link list is unchanged."""
+        resp = self.fetch(src, headers=self.headers, timeout=10)
+        resp.encoding = resolve_encoding(resp)
+        items = self._extract(resp.text, src)
+        if items and self.page_unchanged(src, items):
+            return None
+        return items
+
+    def _collect(self, outcomes) -> list[dict]:
         items: list[dict] = []
         failures: list[str] = []
-        for src in self.sources:
-            try:
-                resp = requests.get(src, headers=self.headers, timeout=10)
-                resp.encoding = resp.apparent_encoding
-                extracted = self._extract(resp.text, src)
-                if extracted:
-                    items.extend(extracted)
-                else:
-                    failures.append(src)
-            except Exception as exc:  # noqa: BLE001
-                failures.append(f"{src} 错误: {exc}")
-            time.sleep(0.3)
+        for src, res in outcomes:
+            if isinstance(res, Exception):
+                failures.append(f"{src} 错误: {res}")
+            elif res is None:
+                # 链接列表与上一轮相同：无新内容，不算失败
+                continue
+            elif res:
+                items.extend(res)
+            else:
+                failures.append(src)
         if failures:
             items.append({
                 "title": "AI新闻抓取失败",
@@ -72,4 +84,18 @@ class AINewsCrawler(NewsCrawler):
             })
         return items
 
+    def crawl(self):
+        outcomes = []
+        for src in self.sources:
+            try:
+                outcomes.append((src, self._crawl_source(src)))
+            except Exception as exc:  # noqa: BLE001
+                outcomes.append((src, exc))
+            time.sleep(0.3)
+        return self._collect(outcomes)
+
+    async def acrawl(self, engine: "CrawlEngine") -> list[dict]:
+        results = await engine.map(self._crawl_source, self.sources)
+        return self._collect(zip(self.sources, results))
+
 
@@ -1,14 +1,11 @@
 from __future__ import annotations
 
 from typing import List
-import time
-import requests
 
-from .base import NewsCrawler
-from .rss_utils import parse_rss_or_atom
+from .rss_utils import FeedCrawler
 
 
-class AIOfficialBlogsCrawler(NewsCrawler):
+class AIOfficialBlogsCrawler(FeedCrawler):
     """Fetch AI official blog updates via RSS/Atom when available."""
 
     def __init__(self) -> None:
@@ -31,27 +28,4 @@ class AIOfficialBlogsCrawler(NewsCrawler):
         ]
         self.headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
         self.max_items = 200
-
-    def crawl(self):
-        items: List[dict] = []
-        failures: List[str] = []
-        for url in self.feeds:
-            try:
-                resp = requests.get(url, headers=self.headers, timeout=10)
-                parsed = parse_rss_or_atom(resp.text)
-                if parsed:
-                    items.extend(parsed[: self.max_items])
-                else:
-                    failures.append(url)
-            except Exception as exc:  # noqa: BLE001
-                failures.append(f"{url} 错误: {exc}")
-            time.sleep(0.2)
-        if failures:
-            items.append({
-                "title": "AI官方博客抓取失败",
-                "content": "; ".join(failures)[:2000],
-                "url": "",
-            })
-        return items
-
-
+        self.failure_title = "AI官方博客抓取失败"
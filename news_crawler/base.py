@@ -1,5 +1,60 @@
 # news_crawler/base.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import requests
+
+from .fingerprint import get_fingerprints, links_digest
+from .http_client import HttpClient, get_http_client
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
+
+
 class NewsCrawler:
     """新闻爬虫基类，所有爬虫需继承此类"""
+
+    # 由 run_all_crawlers 注入的共享连接池客户端；单独使用爬虫时回落到进程级默认客户端
+    http: Optional[HttpClient] = None
+    # 由 run_all_crawlers 注入：判断条目是否已在 StateStore 中（用于跳过昂贵的详情抓取）
+    seen_index: Optional[Callable[[Dict[str, Any]], bool]] = None
+    # 组合爬虫（如 HedgedGoldCrawler）把自己设为子爬虫的 owner，请求结果计入组合爬虫
+    owner: Optional["NewsCrawler"] = None
+
+    def fetch(self, url: str, conditional: bool = False, **kwargs: Any) -> requests.Response:
+        """GET through the shared pooled client (keep-alive across requests).
+
+        ``conditional=True`` sends cached ETag/Last-Modified; a 304 response
+        means the page is unchanged since the last poll.
+        """
+        client = self.http or get_http_client()
+        return client.get(url, conditional=conditional, owner=self.owner or self, **kwargs)
+
+    def is_seen(self, item: Dict[str, Any]) -> bool:
+        """True when ``item`` was already delivered in an earlier run."""
+        return bool(self.seen_index is not None and self.seen_index(item))
+
+    def page_unchanged(self, source: str, items: List[Dict[str, Any]]) -> bool:
+        """True when the links extracted from ``source`` match the previous poll."""
+        return get_fingerprints().check(source, links_digest(items), owner=self.owner or self)
+
     def crawl(self):
         raise NotImplementedError("子类需实现 crawl 方法")
+
+    def commit(self) -> None:
+        """Persist progress staged by ``crawl`` (e.g. fetch cursors).
+
+        ``run_all_crawlers`` calls this only for crawlers that finished the
+        round, after their items were stored; a crawler abandoned at the
+        deadline or failing after its fetches never commits, so the next round
+        fetches the same range again.
+        """
+
+    async def acrawl(self, engine: "CrawlEngine") -> List[dict]:
+        """Async entry point used by the crawl engine.
+
+        Default adapter: run the sync ``crawl()`` on the engine's thread pool.
+        Crawlers with several sources override this to fetch them concurrently.
+        """
+        return await engine.run_sync(self.crawl)
@@ -1,67 +1,110 @@
+import concurrent.futures
+import urllib.parse
+from typing import TYPE_CHECKING
+
 from .base import NewsCrawler
-import requests
+from .charset import resolve_encoding
+from .link_extract import extract_links
 from bs4 import BeautifulSoup
-from datetime import datetime
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
+
 
 class CCTVNewsCrawler(NewsCrawler):
-    """CCTV News (Xinwen Lianbo) Summary Crawler"""
+    """CCTV News (Xinwen Lianbo) Summary Crawler
+
+    Cost per poll is the four index pages: links are deduplicated across the
+    pages and checked against the seen index first, so the (large) program
+    text is only downloaded for episodes we have not pushed yet, concurrently.
+    """
+
+    # Target: Find the latest "Xinwen Lianbo" summary
+    # Usually found on news.cctv.com or news.cctv.com/china/
+    urls = [
+        "https://news.cctv.com/china/",
+        "https://news.cctv.com/world/",
+        "https://tv.cctv.com/lm/xwlb/",
+        "https://news.cctv.com/lbj/", # 联播+
+    ]
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'
+    }
+    max_detail_workers = 4
+
     def crawl(self):
-        # Target: Find the latest "Xinwen Lianbo" summary
-        # Usually found on news.cctv.com or news.cctv.com/china/
-        urls = [
-            "https://news.cctv.com/china/",
-            "https://news.cctv.com/world/",
-            "https://tv.cctv.com/lm/xwlb/",
-            "https://news.cctv.com/lbj/", # 联播+
-        ]
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'
-        }
-        
-        found_items = []
-        today_str = datetime.now().strftime("%Y%m%d")
-        
-        for url in urls:
-            try:
-                resp = requests.get(url, headers=headers, timeout=10)
-                resp.encoding = resp.apparent_encoding
-                soup = BeautifulSoup(resp.text, "html.parser")
-                
-                for a in soup.find_all('a'):
-                    title = a.get_text(strip=True)
-                    link = a.get('href')
-                    
-                    # Pattern: "《新闻联播》 20241226期 节目主要内容"
-                    if title and "新闻联播" in title and "主要内容" in title:
-                        # Optional: Check if it matches today's date if strict daily push is required
-                        # But user said "after the end", so grabbing the latest is fine.
-                        # We can filter by date if needed.
-                        
-                        # Fetch content
-                        content = self._fetch_content(link, headers)
-                        found_items.append({
-                            "title": title,
-                            "content": content,
-                            "url": link,
-                            "tags": ["政治", "新闻联播"]
-                        })
-            except Exception as e:
-                print(f"[CCTV] Error scraping {url}: {e}")
-                
-        # Deduplicate by URL
-        unique_items = []
+        links_per_page = [self._scan_page(url) for url in self.urls]
+        links = self._select(links_per_page)
+        contents = []
+        if links:
+            max_workers = min(self.max_detail_workers, len(links))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+                contents = list(ex.map(self._fetch_content, [it["url"] for it in links]))
+        return self._build(links, contents)
+
+    async def acrawl(self, engine: "CrawlEngine"):
+        # 四个索引页并发抓取；去重、过滤已推送后再并发抓取详情
+        results = await engine.map(self._scan_page, self.urls)
+        links = self._select(res for res in results if not isinstance(res, Exception))
+        contents = await engine.map(self._fetch_content, [it["url"] for it in links])
+        return self._build(links, [c if isinstance(c, str) else "" for c in contents])
+
+    def _scan_page(self, url):
+        """Matching 《新闻联播》 links of one index page (no detail fetches)."""
+        try:
+            resp = self.fetch(url, headers=self.headers, timeout=10, conditional=True)
+            if resp.status_code == 304:
+                # 索引页未变化：没有新的联播条目
+                return []
+            resp.encoding = resolve_encoding(resp)
+
+            # Pattern: "《新闻联播》 20241226期 节目主要内容"
+            # Optional: Check if it matches today's date if strict daily push is required
+            # But user said "after the end", so grabbing the latest is fine.
+            # We can filter by date if needed.
+            def accept(title, link):
+                if "新闻联播" in title and "主要内容" in title:
+                    return {"title": title, "url": urllib.parse.urljoin(url, link)}
+                return None
+
+            links = extract_links(resp.text, accept)
+            if self.page_unchanged(url, links):
+                # 索引页链接未变化：不再重复处理
+                return []
+            return links
+        except Exception as e:
+            print(f"[CCTV] Error scraping {url}: {e}")
+            return []
+
+    def _select(self, links_per_page):
+        """Deduplicate by URL across index pages and drop already-seen episodes."""
+        selected = []
         seen_urls = set()
-        for item in found_items:
-            if item['url'] not in seen_urls:
-                seen_urls.add(item['url'])
-                unique_items.append(item)
-                
-        return unique_items
+        for links in links_per_page:
+            for item in links:
+                if item["url"] in seen_urls:
+                    continue
+                seen_urls.add(item["url"])
+                if self.is_seen(item):
+                    continue
+                selected.append(item)
+        return selected
+
+    def _build(self, links, contents):
+        return [
+            {
+                "title": item["title"],
+                "content": content,
+                "url": item["url"],
+                "tags": ["政治", "新闻联播"],
+            }
+            for item, content in zip(links, contents)
+        ]
 
-    def _fetch_content(self, url, headers):
+    def _fetch_content(self, url):
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.encoding = resp.apparent_encoding
+            resp = self.fetch(url, headers=self.headers, timeout=10)
+            resp.encoding = resolve_encoding(resp)
             soup = BeautifulSoup(resp.text, "html.parser")
             
             # Content usually in #content_area or .content_area
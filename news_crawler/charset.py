@@ -0,0 +1,124 @@
+"""Cheap charset resolution for HTML responses.
+
+The HTML crawlers used to set ``resp.encoding = resp.apparent_encoding``,
+which runs statistical detection (charset_normalizer) over the whole body of
+every list and detail page. ``resolve_encoding`` tries the cheap sources
+first and only falls back to detection when all of them are missing:
+
+1. ``charset=`` in the Content-Type header
+2. ``<meta charset>`` / ``<meta http-equiv="Content-Type">`` in the first 4 KB
+3. the encoding previously learned for the same host
+4. ``resp.apparent_encoding`` (result is remembered for the host)
+
+GB2312/GBK labels are widened to GB18030, a strict superset: Chinese sites
+that declare gb2312 routinely use characters outside it.
+
+See ``benchmarks/bench_charset.py`` for timings.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+import threading
+import urllib.parse
+from typing import Dict, Optional
+
+import requests
+
+from json_store import load_json, save_json
+
+_HEAD_BYTES = 4096
+_META_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_HEADER_RE = re.compile(r"""charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+_ALIASES = {
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+    "x-gbk": "gb18030",
+    "cp936": "gb18030",
+    "utf8": "utf-8",
+}
+
+
+def normalize_charset(label: Optional[str]) -> Optional[str]:
+    """Canonical codec name for ``label``, or None when Python cannot decode it."""
+    if not label:
+        return None
+    label = label.strip().strip("\"'").lower()
+    label = _ALIASES.get(label, label)
+    try:
+        name = codecs.lookup(label).name
+    except LookupError:
+        return None
+    return _ALIASES.get(name, name)
+
+
+class HostCharsets:
+    """{host: encoding} learned from earlier responses, persisted as JSON."""
+
+    def __init__(self, path: str = "data/host_charsets.json") -> None:
+        self.path = path
+        self.data: Dict[str, str] = load_json(path, {})
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> Optional[str]:
+        with self._lock:
+            return self.data.get(host)
+
+    def learn(self, host: str, encoding: str) -> None:
+        if not host:
+            return
+        with self._lock:
+            if self.data.get(host) != encoding:
+                self.data[host] = encoding
+                self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self.data)
+            self._dirty = False
+        save_json(self.path, snapshot)
+
+
+_default: Optional[HostCharsets] = None
+_default_lock = threading.Lock()
+
+
+def get_host_charsets() -> HostCharsets:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HostCharsets()
+        return _default
+
+
+def _from_header(resp: requests.Response) -> Optional[str]:
+    # requests 对无 charset 的 text/* 默认 ISO-8859-1，这里只认显式声明
+    match = _HEADER_RE.search(resp.headers.get("Content-Type", ""))
+    return normalize_charset(match.group(1)) if match else None
+
+
+def _from_meta(content: bytes) -> Optional[str]:
+    match = _META_RE.search(content[:_HEAD_BYTES])
+    return normalize_charset(match.group(1).decode("ascii", "ignore")) if match else None
+
+
+def resolve_encoding(resp: requests.Response, hosts: Optional[HostCharsets] = None) -> str:
+    """Pick the encoding for ``resp`` without full-body detection when possible."""
+    hosts = hosts if hosts is not None else get_host_charsets()
+    host = urllib.parse.urlparse(resp.url or "").netloc
+    encoding = _from_header(resp) or _from_meta(resp.content or b"")
+    if encoding:
+        hosts.learn(host, encoding)
+        return encoding
+    encoding = hosts.get(host)
+    if encoding:
+        return encoding
+    # 最后手段：整页统计检测，结果按站点记住
+    encoding = normalize_charset(resp.apparent_encoding) or "utf-8"
+    hosts.learn(host, encoding)
+    return encoding
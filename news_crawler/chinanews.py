@@ -1,57 +1,86 @@
 # news_crawler/chinanews.py
 from .base import NewsCrawler
-import requests
 from bs4 import BeautifulSoup
 import concurrent.futures
 import urllib.parse
 
-from .config import match_keywords
+from .config import keyword_tagger
+from .detail_cache import get_detail_cache
+from .charset import resolve_encoding
+from .link_extract import extract_links
 
 class ChinaNewsCrawler(NewsCrawler):
     """中国新闻网-国内新闻爬虫（限制抓取数量，去掉调试写盘）"""
+
+    # 列表页中的新闻区块（头条、轮播图、各栏目列表、最新列表、视频、热点排行）；
+    # 已对照保存的列表页核对：容器外只剩导航栏和页脚链接
+    list_containers = [
+        "div.channel-topnews",
+        "div.dh",
+        "div.channel-parallel",
+        "div.channel-newslist",
+        "ul.news_list_ul",
+        "div.video-list",
+        "div.hotlist",
+    ]
+
     def crawl(self, max_items: int = 50):
         url = "https://www.chinanews.com.cn/china/"
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'
         }
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = self.fetch(url, headers=headers, timeout=10)
         print(f"[调试] {url} status: {resp.status_code}")
-        resp.encoding = resp.apparent_encoding
-        soup = BeautifulSoup(resp.text, "html.parser")
+        resp.encoding = resolve_encoding(resp)
         # 优化点：原实现会对列表页每一条都抓详情页，网络请求量巨大且串行。
         # 这里改为：先用标题做一次关键词命中筛选，再并发抓取少量详情页。
-        candidates = []
+        # 列表页只流式扫描新闻列表容器内的链接，凑够 max_items 即停止解析。
         seen_urls = set()
-        for a in soup.select("a[href]"):
-            title = a.get_text(strip=True)
-            href = a.get("href", "")
-            if not title or not href:
-                continue
+        # 整页标题共用同一份关键词表
+        tag = keyword_tagger()
+
+        def accept(title, href):
             # normalize url
             if href.startswith("//"):
                 href = "https:" + href
             href = urllib.parse.urljoin(url, href)
             if not href.startswith("http"):
-                continue
+                return None
             # 过滤非新闻详情的噪音链接
             if "chinanews.com.cn" not in href:
-                continue
+                return None
             if href in seen_urls:
-                continue
-            tags = match_keywords(title)
+                return None
+            tags = tag(title)
             if not tags:
-                continue
+                return None
             seen_urls.add(href)
-            candidates.append({"title": title, "url": href, "tags": tags})
-            if len(candidates) >= max_items:
-                break
+            return {"title": title, "url": href, "tags": tags}
+
+        candidates = extract_links(resp.text, accept, containers=self.list_containers, limit=max_items)
+        if self.page_unchanged(url, candidates):
+            # 列表区与上一轮完全相同：不再抓详情页，也不进入下游匹配/去重
+            print("[调试] ChinaNewsCrawler 列表未变化，跳过")
+            return []
+
+        cache = get_detail_cache()
 
         def _fetch_detail(item):
             detail_url = item["url"]
+            cached = cache.get(detail_url)
+            if cached is not None:
+                # 已抓取过的详情页直接走本地缓存，不发请求
+                return {
+                    "title": item["title"],
+                    "content": cached or item["title"],
+                    "url": detail_url,
+                    "tags": item.get("tags", []),
+                }
             detail_content = ""
+            fetched = False
             try:
-                detail_resp = requests.get(detail_url, headers=headers, timeout=10)
-                detail_resp.encoding = detail_resp.apparent_encoding
+                detail_resp = self.fetch(detail_url, headers=headers, timeout=10)
+                detail_resp.encoding = resolve_encoding(detail_resp)
                 detail_soup = BeautifulSoup(detail_resp.text, "html.parser")
                 content_tag = (
                     detail_soup.find("div", class_="left_zw")
@@ -60,11 +89,14 @@ class ChinaNewsCrawler(NewsCrawler):
                 )
                 if content_tag:
                     detail_content = content_tag.get_text(separator="\n", strip=True)
+                fetched = detail_resp.status_code == 200
             except Exception as e:  # noqa: BLE001
                 detail_content = f"正文抓取失败: {e}"
             # 控制正文长度，避免后续AI摘要prompt过大
             if detail_content and len(detail_content) > 2500:
                 detail_content = detail_content[:2500]
+            if fetched and detail_content:
+                cache.put(detail_url, detail_content)
             return {
                 "title": item["title"],
                 "content": detail_content or item["title"],
@@ -82,5 +114,11 @@ class ChinaNewsCrawler(NewsCrawler):
                         news_list.append(fut.result())
                     except Exception as e:  # noqa: BLE001
                         print(f"[调试] ChinaNewsCrawler 详情抓取失败: {e}")
+            cache.flush()
+            st = cache.stats()
+            print(
+                f"[调试] ChinaNewsCrawler 详情缓存 命中 {st['hits']} / 未命中 {st['misses']}"
+                f"（命中率 {st['hit_rate']:.0%}，缓存 {st['size']} 条）"
+            )
         print(f"[调试] ChinaNewsCrawler 抓取到 {len(news_list)} 条新闻")
         return news_list
@@ -13,7 +13,9 @@ Additionally, we fetch gold price (黄金价格，非零售加工价) from relia
 
 from __future__ import annotations
 
-from typing import List
+from typing import Callable, Dict, Iterable, List
+
+from .keyword_profiles import get_profiles
 
 
 TARGET_SECTORS: List[str] = [
@@ -100,39 +102,33 @@ AI_KEYWORDS: List[str] = [
 
 
 def match_keywords(text: str) -> List[str]:
-    """Return matched tags among sectors/policies/gold keywords.
+    """Return matched tags of the current keyword profiles.
 
-    This simple matcher is case-sensitive for Chinese and works well enough
-    for our purpose. You can replace with more robust NLP if needed.
+    Terms come first in profile order (sectors, policies, gold, AI by
+    default), followed by the profile tags such as "政策类" and "AI行业".
+    Profiles come from keywords.json when present, else from the lists above
+    (see ``keyword_profiles``); matching is one Aho-Corasick pass over
+    ``text``.
     """
-    tags: List[str] = []
-    policy_hit = False
-    for kw in TARGET_SECTORS:
-        if kw in text:
-            tags.append(kw)
-    for kw in POLICY_KEYWORDS:
-        if kw in text:
-            tags.append(kw)
-            policy_hit = True
-    for kw in GOLD_KEYWORDS:
-        if kw in text:
-            tags.append(kw)
-    ai_hit = False
-    for kw in AI_KEYWORDS:
-        if kw in text:
-            tags.append(kw)
-            ai_hit = True
-    if ai_hit:
-        tags.append("AI行业")
-    if policy_hit:
-        tags.append("政策类")
-    # de-duplicate while preserving order
-    seen = set()
-    deduped: List[str] = []
-    for t in tags:
-        if t not in seen:
-            seen.add(t)
-            deduped.append(t)
-    return deduped
+    return get_profiles().tags(text or "")
+
+
+def keyword_tagger() -> Callable[[str], List[str]]:
+    """``match_keywords`` bound to the current profiles, for tagging a batch item by item."""
+    return get_profiles().tags
+
+
+def match_keywords_many(texts: Iterable[str]) -> List[List[str]]:
+    """``match_keywords`` for a batch of texts (e.g. all titles of a list page)."""
+    profiles = get_profiles()
+    return [profiles.tags(t or "") for t in texts]
+
+
+def matches_sector_or_policy(text: str) -> bool:
+    """True if ``text`` mentions a target sector or a policy keyword."""
+    return bool(text) and get_profiles().matches_profile(text, ("sector", "policy"))
 
 
+def keyword_weights() -> Dict[str, float]:
+    """Tag/term weights declared in the keyword profiles."""
+    return get_profiles().weights()
@@ -0,0 +1,132 @@
+"""On-disk cache of extracted article text, keyed by canonical URL.
+
+``ChinaNewsCrawler`` re-fetched up to 50 detail pages on every poll although
+most of them had been fetched before; that was the largest request burst per
+poll. Cached URLs now skip the network entirely. Entries expire after
+``ttl_hours`` and the cache is bounded to ``max_entries`` with LRU eviction.
+"""
+
+from __future__ import annotations
+
+import collections
+import threading
+import time
+import urllib.parse
+from typing import Dict, List, Optional, Set
+
+from json_store import adopt_merged, load_json, merge_json
+
+# query parameters that never change the article
+_TRACKING_PARAMS = {"spm", "from", "share", "source", "isappinstalled", "wd", "eqid"}
+
+
+def canonical_url(url: str) -> str:
+    """Normalize scheme/host case, drop fragments and tracking parameters."""
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+    except Exception:  # noqa: BLE001
+        return url.strip()
+    query = [
+        (k, v)
+        for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ]
+    return urllib.parse.urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urllib.parse.urlencode(sorted(query)),
+        "",
+    ))
+
+
+class DetailCache:
+    """LRU + TTL cache {canonical url: (ts, text)} persisted as JSON."""
+
+    def __init__(
+        self,
+        path: str = "data/detail_cache.json",
+        ttl_hours: float = 72,
+        max_entries: int = 2000,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # keys changed since the last flush; only these are merged into the file
+        self._changed: Set[str] = set()
+        self._lock = threading.Lock()
+        # insertion order == LRU order (oldest first)
+        self._entries: "collections.OrderedDict[str, List]" = collections.OrderedDict()
+        for url, entry in load_json(path, {}).items():
+            if isinstance(entry, list) and len(entry) == 2:
+                self._entries[url] = entry
+
+    def get(self, url: str) -> Optional[str]:
+        key = canonical_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - float(entry[0]) > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                    self._changed.add(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return str(entry[1])
+
+    def put(self, url: str, text: str) -> None:
+        key = canonical_url(url)
+        with self._lock:
+            self._entries[key] = [time.time(), text]
+            self._entries.move_to_end(key)
+            self._changed.add(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._changed.add(self._entries.popitem(last=False)[0])
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "size": len(self._entries),
+            }
+
+    def flush(self) -> None:
+        """Merge the keys changed by this process into the file (see ``json_store.merge_json``).
+
+        Entries saved by another process are taken over (as most recently used).
+        """
+        with self._lock:
+            changes = {k: list(self._entries[k]) if k in self._entries else None for k in self._changed}
+            self._changed = set()
+        if not changes:
+            return
+        merged = merge_json(self.path, changes)
+        with self._lock:
+            if merged is None:
+                # 没拿到锁：改动留到下次 flush
+                self._changed.update(changes)
+                return
+            valid = {k: e for k, e in merged.items() if isinstance(e, list) and len(e) == 2}
+            adopt_merged(self._entries, valid, self._changed)
+            self._evict()
+
+
+_default: Optional[DetailCache] = None
+_default_lock = threading.Lock()
+
+
+def get_detail_cache() -> DetailCache:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = DetailCache()
+        return _default
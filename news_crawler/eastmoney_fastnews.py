@@ -0,0 +1,204 @@
+"""Incremental, cursor-based fetching of the EastMoney fast-news API.
+
+Both the 7x24 flash column (fastColumn=102) and the fund column (103) used to
+request only the newest page on every poll and let StateStore drop repeats;
+during bursts (market open) anything that fell off page one was lost.
+
+We keep a high-water mark (the largest ``realSort`` delivered) per column.
+Each poll starts at the newest page and follows ``sortEnd`` to older pages
+until it reaches the mark, so only new items are returned and bursts are
+paged through instead of truncated. Incremental polls use a small page size;
+the first poll of a column (no mark yet) takes one regular page only.
+
+A poll that hits ``max_pages`` before reaching the mark keeps the old mark
+and saves a resume point (the ``sortEnd`` where it stopped, plus ``top``, the
+newest key it delivered). The next poll first pages down to ``top``, then
+continues from the resume point towards the mark, so a burst longer than
+``max_pages`` is filled in over several rounds instead of skipped.
+
+The new cursor is only staged by ``crawl``; ``run_all_crawlers`` persists it
+through ``commit`` once the round's items are stored, so a crawler that is
+abandoned or fails after fetching refetches the same range next round.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_store import load_json, save_json
+
+from .base import NewsCrawler
+
+FAST_NEWS_URL = "https://np-weblist.eastmoney.com/comm/web/getFastNewsList"
+
+
+class FastNewsCursors:
+    """{column: {"mark", "top", "resume"}} persisted in data/eastmoney_cursor.json.
+
+    ``top`` / ``resume`` are only present while a gap above ``mark`` is still
+    being filled. Older files stored the bare mark (an int); they still load.
+    """
+
+    def __init__(self, path: str = "data/eastmoney_cursor.json") -> None:
+        self.path = path
+        self.data: Dict[str, Any] = load_json(path, {})
+        self._lock = threading.Lock()
+
+    def get(self, column: str) -> Dict[str, Any]:
+        with self._lock:
+            value = self.data.get(column)
+        if isinstance(value, dict):
+            return dict(value)
+        return {"mark": int(value)} if value is not None else {}
+
+    def set(self, column: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self.data[column] = {k: v for k, v in state.items() if v not in (None, "")}
+            snapshot = dict(self.data)
+        save_json(self.path, snapshot)
+
+
+_cursors: Optional[FastNewsCursors] = None
+_cursors_lock = threading.Lock()
+
+
+def get_cursors() -> FastNewsCursors:
+    global _cursors
+    with _cursors_lock:
+        if _cursors is None:
+            _cursors = FastNewsCursors()
+        return _cursors
+
+
+def _sort_key(item: Dict[str, Any]) -> Optional[int]:
+    raw = item.get("realSort") or item.get("sort")
+    try:
+        return int(raw) if raw not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _max_key(*keys: Optional[int]) -> Optional[int]:
+    present = [k for k in keys if k is not None]
+    return max(present) if present else None
+
+
+class EastMoneyFastNewsCrawler(NewsCrawler):
+    """Shared code path for EastMoney fast-news columns.
+
+    Subclasses set ``column`` and ``page_size`` (first-poll page size).
+    """
+
+    column: str = "102"
+    page_size: int = 20
+    incremental_page_size: int = 10
+    max_pages: int = 5
+    # crawl() 算出的新游标，commit() 时才写入
+    _next_cursor: Optional[Dict[str, Any]] = None
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36',
+        'Referer': 'https://kuaixun.eastmoney.com/'
+    }
+
+    def _fetch_page(self, sort_end: str, page_size: int) -> Tuple[List[Dict[str, Any]], str]:
+        params = {
+            "client": "web",
+            "biz": "web_724",
+            "fastColumn": self.column,
+            "pageSize": page_size,
+            "sortEnd": sort_end,
+            # 增加 req_trace，减少CDN缓存导致的“滞后”
+            "req_trace": int(time.time() * 1000),
+        }
+        url = f"{FAST_NEWS_URL}?{urllib.parse.urlencode(params)}"
+        resp = self.fetch(url, headers=self.headers, timeout=10)
+        data = resp.json().get("data") or {}
+        # API 结构变更: list -> fastNewsList，兼容旧字段名
+        items = data.get("fastNewsList") or data.get("list") or []
+        next_end = str(data.get("sortEnd") or "")
+        if not next_end and items:
+            last = _sort_key(items[-1])
+            next_end = str(last) if last is not None else ""
+        return items, next_end
+
+    def _to_news(self, item: Dict[str, Any]) -> Dict[str, str]:
+        url = item.get("url", "")
+        if not url and item.get("code"):
+            url = f"https://finance.eastmoney.com/a/{item['code']}.html"
+        return {
+            "title": item.get("title", ""),
+            "content": item.get("summary", ""),
+            "url": url,
+        }
+
+    def _page_down(
+        self, sort_end: str, stop: Optional[int], page_size: int, budget: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], str, bool, int]:
+        """Follow ``sortEnd`` from ``sort_end`` until a key <= ``stop``.
+
+        Returns (items above ``stop``, their largest key, sortEnd to continue
+        from, whether ``stop`` or the end of the list was reached, pages used).
+        Without ``stop`` (first poll) only one page is fetched.
+        """
+        out: List[Dict[str, Any]] = []
+        newest: Optional[int] = None
+        pages = 0
+        while pages < budget:
+            items, next_end = self._fetch_page(sort_end, page_size)
+            pages += 1
+            for it in items:
+                key = _sort_key(it)
+                if key is not None:
+                    if stop is not None and key <= stop:
+                        return out, newest, next_end, True, pages
+                    newest = key if newest is None else max(newest, key)
+                out.append(it)
+            if stop is None or not items or not next_end:
+                return out, newest, next_end, True, pages
+            sort_end = next_end
+        return out, newest, sort_end, False, pages
+
+    def crawl(self):
+        name = self.__class__.__name__
+        state = get_cursors().get(self.column)
+        mark: Optional[int] = state.get("mark")
+        top: Optional[int] = state.get("top")
+        resume = str(state.get("resume") or "") if top is not None else ""
+        page_size = self.page_size if mark is None else self.incremental_page_size
+        raw_items: List[Dict[str, Any]] = []
+        self._next_cursor = None
+        try:
+            # 先取最新一段，直到已交付的位置（有缺口时为 top，否则为 mark）
+            items, newest, end, reached, used = self._page_down("", top if resume else mark, page_size, self.max_pages)
+            raw_items.extend(items)
+            if not reached:
+                # 未追上：保留旧 mark，从停下的位置续翻（其下已交付的部分会被 StateStore 过滤）
+                print(f"[调试] {name} 翻页达到上限 {self.max_pages} 页，下轮从断点继续补齐")
+                cursor = {"mark": mark, "top": newest, "resume": end}
+            elif resume:
+                top = newest if newest is not None else top
+                items, older, end, reached, _ = self._page_down(resume, mark, page_size, self.max_pages - used)
+                raw_items.extend(items)
+                if reached:
+                    cursor = {"mark": _max_key(mark, top, older)}
+                else:
+                    print(f"[调试] {name} 缺口尚未补齐，下轮继续")
+                    cursor = {"mark": mark, "top": top, "resume": end}
+            else:
+                cursor = {"mark": _max_key(mark, newest)}
+            if cursor.get("mark") is not None:
+                self._next_cursor = cursor
+        except Exception as e:  # noqa: BLE001
+            # 翻页中途失败时不推进游标，下轮重新补齐缺口（重复项由 StateStore 过滤）
+            print(f"[调试] {name} 解析失败: {e}")
+        news_list = [self._to_news(it) for it in raw_items]
+        print(f"[调试] {name} 抓取到 {len(news_list)} 条新快讯（栏目 {self.column}）")
+        return news_list
+
+    def commit(self) -> None:
+        if self._next_cursor is not None:
+            get_cursors().set(self.column, self._next_cursor)
+            self._next_cursor = None
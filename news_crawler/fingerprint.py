@@ -0,0 +1,80 @@
+"""Fingerprints of extracted list-page regions.
+
+Many portal pages send no usable cache validators, yet their link lists are
+identical between polls (only timestamps or ads change). After extraction a
+crawler hashes the anchor list it kept (title + url, in order); when the
+digest matches the previous poll, it returns no items for that source, so
+detail fetches, keyword tagging, ``_stable_item_key`` and StateStore lookups
+in ``run_all_crawlers`` are all skipped.
+
+Hashing the extracted list (rather than the raw page) ignores everything
+outside the scoped containers and beyond the extraction limit.
+
+New digests are kept pending and only committed by ``flush`` at the end of a
+crawl round, so a round whose results are dropped does not mark its pages as
+already handled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from json_store import load_json, save_json
+
+
+def links_digest(items: List[Dict[str, Any]]) -> str:
+    h = hashlib.sha1()
+    for it in items:
+        h.update(f"{it.get('title', '')}\t{it.get('url', '')}\n".encode("utf-8", errors="ignore"))
+    return h.hexdigest()
+
+
+class PageFingerprints:
+    """{source url: {"digest", "ts"}} persisted as JSON."""
+
+    def __init__(self, path: str = "data/page_fingerprints.json", retention_days: int = 7) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        self.data: Dict[str, Dict[str, object]] = load_json(path, {})
+        self._pending: Dict[str, Tuple[Any, str]] = {}  # source -> (owner crawler, digest)
+        self._lock = threading.Lock()
+
+    def check(self, source: str, digest: str, owner: Any = None) -> bool:
+        """Return True when ``digest`` equals the committed one for ``source``."""
+        with self._lock:
+            entry = self.data.get(source) or {}
+            if entry.get("digest") == digest:
+                entry["ts"] = time.time()
+                return True
+            self._pending[source] = (owner, digest)
+            return False
+
+    def flush(self, owners: Optional[Iterable[Any]] = None) -> None:
+        """Commit pending digests (only those of ``owners`` if given) and save."""
+        keep = set(owners) if owners is not None else None
+        with self._lock:
+            now = time.time()
+            for source, (owner, digest) in self._pending.items():
+                if keep is None or owner in keep:
+                    self.data[source] = {"digest": digest, "ts": now}
+            self._pending = {}
+            ttl = self.retention_days * 86400
+            for source in [s for s, e in self.data.items() if now - float(e.get("ts", 0) or 0) > ttl]:
+                self.data.pop(source, None)
+            snapshot = dict(self.data)
+        save_json(self.path, snapshot)
+
+
+_default: Optional[PageFingerprints] = None
+_default_lock = threading.Lock()
+
+
+def get_fingerprints() -> PageFingerprints:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = PageFingerprints()
+        return _default
@@ -0,0 +1,208 @@
+"""Hedged gold quotes: Eastmoney first, Sina only when it is slow or fails.
+
+``run_all_crawlers`` used to run both gold crawlers every round and then
+throw the second snapshot away in the gold merge. ``HedgedGoldCrawler``
+asks the primary source first and starts the fallback only when the primary
+has not answered within ``hedge_delay`` seconds or fails; whichever valid
+answer arrives first wins and the other is ignored. In the normal case that
+halves the gold requests, and a stalled provider costs at most the hedge
+delay instead of a full timeout.
+
+Per-source latency (EWMA), failures and wins are kept in
+``data/quote_stats.json`` and printed after each round.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from app_config import get_crawl_config
+from json_store import load_json, save_json
+
+from .base import NewsCrawler
+from .gold_price import GoldPriceCrawler
+from .gold_price_sina import SinaGoldPriceCrawler
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
+
+
+class QuoteSourceStats:
+    """{source: {"requests", "failures", "wins", "hedges", "latency_ms"}} persisted as JSON."""
+
+    def __init__(self, path: str = "data/quote_stats.json", alpha: float = 0.2) -> None:
+        self.path = path
+        self.alpha = alpha
+        self.data: Dict[str, Dict[str, float]] = load_json(path, {})
+        self._lock = threading.Lock()
+
+    def _entry(self, source: str) -> Dict[str, float]:
+        return self.data.setdefault(
+            source, {"requests": 0, "failures": 0, "wins": 0, "hedges": 0, "latency_ms": 0.0}
+        )
+
+    def record(self, source: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            st = self._entry(source)
+            st["requests"] += 1
+            if not ok:
+                st["failures"] += 1
+                return
+            ms = latency * 1000
+            prev = float(st.get("latency_ms") or 0)
+            st["latency_ms"] = round(ms if prev <= 0 else (1 - self.alpha) * prev + self.alpha * ms, 1)
+
+    def win(self, source: str, hedged: bool) -> None:
+        with self._lock:
+            st = self._entry(source)
+            st["wins"] += 1
+            if hedged:
+                st["hedges"] += 1
+
+    def report(self) -> None:
+        with self._lock:
+            snapshot = {k: dict(v) for k, v in self.data.items()}
+        total = sum(int(v.get("wins", 0)) for v in snapshot.values()) or 1
+        for source, st in snapshot.items():
+            print(
+                f"[行情] {source}: 胜出 {int(st['wins'])}/{total} ({st['wins'] / total:.0%})"
+                f" / 失败 {int(st['failures'])}/{int(st['requests'])} / 延迟≈{st['latency_ms']:.0f}ms"
+            )
+
+    def flush(self) -> None:
+        with self._lock:
+            snapshot = {k: dict(v) for k, v in self.data.items()}
+        save_json(self.path, snapshot)
+
+
+_stats: Optional[QuoteSourceStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_quote_stats() -> QuoteSourceStats:
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = QuoteSourceStats()
+        return _stats
+
+
+class HedgedGoldCrawler(NewsCrawler):
+    """Primary/fallback gold quotes with a hedge delay.
+
+    ``hedge_delay`` defaults to ``crawl.gold_hedge_delay`` in config.json.
+    """
+
+    def __init__(self, hedge_delay: Optional[float] = None) -> None:
+        if hedge_delay is None:
+            hedge_delay = get_crawl_config()["gold_hedge_delay"]
+        self.hedge_delay = max(0.0, float(hedge_delay))
+        self.primary = GoldPriceCrawler()
+        self.fallback = SinaGoldPriceCrawler()
+
+    def _sources(self) -> List[Tuple[str, NewsCrawler]]:
+        # 子爬虫复用注入的连接池客户端，请求成败记在本爬虫名下（调度器据此退避）
+        for src in (self.primary, self.fallback):
+            src.http = self.http
+            src.owner = self
+        return [("eastmoney", self.primary), ("sina", self.fallback)]
+
+    def _attempt(self, name: str, src: NewsCrawler) -> Callable[[], List[dict]]:
+        """Timed ``_fetch_quotes`` of one source; an empty answer counts as failure."""
+        stats = get_quote_stats()
+
+        def run() -> List[dict]:
+            t0 = time.perf_counter()
+            try:
+                items = src._fetch_quotes()  # type: ignore[attr-defined]
+                if not items:
+                    raise ValueError("无有效报价")
+            except Exception:
+                stats.record(name, time.perf_counter() - t0, ok=False)
+                raise
+            stats.record(name, time.perf_counter() - t0, ok=True)
+            return items
+
+        return run
+
+    def _finish(self, winner: Optional[str], items: List[dict], hedged: bool, errors: List[str]) -> List[dict]:
+        stats = get_quote_stats()
+        if winner is None:
+            print(f"[行情] 黄金主备源均失败: {'; '.join(errors)}")
+            items = [{
+                "title": "黄金价格抓取失败",
+                "content": f"失败: {'; '.join(errors)}",
+                "url": "",
+            }]
+        else:
+            stats.win(winner, hedged)
+            print(f"[行情] 黄金报价采用 {winner}{'（已对冲）' if hedged else ''}")
+        stats.report()
+        stats.flush()
+        return items
+
+    def crawl(self):
+        (p_name, p_src), (f_name, f_src) = self._sources()
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="gold")
+        futures: Dict[concurrent.futures.Future, str] = {}
+        errors: List[str] = []
+        hedged = False
+        try:
+            futures[pool.submit(self._attempt(p_name, p_src))] = p_name
+            pending = set(futures)
+            done, pending = concurrent.futures.wait(pending, timeout=self.hedge_delay)
+            while True:
+                for fut in done:
+                    try:
+                        items = fut.result()
+                    except Exception as exc:  # noqa: BLE001
+                        errors.append(f"{futures[fut]}: {exc}")
+                        continue
+                    return self._finish(futures[fut], items, hedged, errors)
+                if not hedged:
+                    # 主源超过对冲延迟未返回或已失败：启动备源
+                    hedged = True
+                    fut = pool.submit(self._attempt(f_name, f_src))
+                    futures[fut] = f_name
+                    pending.add(fut)
+                if not pending:
+                    return self._finish(None, [], hedged, errors)
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+        finally:
+            # 落败的请求不再等待
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def acrawl(self, engine: "CrawlEngine") -> List[dict]:
+        (p_name, p_src), (f_name, f_src) = self._sources()
+        tasks: Dict["asyncio.Future[Any]", str] = {}
+        errors: List[str] = []
+        hedged = False
+        tasks[asyncio.ensure_future(engine.call(p_src.url, self._attempt(p_name, p_src)))] = p_name  # type: ignore[attr-defined]
+        pending = set(tasks)
+        done, pending = await asyncio.wait(pending, timeout=self.hedge_delay)
+        try:
+            while True:
+                for task in done:
+                    try:
+                        items = task.result()
+                    except Exception as exc:  # noqa: BLE001
+                        errors.append(f"{tasks[task]}: {exc}")
+                        continue
+                    return self._finish(tasks[task], items, hedged, errors)
+                if not hedged:
+                    hedged = True
+                    task = asyncio.ensure_future(engine.call(f_src.url, self._attempt(f_name, f_src)))  # type: ignore[attr-defined]
+                    tasks[task] = f_name
+                    pending.add(task)
+                if not pending:
+                    return self._finish(None, [], hedged, errors)
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import requests
 from .base import NewsCrawler
 
 
@@ -24,38 +23,46 @@ class GoldPriceCrawler(NewsCrawler):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
         }
 
-    def crawl(self):
+    def _fetch_quotes(self) -> list[dict]:
+        """Parsed quotes (may be empty); raises when the request fails."""
         items: list[dict] = []
+        resp = self.fetch(self.url, headers=self.headers, timeout=10)
+        data = resp.json()
+        payload = data.get("data") or {}
+        lst = payload.get("diff", [])
+        if isinstance(lst, dict): # 有时候 diff 是 dict (id做key)
+             lst = list(lst.values())
+
+        for it in lst:
+            if not isinstance(it, dict):
+                continue
+            name = it.get("f14", "黄金")
+            price = it.get("f2")  # 最新价
+            change_pct = it.get("f3")  # 涨跌幅%
+            # 过滤无效数据
+            if price == "-" or not price:
+                continue
+
+            code = it.get("f12")
+            high = it.get("f15")
+            low = it.get("f16")
+            open_price = it.get("f17")
+            prev_close = it.get("f18")
+            title = f"黄金 | {name} 现价:{price} 涨幅:{change_pct}%"
+            content = f"开盘:{open_price} 高:{high} 低:{low} 昨收:{prev_close}"
+            url = "https://quote.eastmoney.com/"  # 引导至行情页
+            item = {"title": title, "content": content, "url": url}
+            try:
+                # 结构化行情：供 run_all_crawlers 记录时间序列并按涨跌阈值推送
+                item["quote"] = {"key": f"gold:eastmoney:{it.get('f13')}.{code}", "price": float(price)}
+            except (TypeError, ValueError):
+                pass
+            items.append(item)
+        return items
+
+    def crawl(self):
         try:
-            resp = requests.get(self.url, headers=self.headers, timeout=10)
-            data = resp.json()
-            payload = data.get("data") or {}
-            lst = payload.get("diff", [])
-            if isinstance(lst, dict): # 有时候 diff 是 dict (id做key)
-                 lst = list(lst.values())
-            
-            for it in lst:
-                if not isinstance(it, dict):
-                    continue
-                name = it.get("f14", "黄金")
-                price = it.get("f2")  # 最新价
-                change_pct = it.get("f3")  # 涨跌幅%
-                # 过滤无效数据
-                if price == "-" or not price:
-                    continue
-
-                code = it.get("f12")
-                high = it.get("f15")
-                low = it.get("f16")
-                open_price = it.get("f17")
-                prev_close = it.get("f18")
-                title = f"黄金 | {name} 现价:{price} 涨幅:{change_pct}%"
-                content = f"开盘:{open_price} 高:{high} 低:{low} 昨收:{prev_close}"
-                url = "https://quote.eastmoney.com/"  # 引导至行情页
-                items.append({"title": title, "content": content, "url": url})
+            return self._fetch_quotes()
         except Exception as e:
             print(f"[GoldPriceCrawler] Error: {e}")
             return []
-        return items
-
-
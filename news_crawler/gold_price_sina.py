@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import requests
 from .base import NewsCrawler
 
 
@@ -41,25 +40,34 @@ class SinaGoldPriceCrawler(NewsCrawler):
             title = f"黄金 | {name} 现价:{last} 开盘:{open_price} 高:{high} 低:{low}"
             content = f"昨收:{prev_close} 时间:{date} {time}"
             url = "https://finance.sina.com.cn/money/forex/hq/XAUUSD.shtml"
-            return {"title": title, "content": content, "url": url}
+            item = {"title": title, "content": content, "url": url}
+            symbol = line[:name_start].rsplit("hq_str_", 1)[-1].strip()
+            try:
+                # 结构化行情：供 run_all_crawlers 记录时间序列并按涨跌阈值推送
+                item["quote"] = {"key": f"gold:sina:{symbol}", "price": float(last)}
+            except ValueError:
+                pass
+            return item
         except Exception:
             return None
 
-    def crawl(self):
+    def _fetch_quotes(self) -> list[dict]:
+        """Parsed quotes (may be empty); raises when the request fails."""
         items: list[dict] = []
+        resp = self.fetch(self.url, headers=self.headers, timeout=10)
+        resp.encoding = "gbk"
+        for line in resp.text.splitlines():
+            parsed = self._parse_line(line)
+            if parsed:
+                items.append(parsed)
+        return items
+
+    def crawl(self):
         try:
-            resp = requests.get(self.url, headers=self.headers, timeout=10)
-            resp.encoding = "gbk"
-            for line in resp.text.splitlines():
-                parsed = self._parse_line(line)
-                if parsed:
-                    items.append(parsed)
+            return self._fetch_quotes()
         except Exception as exc:  # noqa: BLE001
-            items.append({
+            return [{
                 "title": "黄金价格抓取失败(新浪)",
                 "content": f"失败: {exc}",
                 "url": "",
-            })
-        return items
-
-
+            }]
@@ -0,0 +1,103 @@
+"""Per-source health tracking with circuit breakers.
+
+A hanging ministry site or CCTV page used to cost the full request timeout
+on every poll. ``SourceHealth`` counts consecutive failures per host (network
+errors and 5xx replies); after ``threshold`` failures the circuit opens and
+requests to that host fail fast for a cooldown that doubles with each further
+failure, up to ``max_cooldown``. When the cooldown expires one probe request
+is let through: success closes the circuit, failure re-opens it for longer.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, Set
+
+import requests
+
+from json_store import adopt_merged, load_json, merge_json
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class SourceHealth:
+    """{host: {"failures", "open_until"}} persisted as JSON."""
+
+    def __init__(
+        self,
+        path: str = "data/source_health.json",
+        threshold: int = 3,
+        base_cooldown: float = 60,
+        max_cooldown: float = 3600,
+    ) -> None:
+        self.path = path
+        self.threshold = max(1, int(threshold))
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.data: Dict[str, Dict[str, float]] = load_json(path, {})
+        # hosts changed since the last flush; only these are merged into the file
+        self._changed: Set[str] = set()
+        self._probing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            st = self.data.get(host)
+            if not st or float(st.get("open_until", 0)) <= 0:
+                return True
+            if now < float(st["open_until"]):
+                return False
+            # half-open: let a single probe through until it reports back
+            if now - self._probing.get(host, 0) < self.base_cooldown:
+                return False
+            self._probing[host] = now
+            return True
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._probing.pop(host, None)
+            if host in self.data:
+                del self.data[host]
+                self._changed.add(host)
+
+    def record_failure(self, host: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._probing.pop(host, None)
+            st = self.data.setdefault(host, {"failures": 0, "open_until": 0})
+            self._changed.add(host)
+            st["failures"] = int(st.get("failures", 0)) + 1
+            over = st["failures"] - self.threshold
+            if over >= 0:
+                cooldown = min(self.max_cooldown, self.base_cooldown * (2 ** over))
+                st["open_until"] = now + cooldown
+                print(f"[熔断] {host} 连续失败 {st['failures']} 次，暂停 {cooldown:.0f}s")
+
+    def open_hosts(self, now: Optional[float] = None) -> Dict[str, float]:
+        """{host: seconds until the circuit half-opens} for currently open circuits."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return {
+                h: float(st["open_until"]) - now
+                for h, st in self.data.items()
+                if float(st.get("open_until", 0)) > now
+            }
+
+    def flush(self) -> None:
+        """Merge the hosts changed by this process into the file (see ``json_store.merge_json``)."""
+        with self._lock:
+            changes = {h: dict(self.data[h]) if h in self.data else None for h in self._changed}
+            self._changed = set()
+        if not changes:
+            return
+        merged = merge_json(self.path, changes)
+        with self._lock:
+            if merged is None:
+                # 没拿到锁：改动留到下次 flush
+                self._changed.update(changes)
+                return
+            adopt_merged(self.data, merged, self._changed)
@@ -0,0 +1,102 @@
+"""Persistent ETag / Last-Modified validator cache for conditional GETs.
+
+List pages and RSS/Atom feeds change a few times a day but were downloaded
+and re-parsed on every poll. For URLs fetched with ``conditional=True`` the
+shared ``HttpClient`` sends If-None-Match / If-Modified-Since from this cache;
+a 304 reply lets the crawler skip parsing that source entirely.
+
+New validators from a 200 reply are staged per owner (the crawler that made
+the request) and committed by ``flush(owners=...)`` only for crawlers that
+finished the round. A crawler abandoned at the deadline keeps running in its
+thread; had its validators been stored, the next poll would get a 304 and
+its items would never be delivered.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from json_store import adopt_merged, load_json, merge_json
+
+
+class ValidatorCache:
+    """{url: {"etag", "last_modified", "ts"}} persisted as JSON.
+
+    Entries not refreshed within ``retention_days`` are dropped on flush so
+    retired sources do not accumulate.
+    """
+
+    def __init__(self, path: str = "data/http_cache.json", retention_days: int = 7) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        self.data: Dict[str, Dict[str, object]] = load_json(path, {})
+        # owner -> {url: new entry, or None to drop the url's validators}
+        self._staged: Dict[Any, Dict[str, Optional[Dict[str, object]]]] = {}
+        # urls changed since the last flush; only these are merged into the file
+        self._changed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self.data.get(url) or {}
+        headers: Dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = str(entry["etag"])
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = str(entry["last_modified"])
+        return headers
+
+    def update(self, url: str, etag: str | None, last_modified: str | None, owner: Any = None) -> None:
+        """Record validators of a 200 reply; staged until ``flush`` when ``owner`` is given."""
+        entry: Optional[Dict[str, object]] = None
+        if etag or last_modified:
+            entry = {"etag": etag or "", "last_modified": last_modified or "", "ts": time.time()}
+        # entry None: server stopped sending validators, don't keep stale ones around
+        with self._lock:
+            if owner is not None:
+                self._staged.setdefault(owner, {})[url] = entry
+                return
+            self._apply(url, entry)
+
+    def _apply(self, url: str, entry: Optional[Dict[str, object]]) -> None:
+        if entry is not None:
+            self.data[url] = entry
+            self._changed.add(url)
+        elif self.data.pop(url, None) is not None:
+            self._changed.add(url)
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            entry = self.data.get(url)
+            if entry is not None:
+                entry["ts"] = time.time()
+                self._changed.add(url)
+
+    def flush(self, owners: Optional[Iterable[Any]] = None) -> None:
+        """Commit staged validators (only those of ``owners`` if given) and save."""
+        keep = set(owners) if owners is not None else None
+        with self._lock:
+            for owner, entries in self._staged.items():
+                if keep is None or owner in keep:
+                    for url, entry in entries.items():
+                        self._apply(url, entry)
+            self._staged = {}
+            now = time.time()
+            ttl = self.retention_days * 86400
+            stale = [u for u, e in self.data.items() if now - float(e.get("ts", 0) or 0) > ttl]
+            for u in stale:
+                self.data.pop(u, None)
+            self._changed.update(stale)
+            changes = {u: dict(self.data[u]) if u in self.data else None for u in self._changed}
+            self._changed = set()
+        if not changes:
+            return
+        # 只合并本进程改动的 url，其他进程同时保存的条目不被覆盖
+        merged = merge_json(self.path, changes)
+        with self._lock:
+            if merged is None:
+                self._changed.update(changes)
+                return
+            adopt_merged(self.data, merged, self._changed)
@@ -0,0 +1,198 @@
+"""Shared pooled HTTP client for all crawlers.
+
+Every crawler used to call bare ``requests.get``, paying a fresh TCP+TLS
+handshake for each list page, detail page and quote request on every poll.
+``HttpClient`` wraps one ``requests.Session`` whose per-host keep-alive pools
+are sized to the crawl fan-out (ChinaNews detail pages, ministry sites), so
+connections survive across pages and across ``fast_job`` ticks in the daemon.
+
+We also keep per-host counters (requests vs. newly opened connections) so the
+connection-reuse rate can be checked in the logs.
+
+Requests made with ``conditional=True`` go through the persistent
+``ValidatorCache``; callers treat ``resp.status_code == 304`` as "no new items".
+
+Every request passes the per-host circuit breaker (``SourceHealth``): hosts
+that keep failing are skipped with ``CircuitOpenError`` instead of costing a
+full timeout on each poll.
+
+Requests made on behalf of a crawler (``owner``, passed by
+``NewsCrawler.fetch``) are counted as succeeded or failed per crawler, so a
+round can tell a quiet source from one it could not reach.
+"""
+
+from __future__ import annotations
+
+import threading
+import urllib.parse
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from app_config import get_crawl_config, get_http_config
+
+from .health import CircuitOpenError, SourceHealth
+from .http_cache import ValidatorCache
+
+
+class HttpClient:
+    """Thread-safe pooled HTTP client shared by crawlers.
+
+    - ``pool_connections``: how many distinct host pools are kept alive
+    - ``pool_maxsize``: keep-alive connections per host; must cover the largest
+      per-host fan-out (ChinaNews fetches detail pages with 10 workers)
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 32,
+        pool_maxsize: int = 16,
+        timeout: float = 10,
+        validators: Optional[ValidatorCache] = None,
+        health: Optional[SourceHealth] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.validators = validators if validators is not None else ValidatorCache()
+        self.health = health if health is not None else SourceHealth()
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+        )
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        # urllib3 advertises "br" only when a brotli decoder is installed, so the
+        # server never sends an encoding we cannot decode.
+        self.session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+        self._stats: Dict[str, Dict[str, int]] = {}
+        # owner (crawler instance) -> [succeeded, failed]; dropped with the crawler
+        self._outcomes: "weakref.WeakKeyDictionary[Any, List[int]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, conditional: bool = False, owner: Any = None, **kwargs: Any) -> requests.Response:
+        """GET ``url``; with ``conditional=True`` send cached validators.
+
+        A 304 response is returned as-is (empty body); the caller should skip
+        parsing that source. ``owner`` is the crawler the request is made for.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urllib.parse.urlparse(url).netloc
+        if not self.health.allow(host):
+            self._outcome(owner, False)
+            raise CircuitOpenError(f"{host} 熔断中，跳过请求")
+        if conditional:
+            headers = dict(kwargs.get("headers") or {})
+            headers.update(self.validators.request_headers(url))
+            kwargs["headers"] = headers
+        try:
+            resp = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.health.record_failure(host)
+            self._outcome(owner, False)
+            raise
+        if resp.status_code >= 500:
+            self.health.record_failure(host)
+        else:
+            self.health.record_success(host)
+        self._outcome(owner, resp.status_code < 500)
+        self._record(url, resp)
+        if conditional:
+            if resp.status_code == 304:
+                self.validators.touch(url)
+            elif resp.status_code == 200:
+                self.validators.update(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), owner=owner)
+        return resp
+
+    def _outcome(self, owner: Any, ok: bool) -> None:
+        if owner is None:
+            return
+        with self._lock:
+            try:
+                counts = self._outcomes.setdefault(owner, [0, 0])
+            except TypeError:  # owner not weak-referenceable
+                return
+            counts[0 if ok else 1] += 1
+
+    def outcome(self, owner: Any) -> Tuple[int, int]:
+        """(succeeded, failed or breaker-skipped) requests made for ``owner``."""
+        with self._lock:
+            try:
+                counts = self._outcomes.get(owner) or [0, 0]
+            except TypeError:
+                return 0, 0
+            return counts[0], counts[1]
+
+    def flush(self, owners: Optional[Iterable[Any]] = None) -> None:
+        """Persist validator cache and source health (call once per crawl round).
+
+        Only validators fetched by ``owners`` (the crawlers that finished the
+        round) are committed when given.
+        """
+        self.validators.flush(owners)
+        self.health.flush()
+
+    def _record(self, url: str, resp: requests.Response) -> None:
+        # attribute to the host that actually answered (after redirects)
+        host = urllib.parse.urlparse(resp.url or url).netloc
+        opened: Optional[int] = None
+        try:
+            # urllib3 counts every new connection made by the host pool that
+            # served this response
+            pool = getattr(resp.raw, "_pool", None)
+            if pool is not None:
+                opened = int(pool.num_connections)
+        except Exception:  # noqa: BLE001 - stats are best-effort
+            pass
+        with self._lock:
+            stats = self._stats.setdefault(host, {"requests": 0, "connections": 0})
+            stats["requests"] += 1
+            if opened is not None:
+                stats["connections"] = opened
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-host {requests, connections, reused} snapshot."""
+        with self._lock:
+            snapshot = {h: dict(s) for h, s in self._stats.items()}
+        for s in snapshot.values():
+            s["reused"] = max(0, s["requests"] - s["connections"])
+        return snapshot
+
+    def report(self) -> None:
+        snapshot = self.stats()
+        if not snapshot:
+            return
+        total = sum(s["requests"] for s in snapshot.values())
+        reused = sum(s["reused"] for s in snapshot.values())
+        print(f"[HTTP] 累计请求 {total} 次，复用连接 {reused} 次，涉及 {len(snapshot)} 个站点")
+        for host, s in sorted(snapshot.items(), key=lambda kv: -kv[1]["requests"]):
+            print(f"[HTTP]   {host}: 请求 {s['requests']} / 新建连接 {s['connections']} / 复用 {s['reused']}")
+        for host, remaining in sorted(self.health.open_hosts().items()):
+            print(f"[熔断] {host} 熔断中，剩余 {remaining:.0f}s")
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide client, created lazily from config.json ("http" section)."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            cfg = get_http_config()
+            crawl_cfg = get_crawl_config()
+            _default_client = HttpClient(
+                pool_connections=cfg["pool_connections"],
+                pool_maxsize=cfg["pool_maxsize"],
+                timeout=cfg["timeout"],
+                health=SourceHealth(
+                    threshold=crawl_cfg["breaker_threshold"],
+                    base_cooldown=crawl_cfg["breaker_base_cooldown"],
+                    max_cooldown=crawl_cfg["breaker_max_cooldown"],
+                ),
+            )
+        return _default_client
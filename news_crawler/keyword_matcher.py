@@ -0,0 +1,131 @@
+"""Aho-Corasick multi-keyword matcher.
+
+``match_keywords`` used to run one ``kw in text`` scan per keyword (about 80
+per text), so tagging cost grew linearly with the vocabulary. A
+``KeywordMatcher`` compiles all keywords into one automaton (trie + failure
+links, each state's outputs merged with those of its failure state) and finds
+every keyword, overlapping ones included, in a single pass over the text.
+
+The pass is a Python loop over characters with one dict lookup each (more
+only while following failure links). While few distinct characters can start
+a keyword (up to ``SKIP_MAX_STARTS``, true for the built-in vocabulary), the
+automaton jumps from the root to the next such character with a compiled
+character-class search instead, so most of the text is skipped at C speed.
+Either way the cost depends on the text length and the number of near-hits,
+not on the number of keywords.
+"""
+
+from __future__ import annotations
+
+import collections
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+# 起始字符较少时，用正则字符类在 C 层跳过无关字符；否则逐字符查表更快
+SKIP_MAX_STARTS = 128
+
+
+class KeywordMatcher:
+    """Finds which of a fixed list of keywords occur in a text.
+
+    Keyword ids are their positions in the (de-duplicated) input list, so
+    ``sorted(find_ids(text))`` yields matches in declaration order.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: List[str] = list(dict.fromkeys(kw for kw in keywords if kw))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for kid, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state] += (kid,)
+        self._link()
+        starts = "".join(sorted(self._goto[0]))
+        # 根状态下只需关心能开启某个关键词的字符
+        self._start = re.compile(f"[{re.escape(starts)}]") if 0 < len(starts) <= SKIP_MAX_STARTS else None
+
+    def _link(self) -> None:
+        """Breadth-first failure links; outputs inherit their failure state's."""
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] += self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Ids of all keywords occurring in ``text`` (one pass)."""
+        if not text or not self.keywords:
+            return set()
+        if self._start is None:
+            return self._scan(text)
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        search = self._start.search
+        n = len(text)
+        state = 0
+        i = 0
+        while i < n:
+            if state == 0:
+                m = search(text, i)
+                if m is None:
+                    break
+                i = m.start()
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+            i += 1
+        return found
+
+    def _scan(self, text: str) -> Set[int]:
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        state = 0
+        for ch in text:
+            if state:
+                nxt = goto[state].get(ch)
+                while nxt is None and state:
+                    state = fail[state]
+                    nxt = goto[state].get(ch)
+                state = nxt or 0
+            else:
+                state = root.get(ch, 0)
+                if not state:
+                    continue
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def find(self, text: str) -> List[str]:
+        """Matched keywords in declaration order."""
+        return [self.keywords[k] for k in sorted(self.find_ids(text))]
+
+    def find_many(self, texts: Iterable[str]) -> List[List[str]]:
+        """``find`` for each text of a batch (e.g. all titles of a list page)."""
+        return [self.find(t) for t in texts]
+
+    def contains_any(self, text: str) -> bool:
+        return bool(self.find_ids(text))
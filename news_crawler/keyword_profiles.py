@@ -0,0 +1,316 @@
+"""Weighted keyword profiles, compiled once and hot-reloaded from a JSON file.
+
+Tagging vocabulary used to be Python constants, so every change needed a code
+change and a daemon restart, and short ASCII tokens ("AI", "o3", "Yi", "R1")
+matched inside unrelated words ("SAID", "Yield", "R10"). Profiles are now read
+from ``keywords.json`` (see ``keywords.example.json``; path and reload interval
+in the ``keywords`` section of config.json) and fall back to the built-in
+lists in ``config.py`` when the file is missing or invalid::
+
+    {"profiles": [
+        {"name": "ai", "tag": "AI行业", "weight": 1.0,
+         "ignore_case": false, "word_boundary": "auto",
+         "terms": ["大模型", "AI", {"term": "gpt", "ignore_case": true, "weight": 0.5}],
+         "negative": ["AI换脸"]}
+    ]}
+
+- ``terms`` are emitted as tags in profile order; ``tag`` (optional) is added
+  once any term of the profile matched
+- ``weight`` is the weight of ``tag``; ``term_weight`` / per-term ``weight``
+  the weight of the terms (used by ``priority.PriorityScorer``)
+- ``ignore_case`` matches regardless of case; ``word_boundary`` requires no
+  ASCII letter/digit/underscore right before and after the match; ``"auto"``
+  (the default) turns it on only for short ASCII tokens of up to
+  ``AUTO_BOUNDARY_MAX`` characters ("AI", "o3", "R1"), so longer names
+  still match inside compounds ("ChatGPT", "Qwen2.5", "Llama3")
+- a matching ``negative`` term suppresses all terms of its profile
+- the profiles named in ``REQUIRED_PROFILES`` must exist (MultiPolicy
+  filters on them); a file without them is rejected like a malformed one
+
+All terms go into one ``KeywordMatcher`` over lowercased text; case and
+boundary rules are only verified (at the term's occurrences, via
+``str.find``) when a term that has them was found.
+
+``get_profiles`` re-checks the file's mtime at most every
+``reload_seconds`` and swaps in a newly compiled set in one assignment, so a
+running poller picks up edits without a restart. Batch callers resolve the
+profiles once (``match_keywords_many``, ``config.keyword_tagger``).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app_config import get_keywords_config
+
+from .keyword_matcher import KeywordMatcher
+
+_ASCII_LOWER = {c: c + 32 for c in range(ord("A"), ord("Z") + 1)}
+
+# "auto" 词边界只用于这么短的 ASCII 词（"AI"、"o3"、"Yi"、"R1" 容易误中 "SAID"、"Yield"、"R10"）
+AUTO_BOUNDARY_MAX = 2
+
+# 代码中按名称引用的 profile（config.matches_sector_or_policy），改名或删除会让政策源静默无结果
+REQUIRED_PROFILES = ("sector", "policy")
+
+
+def _fold(text: str) -> str:
+    """Lowercase ``text`` without changing its length (positions stay valid)."""
+    low = text.lower()
+    # 极少数字符（如 "İ"）小写后长度会变，此时只转换 ASCII 字母
+    return low if len(low) == len(text) else text.translate(_ASCII_LOWER)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+@dataclasses.dataclass(frozen=True)
+class Term:
+    text: str
+    profile: int
+    weight: Optional[float] = None
+    ignore_case: bool = False
+    word_boundary: bool = False
+    negative: bool = False
+
+    @property
+    def needs_check(self) -> bool:
+        """True if a hit on the lowercased text must be verified."""
+        return self.word_boundary or (not self.ignore_case and any(c.isascii() and c.isalpha() for c in self.text))
+
+
+@dataclasses.dataclass(frozen=True)
+class Profile:
+    name: str
+    tag: Optional[str] = None
+    weight: Optional[float] = None
+
+
+def _boundary(value: Any, term: str) -> bool:
+    if value == "auto" or value is None:
+        return len(term) <= AUTO_BOUNDARY_MAX and term.isascii() and any(_is_word_char(c) for c in term)
+    return bool(value)
+
+
+def parse_profiles(data: Any) -> Tuple[List[Profile], List[Term]]:
+    """Profiles and terms from the JSON structure (raises ValueError if malformed)."""
+    entries = data.get("profiles") if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("缺少 profiles 列表")
+    profiles: List[Profile] = []
+    terms: List[Term] = []
+    for idx, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("name"):
+            raise ValueError(f"第 {idx + 1} 个 profile 缺少 name")
+        weight = entry.get("weight")
+        profiles.append(Profile(str(entry["name"]), entry.get("tag") or None,
+                                float(weight) if weight is not None else None))
+        term_weight = entry.get("term_weight")
+        for negative, key in ((False, "terms"), (True, "negative")):
+            for raw in entry.get(key) or []:
+                opts = raw if isinstance(raw, dict) else {"term": raw}
+                text = str(opts.get("term") or "")
+                if not text:
+                    continue
+                w = opts.get("weight", term_weight)
+                terms.append(Term(
+                    text=text,
+                    profile=idx,
+                    weight=float(w) if w is not None and not negative else None,
+                    ignore_case=bool(opts.get("ignore_case", entry.get("ignore_case", False))),
+                    word_boundary=_boundary(opts.get("word_boundary", entry.get("word_boundary", "auto")), text),
+                    negative=negative,
+                ))
+    names = {p.name for p in profiles}
+    missing = [name for name in REQUIRED_PROFILES if name not in names]
+    if missing:
+        raise ValueError(f"缺少必需的 profile: {', '.join(missing)}")
+    return profiles, terms
+
+
+class CompiledProfiles:
+    """A profile set compiled into one shared automaton."""
+
+    def __init__(self, profiles: List[Profile], terms: List[Term], source: str = "builtin") -> None:
+        self.profiles = profiles
+        self.terms = terms
+        self.source = source
+        by_key: Dict[str, List[int]] = {}
+        for ti, term in enumerate(terms):
+            by_key.setdefault(_fold(term.text), []).append(ti)
+        self.matcher = KeywordMatcher(by_key)
+        # keyword id -> indices of the terms it stands for
+        self._terms_of: List[Tuple[int, ...]] = [tuple(by_key[k]) for k in self.matcher.keywords]
+        self._check: List[bool] = [any(terms[ti].needs_check for ti in tis) for tis in self._terms_of]
+        self._by_name = {p.name: i for i, p in enumerate(profiles)}
+        self._has_negative = any(t.negative for t in terms)
+
+    def _accepts(self, term: Term, text: str, start: int, end: int) -> bool:
+        if not term.ignore_case and text[start:end] != term.text:
+            return False
+        if term.word_boundary and (
+            (start > 0 and _is_word_char(text[start - 1]))
+            or (end < len(text) and _is_word_char(text[end]))
+        ):
+            return False
+        return True
+
+    def _valid_terms(self, text: str) -> List[int]:
+        """Indices of the terms found in ``text``, grouped by keyword in declaration order."""
+        low = text.lower()
+        if len(low) != len(text):
+            low = _fold(text)
+        kids = self.matcher.find_ids(low)
+        if not kids:
+            return []
+        valid: List[int] = []
+        for kid in sorted(kids) if len(kids) > 1 else kids:
+            if not self._check[kid]:
+                valid.extend(self._terms_of[kid])
+                continue
+            # 有大小写/词边界要求：逐个出现位置核对原文
+            key = self.matcher.keywords[kid]
+            pending = list(self._terms_of[kid])
+            start = low.find(key)
+            while start >= 0 and pending:
+                end = start + len(key)
+                accepted = [ti for ti in pending if self._accepts(self.terms[ti], text, start, end)]
+                if accepted:
+                    valid.extend(accepted)
+                    pending = [ti for ti in pending if ti not in accepted]
+                start = low.find(key, start + 1)
+        return valid
+
+    def hits(self, text: str) -> Tuple[List[Term], Set[int]]:
+        """Matched positive terms and the profiles they belong to.
+
+        Terms come in the order their (lowercased) text first appears in the
+        profiles; terms sharing that text (e.g. listed under two profiles)
+        follow it directly.
+        """
+        valid = self._valid_terms(text or "")
+        if not valid:
+            return [], set()
+        terms = self.terms
+        matched = [terms[ti] for ti in valid]
+        if self._has_negative:
+            negated = {t.profile for t in matched if t.negative}
+            if negated:
+                matched = [t for t in matched if not t.negative and t.profile not in negated]
+        return matched, {t.profile for t in matched}
+
+    def tags(self, text: str) -> List[str]:
+        matched, hit = self.hits(text)
+        if not matched:
+            return []
+        tags: List[str] = []
+        for t in matched:
+            if t.text not in tags:
+                tags.append(t.text)
+        for idx in sorted(hit) if len(hit) > 1 else hit:
+            tag = self.profiles[idx].tag
+            if tag and tag not in tags:
+                tags.append(tag)
+        return tags
+
+    def matches_profile(self, text: str, names: Iterable[str]) -> bool:
+        wanted = {self._by_name[n] for n in names if n in self._by_name}
+        return bool(self.hits(text)[1] & wanted)
+
+    def weights(self) -> Dict[str, float]:
+        """Explicit tag/term weights declared by the profiles."""
+        out: Dict[str, float] = {}
+        for profile in self.profiles:
+            if profile.tag and profile.weight is not None:
+                out[profile.tag] = profile.weight
+        for term in self.terms:
+            if term.weight is not None:
+                out[term.text] = term.weight
+        return out
+
+
+def builtin_profiles() -> CompiledProfiles:
+    from .config import AI_KEYWORDS, GOLD_KEYWORDS, POLICY_KEYWORDS, TARGET_SECTORS
+
+    data = {"profiles": [
+        {"name": "sector", "terms": TARGET_SECTORS},
+        {"name": "policy", "tag": "政策类", "terms": POLICY_KEYWORDS},
+        {"name": "gold", "terms": GOLD_KEYWORDS},
+        {"name": "ai", "tag": "AI行业", "terms": AI_KEYWORDS},
+    ]}
+    return CompiledProfiles(*parse_profiles(data))
+
+
+def _resolve(path: str) -> str:
+    if os.path.isabs(path):
+        return path
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(root, path)
+
+
+class ProfileStore:
+    """Holds the current ``CompiledProfiles`` and reloads them when the file changes."""
+
+    def __init__(self, path: str, reload_seconds: float = 5) -> None:
+        self.path = _resolve(path)
+        self.reload_seconds = reload_seconds
+        self._current: Optional[CompiledProfiles] = None
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _mtime_now(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _compile(self, mtime: Optional[float]) -> CompiledProfiles:
+        if mtime is None:
+            return builtin_profiles()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                compiled = CompiledProfiles(*parse_profiles(json.load(f)), source=self.path)
+            print(f"[关键词] 已加载 {self.path}：{len(compiled.profiles)} 组，{len(compiled.terms)} 个词")
+            return compiled
+        except Exception as exc:  # noqa: BLE001
+            # 文件有误时保留当前词表，首次加载则退回内置词表
+            fallback = self._current or builtin_profiles()
+            print(f"[关键词] 读取 {self.path} 失败: {exc}；继续使用{'当前' if self._current else '内置'}词表")
+            return fallback
+
+    def get(self) -> CompiledProfiles:
+        now = time.monotonic()
+        current = self._current
+        if current is not None and now - self._checked < self.reload_seconds:
+            return current
+        with self._lock:
+            if self._current is not None and now - self._checked < self.reload_seconds:
+                return self._current
+            self._checked = now
+            mtime = self._mtime_now()
+            if self._current is None or mtime != self._mtime:
+                # 先完整编译，再一次性替换，读者不会看到半成品
+                self._current = self._compile(mtime)
+                self._mtime = mtime
+            return self._current
+
+
+_store: Optional[ProfileStore] = None
+_store_lock = threading.Lock()
+
+
+def get_profiles() -> CompiledProfiles:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                cfg = get_keywords_config()
+                _store = ProfileStore(cfg["path"], cfg["reload_seconds"])
+    return _store.get()
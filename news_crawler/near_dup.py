@@ -0,0 +1,180 @@
+"""Near-duplicate detection across sources with a SimHash index.
+
+``_deduplicate`` and ``StateStore`` only catch exact URL/title matches, yet the
+same story arrives several times: EastMoney columns 102 and 103, ChinaNews
+reposts of gov.cn items, slightly reworded flash headlines. Each copy costs a
+push line and an LLM summarization call.
+
+Every item gets a 64-bit SimHash over character 3-grams of its normalized
+title (weighted x2) and the start of its content. Two items are near
+duplicates when their fingerprints differ in at most ``max_distance`` bits
+and they were seen within ``window_hours`` of each other. The index splits
+fingerprints into four 16-bit bands; by pigeonhole any pair within 3 bits
+shares at least one band, so a query only compares against the few entries
+in its four band buckets (larger ``max_distance`` values work but may miss
+some pairs). Entries are persisted in ``data/near_dup.json``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app_config import get_near_dup_config
+from json_store import load_json, save_json
+
+_BANDS = 4
+_BAND_BITS = 64 // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+# 保留中文、字母、数字，去掉空白与标点
+_NOISE_RE = re.compile(r"[^0-9a-z\u4e00-\u9fff]+")
+
+
+def normalize_text(text: str) -> str:
+    return _NOISE_RE.sub("", (text or "").lower())
+
+
+def _features(item: Dict[str, Any], content_chars: int = 160) -> Dict[str, int]:
+    feats: Dict[str, int] = {}
+    for text, weight in (
+        (normalize_text(item.get("title", "")), 2),
+        (normalize_text(item.get("content", ""))[:content_chars], 1),
+    ):
+        if len(text) < 3:
+            if text:
+                feats[text] = feats.get(text, 0) + weight
+            continue
+        for i in range(len(text) - 2):
+            gram = text[i:i + 3]
+            feats[gram] = feats.get(gram, 0) + weight
+    return feats
+
+
+def simhash(item: Dict[str, Any]) -> int:
+    """64-bit SimHash of an item's title and leading content."""
+    counts = [0] * 64
+    for gram, weight in _features(item).items():
+        h = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(64):
+            if h >> bit & 1:
+                counts[bit] += weight
+            else:
+                counts[bit] -= weight
+    fp = 0
+    for bit, c in enumerate(counts):
+        if c > 0:
+            fp |= 1 << bit
+    return fp
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class NearDupIndex:
+    """SimHash entries ``[fingerprint, ts, key, dup_count]`` banded for lookup."""
+
+    def __init__(
+        self,
+        path: str = "data/near_dup.json",
+        max_distance: int = 3,
+        window_hours: float = 48,
+    ) -> None:
+        self.path = path
+        self.max_distance = max_distance
+        self.window = window_hours * 3600
+        self.entries: List[List[Any]] = []
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(_BANDS)]
+        self._lock = threading.Lock()
+        now = time.time()
+        for entry in load_json(path, []):
+            try:
+                fp, ts, key, count = int(entry[0], 16), float(entry[1]), str(entry[2]), int(entry[3])
+            except (IndexError, TypeError, ValueError):
+                continue
+            if now - ts <= self.window:
+                self._insert([fp, ts, key, count])
+
+    def _insert(self, entry: List[Any]) -> None:
+        idx = len(self.entries)
+        self.entries.append(entry)
+        fp = entry[0]
+        for b in range(_BANDS):
+            self._bands[b].setdefault(fp >> (b * _BAND_BITS) & _BAND_MASK, []).append(idx)
+
+    def find(self, fp: int, now: Optional[float] = None) -> Optional[List[Any]]:
+        """Closest live entry within ``max_distance`` bits, or None."""
+        now = time.time() if now is None else now
+        best: Optional[List[Any]] = None
+        best_dist = self.max_distance + 1
+        for b in range(_BANDS):
+            for idx in self._bands[b].get(fp >> (b * _BAND_BITS) & _BAND_MASK, ()):
+                entry = self.entries[idx]
+                if now - entry[1] > self.window:
+                    continue
+                dist = hamming(fp, entry[0])
+                if dist < best_dist:
+                    best, best_dist = entry, dist
+        return best
+
+    def check(self, item: Dict[str, Any], key: str, now: Optional[float] = None) -> Optional[Tuple[str, int]]:
+        """Register ``item``.
+
+        Returns None for a new story, or ``(key of the first copy, number of
+        duplicates seen so far)`` when ``item`` is a near duplicate.
+        """
+        now = time.time() if now is None else now
+        fp = simhash(item)
+        with self._lock:
+            entry = self.find(fp, now)
+            if entry is not None:
+                entry[3] += 1
+                return entry[2], entry[3]
+            self._insert([fp, now, key, 0])
+            return None
+
+    def flush(self) -> None:
+        now = time.time()
+        with self._lock:
+            live = [e for e in self.entries if now - e[1] <= self.window]
+            if len(live) != len(self.entries):
+                self.entries = []
+                self._bands = [{} for _ in range(_BANDS)]
+                for e in live:
+                    self._insert(e)
+            snapshot = [[format(e[0], "016x"), round(e[1], 1), e[2], e[3]] for e in self.entries]
+        save_json(self.path, snapshot)
+
+
+def load_dup_counts(path: str = "data/near_dup.json") -> Dict[str, int]:
+    """{key of the first copy: near duplicates seen} from the saved index.
+
+    Reposts arriving in later rounds only bump the index; the pending queue
+    reads the counts from here at pop time, so a story that keeps being
+    reposted rises in priority after it was queued.
+    """
+    counts: Dict[str, int] = {}
+    for entry in load_json(path, []):
+        try:
+            key, count = str(entry[2]), int(entry[3])
+        except (IndexError, TypeError, ValueError):
+            continue
+        if count > 0:
+            counts[key] = max(count, counts.get(key, 0))
+    return counts
+
+
+_default: Optional[NearDupIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_near_dup_index() -> NearDupIndex:
+    global _default
+    with _default_lock:
+        if _default is None:
+            cfg = get_near_dup_config()
+            _default = NearDupIndex(max_distance=cfg["max_distance"], window_hours=cfg["window_hours"])
+        return _default
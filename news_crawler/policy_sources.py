@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import urllib.parse
-from typing import List
-
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Dict, List
 
 from .base import NewsCrawler
-from .config import TARGET_SECTORS, POLICY_KEYWORDS
+from .charset import resolve_encoding
+from .link_extract import extract_links
+from .config import matches_sector_or_policy
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
 
 
 class MultiPolicyCrawler(NewsCrawler):
@@ -50,6 +52,9 @@ class MultiPolicyCrawler(NewsCrawler):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
         }
         self.max_per_source = 60
+        # 每个源的列表容器选择器（tag / tag.class / tag#id），只扫描容器内的链接；
+        # 未配置或页面改版后容器不存在时自动回落为全页扫描
+        self.containers: Dict[str, List[str]] = {}
 
     def _same_domain(self, href: str, base: str) -> bool:
         try:
@@ -63,47 +68,63 @@ class MultiPolicyCrawler(NewsCrawler):
         return urllib.parse.urljoin(base, href)
 
     def _text_matches(self, text: str) -> bool:
-        if not text:
-            return False
         # Early filter to reduce noise; final filter仍在上层统一进行
-        for kw in TARGET_SECTORS + POLICY_KEYWORDS:
-            if kw in text:
-                return True
-        return False
+        return matches_sector_or_policy(text)
 
     def _extract(self, html: str, base_url: str) -> list[dict]:
-        soup = BeautifulSoup(html, "html.parser")
-        results: list[dict] = []
-        for a in soup.select("a"):
-            title = a.get_text(strip=True)
-            href = a.get("href")
-            if not title or not href:
-                continue
+        def accept(title: str, href: str):
             fixed = self._fix_href(href, base_url)
             if not fixed.startswith("http"):
-                continue
+                return None
             if not self._same_domain(fixed, base_url):
-                continue
+                return None
             if not self._text_matches(title):
-                continue
-            results.append({"title": title, "content": title, "url": fixed})
-            if len(results) >= self.max_per_source:
-                break
-        return results
+                return None
+            return {"title": title, "content": title, "url": fixed}
 
-    def crawl(self):
+        return extract_links(
+            html,
+            accept,
+            containers=self.containers.get(base_url),
+            limit=self.max_per_source,
+        )
+
+    def _crawl_source(self, src: str) -> list[dict]:
+        resp = self.fetch(src, headers=self.headers, timeout=10, conditional=True)
+        if resp.status_code == 304:
+            # 页面未变化：本源无新内容，跳过解析
+            return []
+        resp.encoding = resolve_encoding(resp)
+        items = self._extract(resp.text, src)
+        if self.page_unchanged(src, items):
+            # 链接列表与上一轮相同（只有时间戳/广告变化）：本源无新内容
+            return []
+        return items
+
+    def _collect(self, outcomes) -> list[dict]:
         items: list[dict] = []
-        for src in self.sources:
-            try:
-                resp = requests.get(src, headers=self.headers, timeout=10)
-                resp.encoding = resp.apparent_encoding
-                items.extend(self._extract(resp.text, src))
-            except Exception as exc:  # noqa: BLE001
+        for src, res in outcomes:
+            if isinstance(res, Exception):
                 items.append({
                     "title": "政策抓取失败",
-                    "content": f"源: {src} 错误: {exc}",
+                    "content": f"源: {src} 错误: {res}",
                     "url": src,
                 })
+            else:
+                items.extend(res)
         return items
 
+    def crawl(self):
+        outcomes = []
+        for src in self.sources:
+            try:
+                outcomes.append((src, self._crawl_source(src)))
+            except Exception as exc:  # noqa: BLE001
+                outcomes.append((src, exc))
+        return self._collect(outcomes)
+
+    async def acrawl(self, engine: "CrawlEngine") -> list[dict]:
+        results = await engine.map(self._crawl_source, self.sources)
+        return self._collect(zip(self.sources, results))
+
 
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING
+
 from .base import NewsCrawler
+from .charset import resolve_encoding
+from .link_extract import extract_links
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
 
 
 class PolicyWatchCrawler(NewsCrawler):
@@ -21,34 +26,56 @@ class PolicyWatchCrawler(NewsCrawler):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
         }
+        self.max_items = 80
+        # 每个页面的列表容器选择器；未配置/不存在时全页扫描
+        self.containers: dict[str, list[str]] = {}
 
-    def _extract(self, html: str) -> list[dict]:
-        soup = BeautifulSoup(html, "html.parser")
-        items: list[dict] = []
-        for a in soup.select("a"):
-            title = a.get_text(strip=True)
-            href = a.get("href")
-            if not title or not href:
-                continue
+    def _extract(self, html: str, containers: list[str] | None = None) -> list[dict]:
+        def accept(title: str, href: str):
             if href.startswith("/"):
                 href = "https://www.gov.cn" + href
             if href.startswith("http") and len(title) >= 6:
-                items.append({"title": title, "url": href, "content": title})
-        return items[:80]
+                return {"title": title, "url": href, "content": title}
+            return None
 
-    def crawl(self):
+        return extract_links(html, accept, containers=containers, limit=self.max_items)
+
+    def _crawl_source(self, url: str) -> list[dict]:
+        resp = self.fetch(url, headers=self.headers, timeout=10, conditional=True)
+        if resp.status_code == 304:
+            # 页面未变化：本源无新内容，跳过解析
+            return []
+        resp.encoding = resolve_encoding(resp)
+        items = self._extract(resp.text, self.containers.get(url))
+        if self.page_unchanged(url, items):
+            # 链接列表与上一轮相同（只有时间戳/广告变化）：本源无新内容
+            return []
+        return items
+
+    def _collect(self, outcomes) -> list[dict]:
         results: list[dict] = []
-        for url in self.url_list:
-            try:
-                resp = requests.get(url, headers=self.headers, timeout=10)
-                resp.encoding = resp.apparent_encoding
-                results.extend(self._extract(resp.text))
-            except Exception as exc:  # noqa: BLE001
+        for url, res in outcomes:
+            if isinstance(res, Exception):
                 results.append({
                     "title": "政策抓取失败",
-                    "content": f"源: {url} 错误: {exc}",
+                    "content": f"源: {url} 错误: {res}",
                     "url": url,
                 })
+            else:
+                results.extend(res)
         return results
 
+    def crawl(self):
+        outcomes = []
+        for url in self.url_list:
+            try:
+                outcomes.append((url, self._crawl_source(url)))
+            except Exception as exc:  # noqa: BLE001
+                outcomes.append((url, exc))
+        return self._collect(outcomes)
+
+    async def acrawl(self, engine: "CrawlEngine") -> list[dict]:
+        results = await engine.map(self._crawl_source, self.url_list)
+        return self._collect(zip(self.url_list, results))
+
 
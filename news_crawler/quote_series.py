@@ -0,0 +1,253 @@
+"""Compact intraday time series for gold and sector quotes.
+
+Quote snapshots have a constant URL, so ``StateStore`` used to push each
+instrument once and then suppress it for the whole retention period, and the
+numbers of every other tick were thrown away. Quotes now bypass StateStore:
+every tick is appended to a per-instrument ring buffer and an item is pushed
+only when the price has moved by at least the configured threshold since the
+last push (the first tick of a day is always pushed).
+
+Each ``RingSeries`` keeps timestamps and prices in two ``array('d')``
+buffers (16 bytes per tick) plus running low/high, so ``delta``, ``range``
+and ``pct_move`` are O(1). The default capacity of 6000 ticks covers a full
+24h gold session at 15s polling; 40 instruments take about 4 MB. The day's
+first price is kept outside the ring, so the day move stays correct after
+the buffer wraps. Series reset when the trading date (Asia/Shanghai) changes
+and are persisted to ``data/quote_series.bin`` as a JSON header plus the raw
+array bytes.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import struct
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app_config import get_quotes_config
+from file_lock import atomic_write
+
+_MAGIC = b"QS01"
+
+
+def _today() -> str:
+    return datetime.datetime.now(ZoneInfo("Asia/Shanghai")).strftime("%Y-%m-%d")
+
+
+class RingSeries:
+    """Fixed-capacity (ts, value) ring buffer with O(1) delta/range queries."""
+
+    __slots__ = ("capacity", "ts", "values", "seq", "low", "high")
+
+    def __init__(self, capacity: int = 6000) -> None:
+        self.capacity = max(2, int(capacity))
+        self.ts = array("d", bytes(8 * self.capacity))
+        self.values = array("d", bytes(8 * self.capacity))
+        self.seq = 0  # number of values ever appended
+        # running extremes since the series started (one trading day)
+        self.low = 0.0
+        self.high = 0.0
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    def _value(self, seq: int) -> float:
+        return self.values[seq % self.capacity]
+
+    def append(self, ts: float, value: float) -> None:
+        i = self.seq % self.capacity
+        self.ts[i] = ts
+        self.values[i] = value
+        if self.seq == 0 or value < self.low:
+            self.low = value
+        if self.seq == 0 or value > self.high:
+            self.high = value
+        self.seq += 1
+
+    def last(self) -> Optional[float]:
+        return self._value(self.seq - 1) if self.seq else None
+
+    def first(self) -> Optional[float]:
+        return self._value(self.seq - len(self)) if self.seq else None
+
+    def delta(self) -> float:
+        """Change between the last two ticks."""
+        if self.seq < 2:
+            return 0.0
+        return self._value(self.seq - 1) - self._value(self.seq - 2)
+
+    def range(self) -> Tuple[float, float]:
+        """(low, high) since the series started."""
+        return (self.low, self.high)
+
+    def pct_move(self, reference: float) -> float:
+        """Percent change of the last value against ``reference``."""
+        last = self.last()
+        if last is None or not reference:
+            return 0.0
+        return (last - reference) / reference * 100
+
+    def chronological(self) -> Tuple[array, array]:
+        """Buffered (ts, values) oldest first."""
+        n = len(self)
+        start = (self.seq - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.ts[start:start + n], self.values[start:start + n]
+        return (
+            self.ts[start:] + self.ts[: (start + n) % self.capacity],
+            self.values[start:] + self.values[: (start + n) % self.capacity],
+        )
+
+
+class QuoteSeriesStore:
+    """Per-instrument ``RingSeries`` plus each instrument's day open and last pushed price."""
+
+    def __init__(
+        self,
+        path: str = "data/quote_series.bin",
+        capacity: int = 6000,
+        threshold_pct: float = 0.5,
+        thresholds: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.threshold_pct = threshold_pct
+        # key prefix -> threshold, e.g. {"gold:": 0.3, "sector:": 1.0}
+        self.thresholds = dict(thresholds or {})
+        self.date = _today()
+        self.series: Dict[str, RingSeries] = {}
+        # 当日首个价格（不随环形缓冲区覆盖），日内涨跌以此为基准
+        self.opens: Dict[str, float] = {}
+        self.pushed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def threshold(self, key: str) -> float:
+        for prefix, pct in self.thresholds.items():
+            if key.startswith(prefix):
+                return pct
+        return self.threshold_pct
+
+    def _roll_day(self) -> None:
+        today = _today()
+        if today != self.date:
+            self.date = today
+            self.series = {}
+            self.opens = {}
+            self.pushed = {}
+
+    def update(self, key: str, ts: float, value: float) -> Optional[Dict[str, float]]:
+        """Append a tick; returns move stats when it should be pushed, else None.
+
+        The tick is not marked as pushed: call ``mark_pushed`` for the items
+        that are actually emitted.
+        """
+        with self._lock:
+            self._roll_day()
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = RingSeries(self.capacity)
+            series.append(ts, value)
+            low, high = series.range()
+            stats = {
+                "delta": series.delta(),
+                "low": low,
+                "high": high,
+                "day_pct": series.pct_move(self.opens.setdefault(key, value)),
+                "move_pct": 0.0,
+            }
+            ref = self.pushed.get(key)
+            if ref is not None:
+                stats["move_pct"] = series.pct_move(ref)
+                if abs(stats["move_pct"]) < self.threshold(key):
+                    return None
+            return stats
+
+    def mark_pushed(self, key: str, value: float) -> None:
+        """Record ``value`` as the reference for the next threshold check."""
+        with self._lock:
+            self.pushed[key] = value
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                if f.read(4) != _MAGIC:
+                    return
+                (hlen,) = struct.unpack("<I", f.read(4))
+                header = json.loads(f.read(hlen).decode("utf-8"))
+                if header.get("date") != self.date:
+                    return
+                self.pushed = {k: float(v) for k, v in (header.get("pushed") or {}).items()}
+                self.opens = {k: float(v) for k, v in (header.get("opens") or {}).items()}
+                for key, count in header.get("series", []):
+                    ts = array("d")
+                    values = array("d")
+                    ts.frombytes(f.read(8 * count))
+                    values.frombytes(f.read(8 * count))
+                    series = self.series[key] = RingSeries(self.capacity)
+                    for t, v in zip(ts, values):
+                        series.append(t, v)
+                    if values:
+                        # 旧文件没有 opens：退回到缓冲区中最早的价格
+                        self.opens.setdefault(key, values[0])
+        except FileNotFoundError:
+            pass
+        except Exception as exc:  # noqa: BLE001
+            print(f"[行情] 读取 {self.path} 失败，重新开始记录: {exc}")
+            self.series = {}
+            self.opens = {}
+            self.pushed = {}
+
+    def flush(self) -> None:
+        with self._lock:
+            self._roll_day()
+            chunks: List[Tuple[str, array, array]] = [
+                (key, *s.chronological()) for key, s in self.series.items()
+            ]
+            header = {
+                "date": self.date,
+                "opens": dict(self.opens),
+                "pushed": dict(self.pushed),
+                "series": [[key, len(ts)] for key, ts, _ in chunks],
+            }
+        try:
+            raw = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            parts = [_MAGIC, struct.pack("<I", len(raw)), raw]
+            for _, ts, values in chunks:
+                parts.append(ts.tobytes())
+                parts.append(values.tobytes())
+            atomic_write(self.path, b"".join(parts), fsync=False)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[行情] 保存 {self.path} 失败: {exc}")
+
+
+_default: Optional[QuoteSeriesStore] = None
+_default_lock = threading.Lock()
+
+
+def get_quote_series() -> QuoteSeriesStore:
+    global _default
+    with _default_lock:
+        if _default is None:
+            cfg = get_quotes_config()
+            _default = QuoteSeriesStore(
+                capacity=cfg["capacity"],
+                threshold_pct=cfg["move_threshold_pct"],
+                thresholds={
+                    "gold:": cfg["gold_threshold_pct"],
+                    "sector:": cfg["sector_threshold_pct"],
+                },
+            )
+        return _default
+
+
+def annotate(item: Dict[str, Any], stats: Dict[str, float]) -> Dict[str, Any]:
+    """Add the move since the last push and the day's range to a quote item."""
+    move = f"较上次推送 {stats['move_pct']:+.2f}%" if stats["move_pct"] else "今日首次"
+    item["title"] = f"{item.get('title', '')} | {move}"
+    extra = f"日内区间 {stats['low']:g}-{stats['high']:g} / 日内 {stats['day_pct']:+.2f}%"
+    item["content"] = f"{item.get('content', '')}  {extra}".strip()
+    return item
@@ -0,0 +1,18 @@
+"""Ranking helpers for scored items.
+
+Kept apart from ``relevance`` so ``main`` can rank the lists it cuts
+without importing NumPy; the scores themselves come from
+``relevance.score_items`` inside ``run_all_crawlers``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+
+def rank(items: List[Dict[str, Any]], limit: Optional[int] = None, min_score: float = 0.0) -> List[Dict[str, Any]]:
+    """Items sorted by ``score`` (descending, stable), cut by ``min_score`` and ``limit``."""
+    ranked = sorted(items, key=lambda it: -float(it.get("score") or 0.0))
+    if min_score > 0:
+        ranked = [it for it in ranked if float(it.get("score") or 0.0) >= min_score]
+    return ranked if limit is None else ranked[:limit]
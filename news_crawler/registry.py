@@ -0,0 +1,208 @@
+"""Crawler registry with lazy module import.
+
+``news_crawler`` used to import every crawler module (and bs4 with them) at
+import time and hard-code the crawler list in ``run_all_crawlers``. Crawlers
+are now declared here as ``CrawlerSpec`` entries: name, module, lane, default
+polling policy and third-party dependencies. A crawler's module is imported
+only the first time it is scheduled, so a round that runs only the EastMoney
+feeds never loads bs4 or the policy crawlers.
+
+Lanes tell ``run_all_crawlers`` how to post-process a crawler's items:
+
+- ``news``: keyword tagging + StateStore de-dup (default)
+- ``quote``: quote snapshots; each tick goes into ``quote_series`` and an
+  item is pushed only when its move since the last push crosses the threshold;
+  polled at the spec's base interval instead of a learned one
+- ``gold``: like ``quote``, but only the first gold source with a result
+  counts and at most one item is pushed
+- ``direct``: items are pre-tagged by the crawler and only de-duplicated
+
+Which crawlers run is configured in the ``crawlers`` section of config.json::
+
+    "crawlers": {
+        "AINewsCrawler": true,
+        "SinaGoldPriceCrawler": false,
+        "MyCrawler": {"module": "news_crawler.my_source", "class": "MyCrawler",
+                      "lane": "news", "interval": 600, "min": 300, "max": 3600}
+    }
+
+``true``/``false`` toggles a built-in crawler; an object may override fields
+of a built-in spec or register a new one (``module`` and ``class`` required).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from app_config import get_crawlers_config
+
+LANES = ("news", "gold", "quote", "direct")
+
+
+@dataclasses.dataclass(frozen=True)
+class CrawlerSpec:
+    name: str
+    module: str
+    cls: str
+    lane: str = "news"
+    # 轮询策略（秒）：初始间隔、下限、上限
+    interval: float = 180
+    min_interval: float = 60
+    max_interval: float = 900
+    # 需要的第三方模块（import 名），缺失时跳过该爬虫
+    requires: Tuple[str, ...] = ()
+    enabled: bool = True
+
+    @property
+    def policy(self) -> Tuple[float, float, float]:
+        return (self.interval, self.min_interval, self.max_interval)
+
+
+# Declaration order is also the processing order in run_all_crawlers.
+BUILTIN_SPECS: List[CrawlerSpec] = [
+    CrawlerSpec("EastMoneyFlashCrawler", "news_crawler.eastmoney_flash", "EastMoneyFlashCrawler",
+                interval=30, min_interval=15, max_interval=180),
+    CrawlerSpec("EastMoneyFundCrawler", "news_crawler.eastmoney_fund", "EastMoneyFundCrawler",
+                interval=60, min_interval=20, max_interval=300),
+    CrawlerSpec("ChinaNewsCrawler", "news_crawler.chinanews", "ChinaNewsCrawler",
+                interval=180, min_interval=60, max_interval=900, requires=("bs4",)),
+    # 黄金价格监测：东财为主源，超时/失败时对冲请求新浪
+    CrawlerSpec("HedgedGoldCrawler", "news_crawler.gold_hedged", "HedgedGoldCrawler", lane="gold",
+                interval=60, min_interval=30, max_interval=300),
+    # 单独的东财 / 新浪黄金源：默认由 HedgedGoldCrawler 取代，同一轮只保留一条
+    CrawlerSpec("GoldPriceCrawler", "news_crawler.gold_price", "GoldPriceCrawler", lane="gold",
+                interval=60, min_interval=30, max_interval=300, enabled=False),
+    CrawlerSpec("SinaGoldPriceCrawler", "news_crawler.gold_price_sina", "SinaGoldPriceCrawler", lane="gold",
+                interval=60, min_interval=30, max_interval=300, enabled=False),
+    # 关注板块的当日开盘/盘中快照
+    CrawlerSpec("SectorOpenCrawler", "news_crawler.sector_open", "SectorOpenCrawler", lane="quote",
+                interval=60, min_interval=15, max_interval=600),
+    # 重大会议/政策/外交要闻
+    CrawlerSpec("PolicyWatchCrawler", "news_crawler.policy_watch", "PolicyWatchCrawler",
+                interval=900, min_interval=300, max_interval=3600),
+    # 多部委/交易所等政策/公告源
+    CrawlerSpec("MultiPolicyCrawler", "news_crawler.policy_sources", "MultiPolicyCrawler",
+                interval=1800, min_interval=600, max_interval=7200),
+    # 新闻联播内容（爬虫自带标签）
+    CrawlerSpec("CCTVNewsCrawler", "news_crawler.cctv_news", "CCTVNewsCrawler", lane="direct",
+                interval=1800, min_interval=600, max_interval=7200, requires=("bs4",)),
+    # AI 资讯源：默认关闭，在 config.json 的 crawlers 中开启
+    CrawlerSpec("AINewsCrawler", "news_crawler.ai_news", "AINewsCrawler",
+                interval=1800, min_interval=600, max_interval=7200, enabled=False),
+    CrawlerSpec("AIOfficialBlogsCrawler", "news_crawler.ai_official", "AIOfficialBlogsCrawler",
+                interval=1800, min_interval=600, max_interval=7200, requires=("bs4",), enabled=False),
+    CrawlerSpec("AIPlatformCrawler", "news_crawler.ai_platforms", "AIPlatformCrawler",
+                interval=1800, min_interval=600, max_interval=7200, requires=("bs4",), enabled=False),
+    CrawlerSpec("AIResearchCrawler", "news_crawler.ai_research", "AIResearchCrawler",
+                interval=3600, min_interval=1800, max_interval=14400, requires=("bs4",), enabled=False),
+]
+
+# config keys -> CrawlerSpec fields
+_CONFIG_FIELDS = {
+    "module": "module",
+    "class": "cls",
+    "lane": "lane",
+    "interval": "interval",
+    "min": "min_interval",
+    "max": "max_interval",
+    "requires": "requires",
+    "enabled": "enabled",
+}
+
+
+def _apply_config(spec: Optional[CrawlerSpec], name: str, entry: Any) -> Optional[CrawlerSpec]:
+    if isinstance(entry, bool):
+        return dataclasses.replace(spec, enabled=entry) if spec is not None else None
+    if not isinstance(entry, dict):
+        return spec
+    changes: Dict[str, Any] = {}
+    for key, field in _CONFIG_FIELDS.items():
+        if key not in entry:
+            continue
+        value = entry[key]
+        if field in ("interval", "min_interval", "max_interval"):
+            value = float(value)
+        elif field == "requires":
+            value = tuple(value or ())
+        elif field == "enabled":
+            value = bool(value)
+        changes[field] = value
+    if spec is None:
+        if not changes.get("module") or not changes.get("cls"):
+            print(f"[注册] {name} 缺少 module/class 配置，已忽略")
+            return None
+        return CrawlerSpec(name=name, **changes)
+    return dataclasses.replace(spec, **changes)
+
+
+def load_specs() -> List[CrawlerSpec]:
+    """Built-in specs merged with the ``crawlers`` config section (all, incl. disabled)."""
+    specs: Dict[str, CrawlerSpec] = {s.name: s for s in BUILTIN_SPECS}
+    for name, entry in get_crawlers_config().items():
+        spec = _apply_config(specs.get(name), name, entry)
+        if spec is None:
+            continue
+        if spec.lane not in LANES:
+            print(f"[注册] {name} 未知 lane={spec.lane!r}，按 news 处理")
+            spec = dataclasses.replace(spec, lane="news")
+        specs[name] = spec
+    return list(specs.values())
+
+
+def enabled_specs() -> List[CrawlerSpec]:
+    return [s for s in load_specs() if s.enabled]
+
+
+def default_policies() -> Dict[str, Tuple[float, float, float]]:
+    """name -> (initial interval, min interval, max interval) for the scheduler."""
+    return {s.name: s.policy for s in load_specs()}
+
+
+_classes: Dict[Tuple[str, str], Type[Any]] = {}
+_classes_lock = threading.Lock()
+
+
+def load_class(spec: CrawlerSpec) -> Type[Any]:
+    """Import the crawler's module on first use and return its class."""
+    key = (spec.module, spec.cls)
+    with _classes_lock:
+        cls = _classes.get(key)
+        if cls is None:
+            cls = getattr(importlib.import_module(spec.module), spec.cls)
+            _classes[key] = cls
+        return cls
+
+
+def missing_requirements(spec: CrawlerSpec) -> List[str]:
+    missing = []
+    for mod in spec.requires:
+        try:
+            importlib.import_module(mod)
+        except ImportError:
+            missing.append(mod)
+    return missing
+
+
+def instantiate(specs: List[CrawlerSpec]) -> List[Tuple[CrawlerSpec, Any]]:
+    """Create crawler instances; specs that fail to import are skipped with a log line."""
+    out: List[Tuple[CrawlerSpec, Any]] = []
+    for spec in specs:
+        missing = missing_requirements(spec)
+        if missing:
+            print(f"[注册] {spec.name} 缺少依赖 {', '.join(missing)}，跳过")
+            continue
+        try:
+            out.append((spec, load_class(spec)()))
+        except Exception as exc:  # noqa: BLE001 - one broken plugin must not stop the round
+            print(f"[注册] {spec.name} 加载失败: {exc}")
+    return out
+
+
+def find_spec(name: str) -> Optional[CrawlerSpec]:
+    for spec in load_specs():
+        if spec.name == name or spec.cls == name:
+            return spec
+    return None
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from typing import List
+import time
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
 from bs4 import BeautifulSoup
 
+from .base import NewsCrawler
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
+
 
 def parse_rss_or_atom(xml_text: str) -> List[dict]:
     """Parse RSS/Atom XML into a list of {title, url, content} dicts.
@@ -38,3 +44,56 @@ def parse_rss_or_atom(xml_text: str) -> List[dict]:
     return items
 
 
+class FeedCrawler(NewsCrawler):
+    """Shared fetch/collect logic for the RSS/Atom crawlers.
+
+    Subclasses set ``feeds``, ``headers``, ``max_items`` and ``failure_title``.
+    All unreachable/empty feeds are reported in one summary item.
+    """
+
+    feeds: List[str] = []
+    headers: dict = {}
+    max_items: int = 100
+    failure_title: str = "RSS抓取失败"
+
+    def _fetch_feed(self, url: str) -> Optional[List[dict]]:
+        """Parsed items of one feed; [] when unchanged (304), None when empty."""
+        resp = self.fetch(url, headers=self.headers, timeout=10, conditional=True)
+        # 304：feed 未更新，不重复解析，也不算失败
+        if resp.status_code == 304:
+            return []
+        parsed = parse_rss_or_atom(resp.text)
+        return parsed[: self.max_items] if parsed else None
+
+    def _collect(self, outcomes: Iterable[Tuple[str, Any]]) -> List[dict]:
+        items: List[dict] = []
+        failures: List[str] = []
+        for url, res in outcomes:
+            if isinstance(res, Exception):
+                failures.append(f"{url} 错误: {res}")
+            elif res is None:
+                failures.append(url)
+            else:
+                items.extend(res)
+        if failures:
+            items.append({
+                "title": self.failure_title,
+                "content": "; ".join(failures)[:2000],
+                "url": "",
+            })
+        return items
+
+    def crawl(self):
+        outcomes: List[Tuple[str, Any]] = []
+        for url in self.feeds:
+            try:
+                outcomes.append((url, self._fetch_feed(url)))
+            except Exception as exc:  # noqa: BLE001
+                outcomes.append((url, exc))
+            time.sleep(0.2)
+        return self._collect(outcomes)
+
+    async def acrawl(self, engine: "CrawlEngine") -> List[dict]:
+        # 并发抓取所有 feed；礼貌性限速由引擎的单站点并发上限保证
+        results = await engine.map(self._fetch_feed, self.feeds)
+        return self._collect(zip(self.feeds, results))
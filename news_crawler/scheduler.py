@@ -0,0 +1,135 @@
+"""Per-source polling schedule with learned update intervals.
+
+``fast_job`` used to run every crawler on one ``--poll-seconds`` cadence, so
+hourly sources (gov.cn, CCTV, ministries) were hit every few minutes while the
+EastMoney flash feed could not be polled faster than the slowest source.
+
+Each source now has its own interval bounded by [min, max]. After every poll
+we update an EWMA of the rate at which the source produced *new* StateStore
+keys; the next interval is the expected time until one new item arrives,
+clamped to the bounds. Sources that stay quiet drift to their max interval,
+busy ones speed up to their min. Quote sources (``gold``/``quote`` lanes)
+emit items only when a price crosses its move threshold, so they are not
+learned from and keep their base interval (``reschedule``).
+
+Default bounds come from the crawler registry; the ``schedule`` config
+section can still override them per source.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app_config import get_schedule_config
+from json_store import adopt_merged, load_json, merge_json
+
+from .registry import default_policies
+
+
+class SourceScheduler:
+    """Decides which sources are due and adapts their intervals.
+
+    State per source (persisted in ``data/schedule.json``):
+    ``{"interval", "next_due", "last_run", "rate"}`` where ``rate`` is the
+    EWMA of new items per second.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/schedule.json",
+        default_interval: float = 180,
+        alpha: float = 0.3,
+        policies: Optional[Dict[str, Tuple[float, float, float]]] = None,
+    ) -> None:
+        self.path = path
+        self.default_interval = float(default_interval)
+        self.alpha = alpha
+        self.policies: Dict[str, Tuple[float, float, float]] = default_policies()
+        if policies:
+            self.policies.update(policies)
+        for name, cfg in get_schedule_config().items():
+            base = self.policy(name)
+            self.policies[name] = (
+                float(cfg.get("interval", base[0])),
+                float(cfg.get("min", base[1])),
+                float(cfg.get("max", base[2])),
+            )
+        self.state: Dict[str, Dict[str, float]] = load_json(path, {})
+        # sources rescheduled since the last flush; only these are merged into the file
+        self._changed: Set[str] = set()
+
+    def policy(self, name: str) -> Tuple[float, float, float]:
+        d = self.default_interval
+        return self.policies.get(name, (d, d, d))
+
+    def due(self, names: Iterable[str], now: Optional[float] = None) -> List[str]:
+        now = time.time() if now is None else now
+        return [n for n in names if float(self.state.get(n, {}).get("next_due", 0)) <= now]
+
+    def record(self, name: str, new_items: int, now: Optional[float] = None) -> float:
+        """Feed back how many new keys a poll produced; returns the next interval."""
+        now = time.time() if now is None else now
+        interval0, lo, hi = self.policy(name)
+        st = self.state.get(name)
+        if st is None:
+            st = {"interval": interval0, "rate": 1.0 / interval0, "last_run": 0.0}
+        last_run = float(st.get("last_run", 0) or 0)
+        elapsed = now - last_run if last_run > 0 else float(st.get("interval", interval0))
+        elapsed = max(elapsed, 1.0)
+        rate = (1 - self.alpha) * float(st.get("rate", 0.0)) + self.alpha * (max(0, new_items) / elapsed)
+        interval = 1.0 / rate if rate > 0 else hi
+        interval = min(hi, max(lo, interval))
+        self._changed.add(name)
+        self.state[name] = {
+            "interval": round(interval, 1),
+            "rate": rate,
+            "last_run": now,
+            "next_due": now + interval,
+        }
+        return interval
+
+    def reschedule(self, name: str, now: Optional[float] = None) -> float:
+        """Poll a fixed-interval source again after its base interval."""
+        now = time.time() if now is None else now
+        interval = self.policy(name)[0]
+        st = self.state.get(name) or {}
+        self._changed.add(name)
+        self.state[name] = {
+            "interval": interval,
+            "rate": float(st.get("rate", 1.0 / interval)),
+            "last_run": now,
+            "next_due": now + interval,
+        }
+        return interval
+
+    def defer(self, name: str, now: Optional[float] = None) -> float:
+        """Reschedule a source whose poll did not finish, without learning from it.
+
+        The rate and ``last_run`` are kept, so the next completed poll measures
+        the new items over the whole time since the last observation.
+        """
+        now = time.time() if now is None else now
+        interval0 = self.policy(name)[0]
+        st = self.state.setdefault(name, {"interval": interval0, "rate": 1.0 / interval0, "last_run": 0.0})
+        interval = float(st.get("interval", interval0))
+        st["next_due"] = now + interval
+        self._changed.add(name)
+        return interval
+
+    def flush(self) -> None:
+        """Merge the sources rescheduled by this process into the file.
+
+        Sources polled by another process (e.g. a ``--once`` run next to the
+        daemon) keep that process's schedule, which ``due`` then follows.
+        """
+        changes = {name: dict(self.state[name]) for name in self._changed if name in self.state}
+        self._changed = set()
+        if not changes:
+            return
+        merged = merge_json(self.path, changes)
+        if merged is None:
+            self._changed.update(changes)
+            return
+        adopt_merged(self.state, merged, self._changed)
+
@@ -1,65 +1,195 @@
+"""Opening / intraday snapshots of the boards matching ``TARGET_SECTORS``.
+
+Every poll used to download 200 industry and 200 concept boards from the
+push2 ``clist`` API and scan all of their names for the target sectors, only
+to keep a handful. The board list changes rarely, so we now build a
+``TARGET_SECTORS`` -> BK code index once per trading day (persisted in
+``data/sector_index.json``) by paging through the full board lists, and
+intraday polls fetch just those secids in one ``ulist`` request.
+
+If the index cannot be built or the ``ulist`` call fails, the poll falls
+back to the old ``clist`` scan.
+"""
+
 from __future__ import annotations
 
-import requests
+import datetime
+import threading
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from json_store import load_json, save_json
+
 from .base import NewsCrawler
 from .config import TARGET_SECTORS
 
+QUOTE_FIELDS = "f2,f3,f4,f12,f14,f15,f16,f17,f18"
+CLIST_URL = "https://push2.eastmoney.com/api/qt/clist/get"
+ULIST_URL = "https://push2.eastmoney.com/api/qt/ulist.np/get"
+# industry (t:2) and concept (t:3) boards
+BOARD_LISTS = ("m:90+t:2", "m:90+t:3")
+
+
+def _today() -> str:
+    return datetime.datetime.now(ZoneInfo("Asia/Shanghai")).strftime("%Y-%m-%d")
+
+
+class SectorIndex:
+    """{"date", "sectors", "boards": [{"code", "name"}]} persisted as JSON.
+
+    The index is valid for one day and for the sector list it was built from.
+    """
+
+    def __init__(self, path: str = "data/sector_index.json") -> None:
+        self.path = path
+        self.data: Dict[str, Any] = load_json(path, {})
+        self._lock = threading.Lock()
+
+    def boards(self, sectors: List[str]) -> Optional[List[Dict[str, str]]]:
+        """Indexed boards, or None when the index is stale or for other sectors."""
+        with self._lock:
+            if self.data.get("date") != _today() or self.data.get("sectors") != list(sectors):
+                return None
+            return list(self.data.get("boards") or [])
+
+    def replace(self, sectors: List[str], boards: List[Dict[str, str]]) -> None:
+        with self._lock:
+            self.data = {"date": _today(), "sectors": list(sectors), "boards": boards}
+            snapshot = dict(self.data)
+        save_json(self.path, snapshot)
+
+
+_index: Optional[SectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_sector_index() -> SectorIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SectorIndex()
+        return _index
+
+
+def _matches(name: str) -> bool:
+    return any(sector in name for sector in TARGET_SECTORS)
+
 
 class SectorOpenCrawler(NewsCrawler):
     """Fetch opening and intraday snapshot for target sectors (industry/concept boards).
 
-    Data source: Eastmoney push2 board list API. We query both industry (t:2)
-    and concept (t:3) boards, then filter by sector keywords. The field
-    mapping is based on Eastmoney common quote fields.
+    Data source: Eastmoney push2 quote APIs. The field mapping is based on
+    Eastmoney common quote fields.
     """
 
+    page_size = 200
+    max_pages = 10
+
     def __init__(self) -> None:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
         }
-        self.base_url = (
-            "https://push2.eastmoney.com/api/qt/clist/get?pn=1&pz=200&po=1&np=1&fltt=2&fid=f3&fields=f2,f3,f4,f12,f14,f15,f16,f17,f18&fs="
+
+    def _clist(self, fs: str, fields: str, pn: int = 1, fid: str = "f3") -> Dict[str, Any]:
+        url = (
+            f"{CLIST_URL}?pn={pn}&pz={self.page_size}&po=1&np=1&fltt=2&fid={fid}"
+            f"&fields={fields}&fs={fs}"
         )
+        resp = self.fetch(url, headers=self.headers, timeout=10)
+        return resp.json().get("data") or {}
 
     def _fetch(self, fs: str):
-        url = self.base_url + fs
-        resp = requests.get(url, headers=self.headers, timeout=10)
-        data = resp.json()
-        return data.get("data", {}).get("diff", [])
+        """First page of a board list with full quote fields (fallback path)."""
+        return self._clist(fs, QUOTE_FIELDS).get("diff", [])
+
+    def _build_index(self) -> List[Dict[str, str]]:
+        """Page through all industry/concept boards (code + name only)."""
+        boards: List[Dict[str, str]] = []
+        seen = set()
+        for fs in BOARD_LISTS:
+            for pn in range(1, self.max_pages + 1):
+                # 按代码排序翻页，避免按涨幅排序时翻页过程中顺序变化
+                data = self._clist(fs, "f12,f14", pn=pn, fid="f12")
+                diff = data.get("diff") or []
+                if isinstance(diff, dict):
+                    diff = list(diff.values())
+                for it in diff:
+                    name = str(it.get("f14", ""))
+                    code = str(it.get("f12", ""))
+                    if code and name and code not in seen and _matches(name):
+                        seen.add(code)
+                        boards.append({"code": code, "name": name})
+                if len(diff) < self.page_size or pn * self.page_size >= int(data.get("total") or 0):
+                    break
+        return boards
+
+    def _indexed_boards(self) -> List[Dict[str, str]]:
+        index = get_sector_index()
+        boards = index.boards(TARGET_SECTORS)
+        if boards is None:
+            boards = self._build_index()
+            index.replace(TARGET_SECTORS, boards)
+            print(f"[调试] 板块索引已更新：{len(boards)} 个板块匹配关注方向")
+        return boards
+
+    def _fetch_quotes(self, codes: List[str]) -> List[Dict[str, Any]]:
+        secids = ",".join(f"90.{code}" for code in codes)
+        url = f"{ULIST_URL}?fltt=2&invt=2&secids={secids}&fields={QUOTE_FIELDS}"
+        resp = self.fetch(url, headers=self.headers, timeout=10)
+        diff = (resp.json().get("data") or {}).get("diff") or []
+        return list(diff.values()) if isinstance(diff, dict) else diff
+
+    def _scan_all(self) -> List[Dict[str, Any]]:
+        """Old path: download both board lists and filter by name."""
+        all_boards = []
+        for fs in BOARD_LISTS:
+            all_boards.extend(self._fetch(fs) or [])
+        return [it for it in all_boards if _matches(str(it.get("f14", "")))]
+
+    def _to_news(self, it: Dict[str, Any]) -> Dict[str, Any]:
+        name = str(it.get("f14", ""))
+        code = it.get("f12", "")
+        last = it.get("f2")  # latest
+        pct = it.get("f3")  # pct change
+        chg = it.get("f4")  # change amount
+        high = it.get("f15")
+        low = it.get("f16")
+        open_price = it.get("f17")
+        prev_close = it.get("f18")
+
+        title = f"板块开盘 | {name}  开盘:{open_price}  现价:{last}  涨跌:{chg} 涨幅:{pct}%"
+        content = (
+            f"高:{high}  低:{low}  昨收:{prev_close}  代码:{code}"
+        )
+        url = f"https://quote.eastmoney.com/bk/90.{code}.html" if code else "https://quote.eastmoney.com/"
+        item: Dict[str, Any] = {
+            "title": title,
+            "content": content,
+            "url": url,
+        }
+        try:
+            # 结构化行情：供 run_all_crawlers 记录时间序列并按涨跌阈值推送
+            item["quote"] = {"key": f"sector:{code}", "price": float(last)}
+        except (TypeError, ValueError):
+            pass
+        return item
 
     def crawl(self):
         results: list[dict] = []
         try:
-            # Industry boards
-            industry = self._fetch("m:90+t:2")
-            # Concept boards
-            concept = self._fetch("m:90+t:3")
-            all_boards = (industry or []) + (concept or [])
-            for it in all_boards:
-                name = str(it.get("f14", ""))
-                if not name:
-                    continue
-                if not any(sector in name for sector in TARGET_SECTORS):
+            quotes: Optional[List[Dict[str, Any]]] = None
+            try:
+                boards = self._indexed_boards()
+                if boards:
+                    quotes = self._fetch_quotes([b["code"] for b in boards])
+            except Exception as exc:  # noqa: BLE001
+                print(f"[调试] 板块索引/ulist 请求失败，回退全量扫描: {exc}")
+            if not quotes:
+                quotes = self._scan_all()
+            for it in quotes:
+                if not str(it.get("f14", "")):
                     continue
-                code = it.get("f12", "")
-                last = it.get("f2")  # latest
-                pct = it.get("f3")  # pct change
-                chg = it.get("f4")  # change amount
-                high = it.get("f15")
-                low = it.get("f16")
-                open_price = it.get("f17")
-                prev_close = it.get("f18")
-
-                title = f"板块开盘 | {name}  开盘:{open_price}  现价:{last}  涨跌:{chg} 涨幅:{pct}%"
-                content = (
-                    f"高:{high}  低:{low}  昨收:{prev_close}  代码:{code}"
-                )
-                url = f"https://quote.eastmoney.com/bk/90.{code}.html" if code else "https://quote.eastmoney.com/"
-                results.append({
-                    "title": title,
-                    "content": content,
-                    "url": url,
-                })
+                results.append(self._to_news(it))
         except Exception as exc:  # noqa: BLE001
             results.append({
                 "title": "板块开盘数据抓取失败",
@@ -67,5 +197,3 @@ class SectorOpenCrawler(NewsCrawler):
                 "url": "",
             })
         return results
-
-
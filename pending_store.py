@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import heapq
 import json
 import os
 import time
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from app_config import get_queue_config
+from file_lock import FileLock, LockTimeout, atomic_write
+from news_crawler.near_dup import load_dup_counts
+from priority import PriorityScorer
 
 
 def _stable_item_key(it: Dict[str, Any]) -> str:
@@ -19,55 +25,360 @@ def _stable_item_key(it: Dict[str, Any]) -> str:
     return f"raw:{title[:50]}|{content[:50]}"
 
 
+def _segment_name(first_seq: int) -> str:
+    return f"seg-{first_seq:012d}.jsonl"
+
+
 class PendingStore:
-    """JSON-based queue for items waiting for deep analysis (AI summarization)."""
+    """Append-only queue for items waiting for deep analysis (AI summarization).
+
+    The queue used to be one pretty-printed ``data/pending.json`` that was
+    rewritten in full (article contents included) on every add and pop. It is
+    now a directory of JSONL segments:
+
+    - ``seg-<first seq>.jsonl``: one ``{"seq", "item"}`` record per line;
+      ``add_many`` appends, a new segment starts past ``segment_bytes``
+    - ``seg-<first seq>.idx``: one ``[seq, start, end, queued_at, dup_count,
+      heap_key, key]`` line per record of the segment, so pops pick records
+      without parsing their items and then read only the chosen byte ranges
+    - ``offset.json``: the reader position (segment, byte offset, last seq);
+      ``pop_many`` reads forward from it and only rewrites this small file
+    - ``keys.log``: ``ts<TAB>key`` lines of queued keys, for de-duplication
+      without reading the segments
+    - ``popped.json``: seqs past the reader position that were already
+      handed out (priority mode pops out of order)
+
+    Fully consumed segments are deleted after each pop and the keys log is
+    compacted once most of it has expired, so adds and pops cost in
+    proportion to the items they touch.
+
+    ``add_many`` and ``pop_many`` run under the ``.lock`` file lock, so the
+    crawler and the analysis worker may be separate processes (or a
+    ``--once`` run may overlap the daemon) without losing or double-popping
+    items. Small files are replaced atomically; the keys log is re-read from
+    where this instance stopped (from the start once it was compacted), so
+    keys queued by other processes are seen too.
+
+    With ``priority`` (see ``priority.PriorityScorer``) the heap key is
+    computed once when an item is added and stored in the index. ``pop_many``
+    scans the index entries past the reader position, re-keys the entries
+    whose ``dup_count`` grew in the near-duplicate index since they were
+    queued (reposts found later raise an item's score), keeps the top k with
+    a bounded heap (O(n log k) over small index lines) and then seeks to read
+    only those k records. Keys follow the scorer config of the time they were
+    queued. The reader position then advances over the consumed prefix.
+    """
 
-    def __init__(self, path: str = "data/pending.json", retention_days: int = 2) -> None:
+    def __init__(
+        self,
+        path: str = "data/pending",
+        retention_days: int = 2,
+        segment_bytes: int = 256 * 1024,
+        migrate_from: Optional[str] = "data/pending.json",
+        priority: Optional[bool] = None,
+    ) -> None:
         self.path = path
         self.retention_days = retention_days
-        self.items: List[Dict[str, Any]] = []
-        self._load()
+        self.segment_bytes = segment_bytes
+        if priority is None:
+            priority = get_queue_config()["priority"]
+        self.scorer: Optional[PriorityScorer] = PriorityScorer.from_config() if priority else None
+        self._keys: Optional[Dict[str, float]] = None
+        self._keys_lines = 0
+        # keys.log 已读到的位置；文件被压缩重写后 inode 变化，需从头读
+        self._keys_pos = 0
+        self._keys_ino: Optional[int] = None
+        os.makedirs(path, exist_ok=True)
+        self._file_lock = FileLock(self._file(".lock"))
+        if migrate_from:
+            with self._file_lock:
+                self._migrate(migrate_from)
 
-    def _load(self) -> None:
+    # ---- files -------------------------------------------------------
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _segments(self) -> List[str]:
+        return sorted(n for n in os.listdir(self.path) if n.startswith("seg-") and n.endswith(".jsonl"))
+
+    def _index_file(self, segment: str) -> str:
+        return self._file(segment[: -len(".jsonl")] + ".idx")
+
+    def _read_offset(self) -> Dict[str, Any]:
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            if os.path.exists(self.path):
-                with open(self.path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        self.items = data
+            with open(self._file("offset.json"), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
         except Exception:
-            self.items = []
+            pass
+        return {"segment": "", "offset": 0, "seq": 0}
+
+    def _write_offset(self, state: Dict[str, Any]) -> None:
+        atomic_write(self._file("offset.json"), json.dumps(state))
 
-    def _save(self) -> None:
+    def _read_popped(self) -> Set[int]:
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.items, f, ensure_ascii=False, indent=2)
+            with open(self._file("popped.json"), "r", encoding="utf-8") as f:
+                return {int(seq) for seq in json.load(f)}
         except Exception:
+            return set()
+
+    def _write_popped(self, seqs: Set[int]) -> None:
+        atomic_write(self._file("popped.json"), json.dumps(sorted(seqs)))
+
+    @staticmethod
+    def _truncate_torn(path: str) -> None:
+        """Cut a torn last line (crash mid-append) so the next append starts a new line.
+
+        Only called under the file lock, where no other writer can be mid-line.
+        """
+        try:
+            with open(path, "rb+") as f:
+                end = f.seek(0, os.SEEK_END)
+                pos = end
+                while pos > 0:
+                    step = min(4096, pos)
+                    pos -= step
+                    f.seek(pos)
+                    chunk = f.read(step)
+                    nl = chunk.rfind(b"\n")
+                    if nl >= 0:
+                        pos += nl + 1
+                        break
+                if pos < end:
+                    f.truncate(pos)
+                    print(f"[队列] {os.path.basename(path)} 末尾有 {end - pos} 字节残缺记录，已截断")
+        except FileNotFoundError:
             pass
 
-    def _purge(self) -> None:
-        """Drop very old items (best-effort)."""
-        now = time.time()
-        ttl = self.retention_days * 86400
-        kept: List[Dict[str, Any]] = []
-        for it in self.items:
-            ts = it.get("_queued_at")
-            try:
-                tsf = float(ts) if ts is not None else now
-            except Exception:
-                tsf = now
-            if now - tsf <= ttl:
-                kept.append(it)
-        self.items = kept
+    @staticmethod
+    def _last_seq(path: str) -> int:
+        """``seq`` of the last complete, parseable record in a segment (0 if none)."""
+        return PendingStore._last_value(path, lambda record: int(record["seq"]))
+
+    @staticmethod
+    def _last_value(path: str, pick: Callable[[Any], int]) -> int:
+        """``pick`` of the last complete JSON line it accepts (0 if none).
+
+        Scans backwards from the end, so only the tail is read.
+        """
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            buf = b""
+            while True:
+                if pos > 0:
+                    step = min(4096, pos)
+                    pos -= step
+                    f.seek(pos)
+                    buf = f.read(step) + buf
+                lines = buf.split(b"\n")
+                # lines[0] 可能不完整（前面还有内容），留到读入更多后再解析
+                buf = lines[0] if pos > 0 else b""
+                for line in reversed(lines[1:] if pos > 0 else lines):
+                    try:
+                        return pick(json.loads(line))
+                    except Exception:
+                        continue
+                if pos == 0:
+                    return 0
+
+    # ---- index -------------------------------------------------------
+
+    def _index_entry(self, seq: int, start: int, end: int, item: Dict[str, Any]) -> List[Any]:
+        try:
+            queued = float(item.get("_queued_at", 0) or 0)
+        except (TypeError, ValueError):
+            queued = 0.0
+        try:
+            dups = max(0, int(item.get("dup_count") or 0))
+        except (TypeError, ValueError):
+            dups = 0
+        heap_key = self.scorer.heap_key(item) if self.scorer is not None else None
+        return [seq, start, end, queued, dups, heap_key, _stable_item_key(item)]
+
+    @staticmethod
+    def _write_index(path: str, entries: List[List[Any]]) -> None:
+        if not entries:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in entries))
+
+    def _sync_index(self, segment: str) -> None:
+        """Index the records of ``segment`` that its ``.idx`` sidecar is missing.
+
+        Covers a crash between the segment append and the index append, and
+        segments written before the index existed. Only the unindexed tail of
+        the segment is read. Called under the file lock.
+        """
+        index = self._index_file(segment)
+        self._truncate_torn(index)
+        try:
+            end = self._last_value(index, lambda entry: int(entry[2]))
+        except FileNotFoundError:
+            end = 0
+        path = self._file(segment)
+        if end >= os.path.getsize(path):
+            return
+        entries: List[List[Any]] = []
+        with open(path, "rb") as f:
+            f.seek(end)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 残缺的末尾记录
+                start, end = end, end + len(line)
+                try:
+                    record = json.loads(line)
+                    seq, item = int(record["seq"]), record["item"]
+                except Exception:
+                    continue
+                if isinstance(item, dict):
+                    entries.append(self._index_entry(seq, start, end, item))
+        self._write_index(index, entries)
+
+    def _read_index(self, segment: str, offset: int) -> Iterator[List[Any]]:
+        """Index entries of ``segment`` for records starting at or after ``offset``."""
+        self._sync_index(segment)
+        try:
+            f = open(self._index_file(segment), "rb")
+        except FileNotFoundError:
+            return  # 段内还没有完整记录
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if int(entry[1]) >= offset:
+                    yield entry
+
+    def _read_records(self, chosen: List[Tuple[str, int, int]]) -> List[Optional[Dict[str, Any]]]:
+        """Items at the given (segment, start, end) byte ranges (None if unreadable)."""
+        items: List[Optional[Dict[str, Any]]] = [None] * len(chosen)
+        by_segment: Dict[str, List[int]] = {}
+        for i, (name, _, _) in enumerate(chosen):
+            by_segment.setdefault(name, []).append(i)
+        for name, positions in by_segment.items():
+            with open(self._file(name), "rb") as f:
+                for i in sorted(positions, key=lambda i: chosen[i][1]):
+                    _, start, end = chosen[i]
+                    f.seek(start)
+                    try:
+                        item = json.loads(f.read(end - start))["item"]
+                    except Exception:
+                        continue
+                    if isinstance(item, dict):
+                        items[i] = item
+        return items
+
+    # ---- keys --------------------------------------------------------
+
+    def _load_keys(self) -> Dict[str, float]:
+        """Queued keys, catching up with lines appended since the last call."""
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            with open(self._file("keys.log"), "rb") as f:
+                st = os.fstat(f.fileno())
+                if self._keys is None or st.st_ino != self._keys_ino or st.st_size < self._keys_pos:
+                    self._keys, self._keys_lines, self._keys_pos = {}, 0, 0
+                    self._keys_ino = st.st_ino
+                keys = self._keys
+                f.seek(self._keys_pos)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # 其他进程正在写入的行
+                    self._keys_pos += len(line)
+                    self._keys_lines += 1
+                    ts, _, key = line.decode("utf-8", errors="replace").rstrip("\n").partition("\t")
+                    try:
+                        if float(ts) >= cutoff:
+                            keys[key] = float(ts)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            if self._keys is None:
+                self._keys = {}
+        return self._keys
+
+    def _compact_keys(self) -> None:
+        """Rewrite keys.log without expired keys once they are the majority."""
+        keys = self._load_keys()
+        if self._keys_lines < 1000 or self._keys_lines < 2 * len(keys):
+            return
+        raw = "".join(f"{ts}\t{key}\n" for key, ts in keys.items()).encode("utf-8")
+        atomic_write(self._file("keys.log"), raw)
+        self._keys_lines = len(keys)
+        self._keys_pos = len(raw)
+        self._keys_ino = os.stat(self._file("keys.log")).st_ino
+
+    # ---- queue -------------------------------------------------------
+
+    def _migrate(self, json_path: str) -> None:
+        """One-time import of the old pending.json (renamed to *.migrated)."""
+        if not os.path.exists(json_path) or self._segments():
+            return
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            items = [it for it in data if isinstance(it, dict)] if isinstance(data, list) else []
+            self._append(items)
+            os.replace(json_path, json_path + ".migrated")
+            print(f"[队列] 已从 {json_path} 迁移 {len(items)} 条待分析内容")
+        except Exception as exc:  # noqa: BLE001
+            print(f"[队列] 迁移 {json_path} 失败: {exc}")
+
+    def _append(self, items: List[Dict[str, Any]]) -> None:
+        """Append already-stamped items and record their keys."""
+        if not items:
+            return
+        segments = self._segments()
+        if segments:
+            self._truncate_torn(self._file(segments[-1]))
+        self._truncate_torn(self._file("keys.log"))
+        # 序号取自最后一条完整记录；段内没有完整记录时往前找，再退回读位置
+        seq = int(self._read_offset().get("seq", 0) or 0)
+        for name in reversed(segments):
+            last = self._last_seq(self._file(name))
+            if last:
+                seq = max(seq, last)
+                break
+        if segments and os.path.getsize(self._file(segments[-1])) < self.segment_bytes:
+            name = segments[-1]
+            # 索引须先追平段文件，新条目的偏移才接得上
+            self._sync_index(name)
+        else:
+            name = _segment_name(int(seq) + 1)
+        lines = []
+        entries = []
+        key_lines = []
+        with open(self._file(name), "ab") as f:
+            end = f.tell()
+            for it in items:
+                seq = int(seq) + 1
+                line = json.dumps({"seq": seq, "item": it}, ensure_ascii=False, separators=(",", ":"))
+                lines.append(line.encode("utf-8") + b"\n")
+                start, end = end, end + len(lines[-1])
+                entries.append(self._index_entry(seq, start, end, it))
+                key_lines.append(f"{it.get('_queued_at', time.time())}\t{_stable_item_key(it)}")
+            f.write(b"".join(lines))
+        self._write_index(self._index_file(name), entries)
+        with open(self._file("keys.log"), "a", encoding="utf-8") as f:
+            f.write("\n".join(key_lines) + "\n")
 
     def add_many(self, items: List[Dict[str, Any]]) -> int:
         """Append new items to pending queue; returns number of newly added."""
-        self._purge()
-        existing = {_stable_item_key(it) for it in self.items if isinstance(it, dict)}
-        added = 0
+        try:
+            with self._file_lock:
+                return self._add_many(items)
+        except LockTimeout as exc:
+            print(f"[队列] 写入失败: {exc}")
+            return 0
+
+    def _add_many(self, items: List[Dict[str, Any]]) -> int:
+        existing = self._load_keys()
         now = time.time()
+        fresh: List[Dict[str, Any]] = []
         for it in items:
             if not isinstance(it, dict):
                 continue
@@ -75,29 +386,137 @@ class PendingStore:
             if key in existing:
                 continue
             it = dict(it)
-            it["_queued_at"] = now
-            self.items.append(it)
-            existing.add(key)
-            added += 1
-        if added:
-            self._save()
-        return added
+            it.setdefault("_queued_at", now)
+            fresh.append(it)
+            existing[key] = float(it["_queued_at"])
+        try:
+            self._append(fresh)
+            self._compact_keys()
+        except Exception as exc:  # noqa: BLE001
+            print(f"[队列] 写入失败: {exc}")
+            return 0
+        return len(fresh)
 
-    def pop_all(self) -> List[Dict[str, Any]]:
-        """Pop and clear all pending items."""
-        self._purge()
-        items = list(self.items)
-        self.items = []
-        self._save()
-        return items
+    def _iter_index(self, state: Dict[str, Any]) -> Iterator[Tuple[str, List[Any]]]:
+        """Yield (segment, index entry) from the reader position."""
+        for name in self._segments():
+            if state.get("segment") and name < state["segment"]:
+                continue
+            offset = int(state.get("offset", 0)) if name == state.get("segment") else 0
+            for entry in self._read_index(name, offset):
+                yield name, entry
 
     def pop_many(self, limit: int) -> List[Dict[str, Any]]:
-        """Pop up to `limit` items, keeping the rest for next analysis run."""
-        self._purge()
+        """Pop up to `limit` items, keeping the rest for next analysis run.
+
+        FIFO order by default; highest priority first when a scorer is set.
+        """
         if limit <= 0:
             return []
-        items = self.items[:limit]
-        self.items = self.items[limit:]
-        self._save()
-        return list(items)
+        try:
+            with self._file_lock:
+                return self._pop_many(limit)
+        except LockTimeout as exc:
+            print(f"[队列] 读取失败: {exc}")
+            return []
+
+    def _pop_many(self, limit: int) -> List[Dict[str, Any]]:
+        state = self._read_offset()
+        popped = self._read_popped()
+        consumed = set(popped)
+        cutoff = time.time() - self.retention_days * 86400
+        # (segment, offset after record, seq) in log order, for advancing the reader
+        order: List[Tuple[str, int, int]] = []
+        # (segment, start, end, seq, queued dup_count, heap key, key)
+        candidates: List[Tuple[str, int, int, int, int, Optional[float], str]] = []
+        for name, (seq, start, end, queued, dups, heap_key, key) in self._iter_index(state):
+            order.append((name, end, seq))
+            if seq in popped:
+                continue
+            # 过期条目直接丢弃（与旧版 _purge 一致）
+            if queued and queued < cutoff:
+                consumed.add(seq)
+                continue
+            candidates.append((name, start, end, seq, dups, heap_key, key))
+            if self.scorer is None and len(candidates) >= limit:
+                break
+        refreshed: Dict[int, int] = {}
+        if self.scorer is not None and candidates:
+            candidates = self._top_by_priority(candidates, limit, refreshed)
+        items = self._read_records([(name, start, end) for name, start, end, *_ in candidates])
+        chosen: List[Dict[str, Any]] = []
+        for (_, _, _, seq, *_), item in zip(candidates, items):
+            consumed.add(seq)
+            if item is None:
+                continue
+            if seq in refreshed:
+                item["dup_count"] = refreshed[seq]
+            chosen.append(item)
+        self._advance(state, order, consumed, popped)
+        return chosen
+
+    def _top_by_priority(
+        self,
+        candidates: List[Tuple[str, int, int, int, int, Optional[float], str]],
+        limit: int,
+        refreshed: Dict[int, int],
+    ) -> List[Tuple[str, int, int, int, int, Optional[float], str]]:
+        """The ``limit`` highest-priority candidates, best first.
+
+        Fills ``refreshed`` with {seq: dup_count} for the candidates whose
+        near-duplicate count grew since they were queued.
+        """
+        assert self.scorer is not None
+        # 入队后才出现的转载只记在近似重复索引里，出队时按最新计数修正堆键
+        dups_now = load_dup_counts()
+        # 没有堆键的条目（非优先级模式下入队）读出原记录现算
+        unkeyed = [c for c in candidates if c[5] is None]
+        computed = self._read_records([(name, start, end) for name, start, end, *_ in unkeyed])
+        keys: Dict[int, float] = {}
+        for (_, _, _, seq, *_), item in zip(unkeyed, computed):
+            keys[seq] = self.scorer.heap_key(item) if item is not None else float("-inf")
+        for _, _, _, seq, dups, heap_key, key in candidates:
+            if heap_key is not None:
+                keys[seq] = heap_key
+            count = dups_now.get(key, 0)
+            if count > dups:
+                refreshed[seq] = count
+                keys[seq] += PriorityScorer.dup_term(count) - PriorityScorer.dup_term(dups)
+        # 同分时先入队的优先
+        return heapq.nsmallest(limit, candidates, key=lambda c: (-keys[c[3]], c[3]))
+
+    def _advance(
+        self,
+        state: Dict[str, Any],
+        order: List[Tuple[str, int, int]],
+        consumed: Set[int],
+        popped: Set[int],
+    ) -> None:
+        """Move the reader over the consumed prefix; remember seqs popped past it."""
+        moved = False
+        for name, offset, seq in order:
+            if seq not in consumed:
+                break
+            state = {"segment": name, "offset": offset, "seq": seq}
+            moved = True
+        if moved:
+            self._write_offset(state)
+            self._compact_segments(state["segment"])
+        ahead = {seq for seq in consumed if seq > int(state.get("seq", 0) or 0)}
+        if ahead != popped:
+            self._write_popped(ahead)
+
+    def pop_all(self) -> List[Dict[str, Any]]:
+        """Pop and clear all pending items."""
+        return self.pop_many(1 << 62)
 
+    def _compact_segments(self, current: str) -> None:
+        """Delete segments the reader has fully passed."""
+        for name in self._segments():
+            if name >= current:
+                break
+            for path in (self._file(name), self._index_file(name)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -1,40 +1,65 @@
 from __future__ import annotations
 
+import bisect
+import datetime
+import hashlib
 import json
 import os
+import sqlite3
+import threading
 import time
-from typing import Dict, Tuple
+from array import array
+from typing import Dict, Iterable, List, Optional, Set
 
+from app_config import get_state_config
+from file_lock import FileLock, atomic_write
 
-class StateStore:
+
+class JsonStateBackend:
     """Simple JSON-based store to de-duplicate items across runs.
 
     We persist a dict of {key: last_seen_ts}. Keys should be stable, e.g., url
     or (title+domain). Items older than retention_days will be purged.
+
+    Loads the whole file on construction and rewrites it on every flush; kept
+    for small setups and as the migration source of the SQLite backend. The
+    flush re-reads the file under a lock and merges, so marks written by
+    another process in the meantime are kept.
     """
 
     def __init__(self, path: str = "data/state.json", retention_days: int = 7) -> None:
         self.path = path
         self.retention_days = retention_days
         self.data: Dict[str, float] = {}
+        self._file_lock = FileLock(path + ".lock")
         self._load()
 
-    def _load(self) -> None:
+    def _read(self) -> Dict[str, float]:
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
             if os.path.exists(self.path):
                 with open(self.path, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
         except Exception:
-            self.data = {}
+            pass
+        return {}
+
+    def _load(self) -> None:
+        self.data = self._read()
 
     def _save(self) -> None:
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
+            with self._file_lock:
+                merged = self._read()
+                for k, ts in self.data.items():
+                    if float(ts) > float(merged.get(k, 0) or 0):
+                        merged[k] = ts
+                self.data = merged
+                self._purge()
+                atomic_write(self.path, json.dumps(self.data, ensure_ascii=False, indent=2))
+        except Exception as exc:  # noqa: BLE001
+            print(f"[状态] 写入 {self.path} 失败: {exc}")
 
     def _purge(self) -> None:
         now = time.time()
@@ -43,14 +68,424 @@ class StateStore:
         for k in keys_to_delete:
             self.data.pop(k, None)
 
+    def seen_many(self, keys: Iterable[str]) -> Set[str]:
+        return {k for k in keys if k in self.data}
+
+    def mark_many(self, keys: Iterable[str], ts: Optional[float] = None) -> None:
+        now = time.time() if ts is None else ts
+        for k in keys:
+            self.data[k] = now
+
+    def flush(self) -> None:
+        self._save()
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteStateBackend:
+    """Seen keys in SQLite (WAL mode) with an index on the timestamp.
+
+    Lookups and marks touch only the affected rows; ``flush`` commits the
+    pending marks and deletes expired keys by an indexed range scan in bounded
+    batches, so the per-poll cost does not grow with the size of the seen set
+    and the database is never rewritten as a whole.
+
+    Several processes may share the database: SQLite serializes writers
+    (``busy_timeout`` makes a blocked writer wait instead of failing) and
+    marks are committed per batch, so no process holds the write lock across
+    a crawl round.
+    """
+
+    purge_batch = 5000
+    busy_timeout_ms = 30000
+
+    def __init__(
+        self,
+        path: str = "data/state.db",
+        retention_days: int = 7,
+        migrate_from: Optional[str] = "data/state.json",
+    ) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # crawler threads call seen() through NewsCrawler.seen_index
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, ts REAL NOT NULL) WITHOUT ROWID")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_ts ON seen (ts)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+        self._conn.commit()
+        if migrate_from:
+            self._migrate(migrate_from)
+
+    def _migrate(self, json_path: str) -> None:
+        """One-time import of the old state.json (the file itself is left in place)."""
+        if not os.path.exists(json_path):
+            return
+        with self._lock:
+            row = self._conn.execute("SELECT v FROM meta WHERE k = 'migrated_from'").fetchone()
+            if row is not None:
+                return
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                rows = [(str(k), float(ts)) for k, ts in data.items()] if isinstance(data, dict) else []
+            except Exception as exc:  # noqa: BLE001
+                print(f"[状态] 迁移 {json_path} 失败: {exc}")
+                rows = []
+            self._conn.executemany("INSERT OR IGNORE INTO seen (key, ts) VALUES (?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO meta (k, v) VALUES ('migrated_from', ?)", (json_path,))
+            self._conn.commit()
+        print(f"[状态] 已从 {json_path} 迁移 {len(rows)} 条记录到 {self.path}")
+
+    def seen_many(self, keys: Iterable[str]) -> Set[str]:
+        key_list = list(dict.fromkeys(keys))
+        found: Set[str] = set()
+        with self._lock:
+            # SQLite 默认最多 999 个绑定参数
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"SELECT key FROM seen WHERE key IN ({marks})", chunk)
+                found.update(r[0] for r in rows)
+        return found
+
+    def mark_many(self, keys: Iterable[str], ts: Optional[float] = None) -> None:
+        now = time.time() if ts is None else ts
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (key, ts) VALUES (?, ?)", ((k, now) for k in keys)
+            )
+            # 立即提交：不在整轮抓取期间占用写锁，其他进程可并发写入
+            self._conn.commit()
+
+    def purge(self, now: Optional[float] = None) -> int:
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86400
+        deleted = 0
+        with self._lock:
+            while True:
+                cur = self._conn.execute(
+                    "DELETE FROM seen WHERE key IN "
+                    "(SELECT key FROM seen WHERE ts < ? ORDER BY ts LIMIT ?)",
+                    (cutoff, self.purge_batch),
+                )
+                self._conn.commit()
+                deleted += cur.rowcount
+                if cur.rowcount < self.purge_batch:
+                    return deleted
+
+    def flush(self) -> None:
+        with self._lock:
+            self._conn.commit()
+        self.purge()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def key_hash(key: str) -> int:
+    """64-bit hash of a stable item key."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8", errors="ignore"), digest_size=8).digest(), "little")
+
+
+class BloomFilter:
+    """Plain bit-array Bloom filter over 64-bit key hashes (double hashing)."""
+
+    def __init__(self, capacity: int, bits_per_key: int = 10) -> None:
+        self.capacity = max(1, int(capacity))
+        self.size = max(1024, self.capacity * bits_per_key)
+        self.k = max(1, round(bits_per_key * 0.693))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, h: int) -> Iterable[int]:
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        for i in range(self.k):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, h: int) -> None:
+        for pos in self._positions(h):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, h: int) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(h))
+
+
+class HashedStateBackend:
+    """Compact seen-index: 64-bit key hashes in daily, sorted ``array('Q')`` buckets.
+
+    Each UTC day has one bucket file ``<dir>/YYYYMMDD.bin`` with the raw sorted
+    hashes (8 bytes per key instead of a URL string plus a float). Lookups
+    bisect each bucket; expiry deletes whole bucket files. An optional Bloom
+    filter in front answers most misses without touching the buckets; it is
+    saved next to the buckets and only rebuilt when they no longer match it
+    (after expiry or growth). Only changed buckets are rewritten on flush.
+
+    Key hashes can collide (roughly 1 in 10^9 at a million keys); a collision
+    only means one item is treated as already seen.
+
+    Flushes run under ``<dir>/.lock`` and merge with the bucket currently on
+    disk, so processes sharing the directory never drop each other's marks.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/seen",
+        retention_days: int = 7,
+        bloom: bool = True,
+        bloom_bits_per_key: int = 10,
+        migrate_from: Optional[str] = "data/state.json",
+    ) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        self.use_bloom = bloom
+        self.bloom_bits_per_key = bloom_bits_per_key
+        self.buckets: Dict[int, array] = {}
+        self._pending: Dict[int, Set[int]] = {}
+        self._bloom: Optional[BloomFilter] = None
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._file_lock = FileLock(os.path.join(path, ".lock"))
+        with self._file_lock:
+            if migrate_from:
+                self._migrate(migrate_from)
+            self._load()
+
+    @staticmethod
+    def _day(ts: float) -> int:
+        return int(ts // 86400)
+
+    def _file(self, day: int) -> str:
+        name = datetime.datetime.fromtimestamp(day * 86400, datetime.timezone.utc).strftime("%Y%m%d")
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _oldest_day(self) -> int:
+        return self._day(time.time()) - self.retention_days
+
+    def _read_bucket(self, day: int) -> array:
+        arr = array("Q")
+        try:
+            with open(self._file(day), "rb") as f:
+                arr.frombytes(f.read())
+        except FileNotFoundError:
+            pass
+        return arr
+
+    def _load(self) -> None:
+        oldest = self._oldest_day()
+        for name in os.listdir(self.path):
+            if not name.endswith(".bin"):
+                continue
+            try:
+                day = self._day(datetime.datetime.strptime(name[:-4], "%Y%m%d")
+                                .replace(tzinfo=datetime.timezone.utc).timestamp())
+            except ValueError:
+                continue
+            if day < oldest:
+                # 过期：整桶删除
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass
+                continue
+            arr = array("Q")
+            try:
+                with open(os.path.join(self.path, name), "rb") as f:
+                    arr.frombytes(f.read())
+            except Exception as exc:  # noqa: BLE001
+                print(f"[状态] 读取 {name} 失败: {exc}")
+                continue
+            self.buckets[day] = arr
+        if self.use_bloom:
+            self._bloom = self._load_bloom()
+            if self._bloom is None:
+                self._rebuild_bloom()
+
+    def _signature(self) -> List[List[int]]:
+        return sorted([day, len(arr)] for day, arr in self.buckets.items())
+
+    def _load_bloom(self) -> Optional[BloomFilter]:
+        """Saved Bloom filter, if it was built from exactly the current buckets."""
+        try:
+            with open(os.path.join(self.path, "bloom.idx"), "rb") as f:
+                header = json.loads(f.readline().decode("utf-8"))
+                if header.get("buckets") != self._signature():
+                    return None
+                bloom = BloomFilter(int(header["capacity"]), self.bloom_bits_per_key)
+                bits = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        if len(bits) != len(bloom.bits):
+            return None
+        bloom.bits[:] = bits
+        return bloom
+
+    def _save_bloom(self) -> None:
+        if self._bloom is None:
+            return
+        header = {"capacity": self._bloom.capacity, "buckets": self._signature()}
+        raw = json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n"
+        atomic_write(os.path.join(self.path, "bloom.idx"), raw + bytes(self._bloom.bits))
+
+    def _rebuild_bloom(self) -> None:
+        if not self.use_bloom:
+            return
+        total = sum(len(a) for a in self.buckets.values())
+        # 预留增长空间，避免误判率随新增键上升过快
+        bloom = BloomFilter(total * 2 + 10000, self.bloom_bits_per_key)
+        for arr in self.buckets.values():
+            for h in arr:
+                bloom.add(h)
+        for hashes in self._pending.values():
+            for h in hashes:
+                bloom.add(h)
+        self._bloom = bloom
+
+    def _migrate(self, json_path: str) -> None:
+        """One-time import of the old state.json into day buckets."""
+        marker = os.path.join(self.path, "MIGRATED")
+        if os.path.exists(marker) or not os.path.exists(json_path):
+            return
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[状态] 迁移 {json_path} 失败: {exc}")
+            data = {}
+        by_day: Dict[int, Set[int]] = {}
+        for key, ts in (data.items() if isinstance(data, dict) else []):
+            try:
+                by_day.setdefault(self._day(float(ts)), set()).add(key_hash(str(key)))
+            except (TypeError, ValueError):
+                continue
+        for day, hashes in by_day.items():
+            self._write(day, array("Q", sorted(hashes)))
+        with open(marker, "w", encoding="utf-8") as f:
+            f.write(json_path)
+        print(f"[状态] 已从 {json_path} 迁移 {sum(len(h) for h in by_day.values())} 条记录到 {self.path}")
+
+    def _write(self, day: int, arr: array) -> None:
+        atomic_write(self._file(day), arr.tobytes())
+
+    def _contains(self, h: int) -> bool:
+        if self._bloom is not None and h not in self._bloom:
+            return False
+        for hashes in self._pending.values():
+            if h in hashes:
+                return True
+        for arr in self.buckets.values():
+            i = bisect.bisect_left(arr, h)
+            if i < len(arr) and arr[i] == h:
+                return True
+        return False
+
+    def seen_many(self, keys: Iterable[str]) -> Set[str]:
+        with self._lock:
+            return {k for k in keys if self._contains(key_hash(k))}
+
+    def mark_many(self, keys: Iterable[str], ts: Optional[float] = None) -> None:
+        day = self._day(time.time() if ts is None else ts)
+        with self._lock:
+            pending = self._pending.setdefault(day, set())
+            for k in keys:
+                h = key_hash(k)
+                pending.add(h)
+                if self._bloom is not None:
+                    self._bloom.add(h)
+
+    def flush(self) -> None:
+        with self._lock, self._file_lock:
+            for day, hashes in self._pending.items():
+                # 以磁盘上的桶为准合并：其他进程可能已写入新键
+                disk = self._read_bucket(day)
+                if self._bloom is not None and len(disk) != len(self.buckets.get(day, ())):
+                    for h in disk:
+                        self._bloom.add(h)
+                merged = set(disk)
+                merged.update(self.buckets.get(day, ()))
+                merged.update(hashes)
+                arr = array("Q", sorted(merged))
+                self.buckets[day] = arr
+                try:
+                    self._write(day, arr)
+                except Exception as exc:  # noqa: BLE001
+                    print(f"[状态] 写入 {self._file(day)} 失败: {exc}")
+            self._pending = {}
+            # 过期：整桶删除
+            oldest = self._oldest_day()
+            expired = [d for d in self.buckets if d < oldest]
+            for day in expired:
+                self.buckets.pop(day, None)
+                try:
+                    os.remove(self._file(day))
+                except OSError:
+                    pass
+            total = sum(len(a) for a in self.buckets.values())
+            if self._bloom is not None and (expired or total > self._bloom.capacity):
+                self._rebuild_bloom()
+            try:
+                self._save_bloom()
+            except Exception as exc:  # noqa: BLE001
+                print(f"[状态] 写入 Bloom 过滤器失败: {exc}")
+
+    def close(self) -> None:
+        pass
+
+
+def make_backend(backend: str, path: Optional[str], retention_days: int, bloom: bool = True):
+    if backend == "json":
+        return JsonStateBackend(path or "data/state.json", retention_days)
+    if backend == "hashed":
+        return HashedStateBackend(path or "data/seen", retention_days, bloom=bloom)
+    if backend != "sqlite":
+        print(f"[状态] 未知存储后端 {backend!r}，使用 sqlite")
+    return SqliteStateBackend(path or "data/state.db", retention_days)
+
+
+class StateStore:
+    """De-duplicates items across runs by stable key.
+
+    The storage backend comes from the ``state`` section of config.json
+    (``"backend": "sqlite"`` by default, ``"hashed"`` for the compact
+    hash-bucket index, or ``"json"`` for the old ``data/state.json`` file).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        retention_days: Optional[int] = None,
+        backend: Optional[str] = None,
+    ) -> None:
+        cfg = get_state_config()
+        self.retention_days = int(retention_days if retention_days is not None else cfg["retention_days"])
+        self.backend = make_backend(
+            backend or cfg["backend"], path or cfg["path"], self.retention_days, bloom=cfg["bloom"]
+        )
+
     def seen(self, key: str) -> bool:
-        return key in self.data
+        return key in self.backend.seen_many((key,))
+
+    def seen_many(self, keys: Iterable[str]) -> Set[str]:
+        """Subset of ``keys`` that were already seen (one lookup for the batch)."""
+        return self.backend.seen_many(keys)
 
     def mark(self, key: str) -> None:
-        self.data[key] = time.time()
+        self.backend.mark_many((key,))
+
+    def mark_many(self, keys: Iterable[str]) -> None:
+        self.backend.mark_many(keys)
 
     def flush(self) -> None:
-        self._purge()
-        self._save()
+        self.backend.flush()
 
+    def close(self) -> None:
+        self.backend.close()
 
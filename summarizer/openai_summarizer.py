@@ -4,15 +4,23 @@ News summarization via OpenRouter (OpenAI Python SDK v1 style).
 This implementation avoids hardcoded secrets, reads configuration from
 environment variables, and gracefully degrades to the original content when
 the AI call fails. It is suitable for CI environments (e.g., GitHub Actions).
+
+``summarize_batch`` looks every item up in the summary cache
+(``summary_cache.py``) first and only sends the misses to the model; identical
+texts within one batch are summarized once.
 """
 
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 from openai import OpenAI
 from app_config import get_openai_config
+from .summary_cache import get_summary_cache, summary_key
 import concurrent.futures
 
+# 修改 _build_prompt 的措辞/要求后递增，旧提示词生成的缓存摘要随之失效
+PROMPT_VERSION = "1"
+
 
 class OpenAISummarizer:
     """Summarize news items using an OpenRouter-compatible OpenAI client.
@@ -60,8 +68,13 @@ class OpenAISummarizer:
         )
 
     def summarize(self, news_item: Dict[str, Any]) -> Dict[str, str]:
+        return self._summarize(news_item)[0]
+
+    def _summarize(self, news_item: Dict[str, Any]) -> Tuple[Dict[str, str], int]:
+        """Summary dict and the tokens used; tokens is 0 when the call failed."""
         prompt = self._build_prompt(news_item)
         summary_text: str
+        tokens = 0
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -73,44 +86,82 @@ class OpenAISummarizer:
                 summary_text = (response.choices[0].message.content or "").strip()
             else:
                 summary_text = ""
+            if summary_text:
+                usage = getattr(response, "usage", None)
+                # 接口未返回用量时按字符数粗估（中文约 1 字 1 token）
+                tokens = int(getattr(usage, "total_tokens", 0) or 0) or len(prompt) + len(summary_text)
         except Exception as exc:  # noqa: BLE001 - broad by design to gracefully degrade
             summary_text = f"摘要失败: {exc}"
 
         if not summary_text or summary_text.startswith("摘要失败"):
+            tokens = 0
             tags = news_item.get("tags")
             tag_hint = f" [标签: {', '.join(tags)}]" if tags else ""
             fallback = news_item.get("content", "") or news_item.get("title", "")
             summary_text = fallback[:500]
             summary_text = summary_text + tag_hint
 
-        return {
-            "title": news_item.get("title", ""),
-            "summary": summary_text,
-            "url": news_item.get("url", ""),
-            "tags": news_item.get("tags", []),
-        }
+        return _result(news_item, summary_text), tokens
+
+
+def _result(news_item: Dict[str, Any], summary: str) -> Dict[str, str]:
+    return {
+        "title": news_item.get("title", ""),
+        "summary": summary,
+        "url": news_item.get("url", ""),
+        "tags": news_item.get("tags", []),
+    }
 
 
 def summarize_batch(items: list[Dict[str, Any]], max_workers: int = 4) -> list[Dict[str, str]]:
     """Summarize a batch of news items in parallel.
 
     Returns a list of summarized dicts preserving order as best effort.
+    Cached summaries are returned without calling the model; only successful
+    LLM summaries are added to the cache.
     """
     summarizer = OpenAISummarizer()
+    cache = get_summary_cache()
     results: list[Dict[str, str]] = [None] * len(items)  # type: ignore
-
-    def _wrap(idx: int, it: Dict[str, Any]):
+    # 缓存未命中的条目按内容哈希分组：同一批内相同正文只请求一次
+    misses: Dict[str, list[int]] = {}
+    hits = 0
+    saved = 0
+    for idx, it in enumerate(items):
+        key = summary_key(summarizer.model, PROMPT_VERSION, it)
+        cached = cache.get(key) if cache is not None and key not in misses else None
+        if cached is not None:
+            results[idx] = _result(it, cached[0])
+            hits += 1
+            saved += cached[1]
+        else:
+            misses.setdefault(key, []).append(idx)
+
+    def _wrap(key: str, idxs: list[int]):
+        it = items[idxs[0]]
         try:
-            results[idx] = summarizer.summarize(it)
+            result, tokens = summarizer._summarize(it)
         except Exception as exc:  # noqa: BLE001
-            results[idx] = {
-                "title": it.get("title", ""),
-                "summary": f"摘要失败: {exc}",
-                "url": it.get("url", ""),
-                "tags": it.get("tags", []),
-            }
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = [ex.submit(_wrap, i, it) for i, it in enumerate(items)]
-        concurrent.futures.wait(futures)
+            result, tokens = _result(it, f"摘要失败: {exc}"), 0
+        results[idxs[0]] = result
+        for idx in idxs[1:]:
+            results[idx] = _result(items[idx], result["summary"])
+        if tokens:
+            if cache is not None:
+                cache.put(key, result["summary"], tokens)
+            return tokens * (len(idxs) - 1)
+        return 0
+
+    if misses:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = [ex.submit(_wrap, key, idxs) for key, idxs in misses.items()]
+            concurrent.futures.wait(futures)
+        saved += sum(f.result() for f in futures if f.exception() is None)
+    # 批内重复也算作省下的调用
+    hits += len(items) - hits - len(misses)
+    if items:
+        print(f"[摘要缓存] 命中 {hits}/{len(items)}（{hits / len(items):.0%}），"
+              f"调用模型 {len(misses)} 次，约节省 {saved} tokens")
+    if cache is not None:
+        cache.flush()
     return results  # type: ignore
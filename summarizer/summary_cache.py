@@ -0,0 +1,128 @@
+"""On-disk cache of LLM summaries, keyed by a hash of the content.
+
+``summarize_batch`` used to call the model for every item, so an article that
+came back under another URL (mirrors, tracking parameters, re-posts) or was
+requeued after a partial analysis run was paid for again. Entries are keyed by
+sha256 of the model id, the prompt version and the normalized title + content
+(lowercase, punctuation and whitespace dropped, see ``near_dup``), so a cached
+summary is reused only for the same text under the same prompt. Entries
+expire after ``ttl_hours`` and the cache is bounded to ``max_entries`` with LRU
+eviction. Each entry also keeps the tokens its LLM call used, so hits can be
+reported as tokens saved.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app_config import get_summary_cache_config
+from json_store import adopt_merged, load_json, merge_json
+from news_crawler.near_dup import normalize_text
+
+
+def summary_key(model: str, prompt_version: str, item: Dict[str, Any]) -> str:
+    text = f"{normalize_text(item.get('title') or '')}\n{normalize_text(item.get('content') or '')}"
+    return hashlib.sha256(f"{model}|{prompt_version}|{text}".encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """LRU + TTL cache {key: (ts, summary, tokens)} persisted as JSON."""
+
+    def __init__(
+        self,
+        path: str = "data/summary_cache.json",
+        ttl_hours: float = 168,
+        max_entries: int = 2000,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        # keys changed since the last flush; only these are merged into the file
+        self._changed: Set[str] = set()
+        self._lock = threading.Lock()
+        # insertion order == LRU order (oldest first)
+        self._entries: "collections.OrderedDict[str, List]" = collections.OrderedDict()
+        for key, entry in load_json(path, {}).items():
+            if isinstance(entry, list) and len(entry) == 3:
+                self._entries[key] = entry
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """(summary, tokens of the original call), or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - float(entry[0]) > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                    self._changed.add(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            tokens = int(entry[2] or 0)
+            self.tokens_saved += tokens
+            return str(entry[1]), tokens
+
+    def put(self, key: str, summary: str, tokens: int = 0) -> None:
+        with self._lock:
+            self._entries[key] = [time.time(), summary, int(tokens)]
+            self._entries.move_to_end(key)
+            self._changed.add(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._changed.add(self._entries.popitem(last=False)[0])
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "tokens_saved": self.tokens_saved,
+                "size": len(self._entries),
+            }
+
+    def flush(self) -> None:
+        """Merge the keys changed by this process into the file (see ``json_store.merge_json``).
+
+        Entries saved by another process are taken over (as most recently used).
+        """
+        with self._lock:
+            changes = {k: list(self._entries[k]) if k in self._entries else None for k in self._changed}
+            self._changed = set()
+        if not changes:
+            return
+        merged = merge_json(self.path, changes)
+        with self._lock:
+            if merged is None:
+                # 没拿到锁：改动留到下次 flush
+                self._changed.update(changes)
+                return
+            valid = {k: e for k, e in merged.items() if isinstance(e, list) and len(e) == 3}
+            adopt_merged(self._entries, valid, self._changed)
+            self._evict()
+
+
+_default: Optional[SummaryCache] = None
+_default_lock = threading.Lock()
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Shared cache, or None when disabled in config."""
+    global _default
+    cfg = get_summary_cache_config()
+    if not cfg["enabled"]:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = SummaryCache(cfg["path"], cfg["ttl_hours"], cfg["max_entries"])
+        return _default
@@ -0,0 +1,49 @@
+import news_crawler
+from news_crawler.gold_hedged import HedgedGoldCrawler
+from news_crawler.health import SourceHealth
+from news_crawler.http_cache import ValidatorCache
+from news_crawler.http_client import HttpClient
+from news_crawler.registry import find_spec
+from news_crawler.scheduler import SourceScheduler
+
+# 本机 discard 端口：连接立即被拒绝
+DEAD_URL = "http://127.0.0.1:9/"
+
+
+class SpyScheduler(SourceScheduler):
+    def __init__(self, path):
+        super().__init__(path=path)
+        self.recorded = []
+        self.deferred = []
+
+    def record(self, name, new_items, now=None):
+        self.recorded.append(name)
+        return super().record(name, new_items, now)
+
+    def defer(self, name, now=None):
+        self.deferred.append(name)
+        return super().defer(name, now)
+
+
+def test_both_sources_failing_defers_the_hedged_crawler(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    crawler = HedgedGoldCrawler(hedge_delay=0)
+    crawler.primary.url = DEAD_URL
+    crawler.fallback.url = DEAD_URL
+    spec = find_spec("HedgedGoldCrawler")
+    monkeypatch.setattr(news_crawler, "enabled_specs", lambda: [spec])
+    monkeypatch.setattr(news_crawler, "instantiate", lambda specs: [(spec, crawler)])
+    client = HttpClient(
+        timeout=2,
+        validators=ValidatorCache(path=str(tmp_path / "http_cache.json")),
+        health=SourceHealth(path=str(tmp_path / "source_health.json")),
+    )
+    scheduler = SpyScheduler(str(tmp_path / "schedule.json"))
+
+    news_crawler.run_all_crawlers(client=client, scheduler=scheduler)
+
+    # 子爬虫的请求记在组合爬虫名下
+    succeeded, failed = client.outcome(crawler)
+    assert succeeded == 0 and failed == 2
+    assert scheduler.deferred == ["HedgedGoldCrawler"]
+    assert scheduler.recorded == []
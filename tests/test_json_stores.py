@@ -0,0 +1,65 @@
+import json
+
+from news_crawler.detail_cache import DetailCache
+from news_crawler.health import SourceHealth
+from news_crawler.http_cache import ValidatorCache
+from news_crawler.scheduler import SourceScheduler
+from summarizer.summary_cache import SummaryCache
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_two_writers_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "summary_cache.json")
+    a, b = SummaryCache(path), SummaryCache(path)
+    a.put("k1", "s1")
+    b.put("k2", "s2")
+    a.flush()
+    b.flush()
+    assert set(_load(path)) == {"k1", "k2"}
+    # 另一进程保存的条目在 flush 后可直接命中
+    assert b.get("k1") == ("s1", 0)
+
+
+def test_evicted_keys_are_deleted_from_the_file(tmp_path):
+    path = str(tmp_path / "detail_cache.json")
+    a = DetailCache(path, max_entries=1)
+    a.put("https://example.com/1", "one")
+    a.flush()
+    b = DetailCache(path, max_entries=1)
+    b.put("https://example.com/2", "two")
+    b.flush()
+    assert list(_load(path)) == ["https://example.com/2"]
+
+
+def test_scheduler_health_and_validators_merge_per_key(tmp_path):
+    sched = str(tmp_path / "schedule.json")
+    s1 = SourceScheduler(path=sched, policies={"A": (60, 15, 600), "B": (60, 15, 600)})
+    s2 = SourceScheduler(path=sched, policies={"A": (60, 15, 600), "B": (60, 15, 600)})
+    s1.record("A", 1, now=100)
+    s2.record("B", 1, now=100)
+    s1.flush()
+    s2.flush()
+    assert set(_load(sched)) == {"A", "B"}
+
+    health = str(tmp_path / "source_health.json")
+    h1, h2 = SourceHealth(path=health), SourceHealth(path=health)
+    h1.record_failure("a.example")
+    h2.record_failure("b.example")
+    h1.flush()
+    h2.flush()
+    assert set(_load(health)) == {"a.example", "b.example"}
+    h1.record_success("a.example")
+    h1.flush()
+    assert set(_load(health)) == {"b.example"}
+
+    cache = str(tmp_path / "http_cache.json")
+    v1, v2 = ValidatorCache(path=cache), ValidatorCache(path=cache)
+    v1.update("https://a.example/", "etag-a", None)
+    v2.update("https://b.example/", "etag-b", None)
+    v1.flush()
+    v2.flush()
+    assert set(_load(cache)) == {"https://a.example/", "https://b.example/"}
@@ -0,0 +1,42 @@
+import pytest
+
+from news_crawler.keyword_profiles import CompiledProfiles, builtin_profiles, parse_profiles
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return builtin_profiles()
+
+
+@pytest.mark.parametrize(
+    "headline, term",
+    [
+        ("ChatGPT发布新功能", "GPT"),
+        ("Qwen2.5开源", "Qwen"),
+        ("GPT4o发布", "GPT"),
+        ("Llama3发布", "Llama"),
+    ],
+)
+def test_model_names_match_inside_compounds(profiles, headline, term):
+    tags = profiles.tags(headline)
+    assert term in tags
+    assert "AI行业" in tags
+
+
+@pytest.mark.parametrize("headline", ["SAID hello", "Yield 上升", "R10 发布", "SAIC 车型"])
+def test_short_ascii_tokens_keep_word_boundaries(profiles, headline):
+    assert profiles.tags(headline) == []
+
+
+def test_short_tokens_match_on_their_own(profiles):
+    assert profiles.tags("o3 与 R1 对比") == ["R1", "o3", "AI行业"]
+
+
+def test_tags_follow_profile_order_without_duplicates():
+    data = {"profiles": [
+        {"name": "sector", "terms": ["黄金", "白银"]},
+        {"name": "policy", "tag": "政策类", "terms": ["降准"]},
+        {"name": "gold", "tag": "贵金属", "terms": ["黄金"]},
+    ]}
+    compiled = CompiledProfiles(*parse_profiles(data))
+    assert compiled.tags("降准后白银和黄金齐涨") == ["黄金", "白银", "降准", "政策类", "贵金属"]
@@ -0,0 +1,74 @@
+import json
+import os
+
+from pending_store import PendingStore
+from priority import PriorityScorer
+
+
+def _item(n, **kw):
+    return {"title": f"t{n}", "content": "x" * 50, "url": f"https://example.com/{n}", **kw}
+
+
+def _store(tmp_path, **kw):
+    kw.setdefault("migrate_from", None)
+    return PendingStore(path=str(tmp_path / "pending"), **kw)
+
+
+def _files(tmp_path, suffix):
+    return sorted(n for n in os.listdir(tmp_path / "pending") if n.endswith(suffix))
+
+
+def test_fifo_pops_in_order_and_drops_consumed_segments_with_their_index(tmp_path):
+    store = _store(tmp_path, segment_bytes=200, priority=False)
+    assert store.add_many([_item(i) for i in range(6)]) == 6
+    for i in range(6, 12):
+        store.add_many([_item(i)])
+    assert len(_files(tmp_path, ".idx")) == len(_files(tmp_path, ".jsonl")) > 1
+
+    assert [it["title"] for it in store.pop_many(5)] == [f"t{i}" for i in range(5)]
+    assert [it["title"] for it in store.pop_all()] == [f"t{i}" for i in range(5, 12)]
+    assert _files(tmp_path, ".idx") == [n[: -len(".jsonl")] + ".idx" for n in _files(tmp_path, ".jsonl")]
+
+
+def test_priority_pop_uses_refreshed_dup_counts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = _store(tmp_path, priority=True)
+    store.scorer = PriorityScorer(tag_weights={}, half_life_hours=1000)
+    store.add_many([_item(0, tags=["政策类"]), _item(1), _item(2)])
+
+    # t2 入队后被大量转载
+    os.makedirs("data", exist_ok=True)
+    with open("data/near_dup.json", "w", encoding="utf-8") as f:
+        json.dump([["0" * 16, 0, "url:https://example.com/2", 500]], f)
+
+    first = store.pop_many(1)
+    assert [it["title"] for it in first] == ["t2"]
+    assert first[0]["dup_count"] == 500
+    assert [it["title"] for it in store.pop_many(5)] == ["t0", "t1"]
+
+
+def test_priority_pop_parses_only_the_chosen_records(tmp_path, monkeypatch):
+    store = _store(tmp_path, priority=True)
+    store.add_many([_item(i) for i in range(20)])
+    parsed = []
+    real_loads = json.loads
+
+    def spy(raw, *args, **kw):
+        if b'"item"' in (raw if isinstance(raw, bytes) else raw.encode("utf-8")):
+            parsed.append(raw)
+        return real_loads(raw, *args, **kw)
+
+    monkeypatch.setattr("pending_store.json.loads", spy)
+    assert len(store.pop_many(2)) == 2
+    assert len(parsed) == 2
+
+
+def test_index_catches_up_after_a_crash_between_segment_and_index_writes(tmp_path):
+    store = _store(tmp_path, priority=False)
+    store.add_many([_item(0), _item(1)])
+    idx = tmp_path / "pending" / _files(tmp_path, ".idx")[0]
+    first_line = idx.read_bytes().split(b"\n")[0]
+    idx.write_bytes(first_line + b"\n" + b'[2,9')  # 第二条索引丢失且末尾残缺
+
+    store.add_many([_item(2)])
+    assert [it["title"] for it in store.pop_all()] == ["t0", "t1", "t2"]
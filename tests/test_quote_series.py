@@ -0,0 +1,42 @@
+from news_crawler import _track_quotes
+from news_crawler.quote_series import QuoteSeriesStore
+from news_crawler.scheduler import SourceScheduler
+
+
+def _store(tmp_path, **kw):
+    return QuoteSeriesStore(path=str(tmp_path / "quote_series.bin"), **kw)
+
+
+def _quote(key, price):
+    return {"title": key, "content": "", "url": "", "quote": {"key": key, "price": price}}
+
+
+def test_day_pct_is_measured_from_the_day_open_after_the_ring_wraps(tmp_path):
+    store = _store(tmp_path, capacity=2, threshold_pct=0)
+    for ts, price in enumerate([100.0, 101.0, 102.0, 103.0]):
+        stats = store.update("gold:x", float(ts), price)
+    assert round(stats["day_pct"], 6) == 3.0
+
+    store.flush()
+    reloaded = _store(tmp_path, capacity=2, threshold_pct=0)
+    assert reloaded.opens == {"gold:x": 100.0}
+
+
+def test_only_emitted_quotes_become_the_push_reference(tmp_path):
+    store = _store(tmp_path, threshold_pct=0.5)
+    moved, _ = _track_quotes([_quote("gold:a", 100.0), _quote("gold:b", 200.0)], store, limit=1)
+    assert [it["title"].split(" |")[0] for it in moved] == ["gold:a"]
+    assert store.pushed == {"gold:a": 100.0}
+
+    # gold:b 上一轮未推送，本轮仍视为当日首次
+    moved, _ = _track_quotes([_quote("gold:b", 200.0)], store, limit=1)
+    assert len(moved) == 1
+
+
+def test_reschedule_keeps_the_base_interval(tmp_path):
+    scheduler = SourceScheduler(path=str(tmp_path / "schedule.json"), policies={"Quote": (60, 15, 600)})
+    for _ in range(5):
+        scheduler.record("Quote", 0, now=0)
+    assert scheduler.state["Quote"]["interval"] > 60
+    assert scheduler.reschedule("Quote", now=1000) == 60
+    assert scheduler.state["Quote"]["next_due"] == 1060
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+from news_crawler.ranking import rank
+
+
+def test_rank_orders_by_score_and_cuts():
+    items = [{"id": 1, "score": 0.2}, {"id": 2, "score": 0.9}, {"id": 3}, {"id": 4, "score": 0.9}]
+    assert [it["id"] for it in rank(items)] == [2, 4, 1, 3]
+    assert [it["id"] for it in rank(items, limit=2)] == [2, 4]
+    assert [it["id"] for it in rank(items, min_score=0.5)] == [2, 4]
+
+
+def test_ranking_does_not_import_numpy():
+    code = "import sys, news_crawler.ranking; print('numpy' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+    assert out.stdout.strip() == "False"